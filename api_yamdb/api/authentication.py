@@ -0,0 +1,100 @@
+from django.conf import settings
+from django.contrib.auth import get_user_model
+from django.core.cache import cache
+from rest_framework_simplejwt.authentication import JWTAuthentication
+from rest_framework_simplejwt.exceptions import AuthenticationFailed
+from rest_framework_simplejwt.models import TokenUser
+from rest_framework_simplejwt.settings import api_settings
+from rest_framework_simplejwt.tokens import AccessToken
+
+
+User = get_user_model()
+
+USER_STATE_PREFIX = 'jwt-user-state'
+
+
+def get_token_for_user(user):
+    """Создает токен доступа с именем и ролью пользователя."""
+    token = AccessToken.for_user(user)
+    token['username'] = user.username
+    token['role'] = user.role
+    token['is_superuser'] = user.is_superuser
+    return token
+
+
+def get_user_state_key(user_id):
+    """Возвращает ключ кэша с актуальной ролью пользователя."""
+    return f'{USER_STATE_PREFIX}:{user_id}'
+
+
+def forget_user_state(user_id):
+    """Удаляет сохраненную роль, чтобы ее перечитали из базы."""
+    cache.delete(get_user_state_key(user_id))
+
+
+class RoleTokenUser(TokenUser):
+    """Пользователь, восстановленный из токена без запроса к базе."""
+
+    @property
+    def role(self):
+        return self.token['role']
+
+    @property
+    def is_admin(self):
+        """Проверяет, является ли пользователь администратором."""
+        return self.role == User.Role.ADMIN or self.is_superuser
+
+    @property
+    def is_moderator(self):
+        """Проверяет, является ли пользователь модератором."""
+        return self.role == User.Role.MODERATOR
+
+
+class StatelessJWTAuthentication(JWTAuthentication):
+    """
+    JWT-аутентификация без загрузки пользователя из базы.
+
+    Для токенов с ролью и именем пользователя возвращает RoleTokenUser.
+    Роль, статус суперпользователя и активность сверяются с данными,
+    закэшированными на JWT_USER_STATE_TTL секунд, поэтому смена роли или
+    блокировка вступают в силу не позже этого срока. Токены без роли
+    обрабатываются стандартной аутентификацией.
+    """
+
+    def get_user(self, validated_token):
+        if 'role' not in validated_token:
+            return super().get_user(validated_token)
+        try:
+            user_id = validated_token[api_settings.USER_ID_CLAIM]
+        except KeyError:
+            raise AuthenticationFailed(
+                'Токен не содержит идентификатор пользователя'
+            )
+
+        state = self.get_user_state(user_id)
+        if state is None:
+            raise AuthenticationFailed('Пользователь не найден')
+        role, is_superuser, is_active = state
+        if not is_active:
+            raise AuthenticationFailed('Пользователь заблокирован')
+        if (
+            role != validated_token['role']
+            or is_superuser != validated_token.get('is_superuser', False)
+        ):
+            raise AuthenticationFailed(
+                'Роль пользователя изменилась, получите новый токен'
+            )
+        return RoleTokenUser(validated_token)
+
+    def get_user_state(self, user_id):
+        """Возвращает (роль, суперпользователь, активен) из кэша или базы."""
+        key = get_user_state_key(user_id)
+        state = cache.get(key)
+        if state is None:
+            state = User.objects.filter(
+                **{api_settings.USER_ID_FIELD: user_id}
+            ).values_list('role', 'is_superuser', 'is_active').first()
+            if state is None:
+                return None
+            cache.set(key, state, settings.JWT_USER_STATE_TTL)
+        return state
@@ -0,0 +1,98 @@
+from api.backends.pool import get_pool
+
+
+class HealthCheckMixin:
+    """
+    Проверка постоянного соединения перед первым запросом в HTTP-запросе.
+
+    Включается ключом CONN_HEALTH_CHECKS настроек базы данных, как
+    в Django 4.1: соединение, сохраненное между запросами благодаря
+    CONN_MAX_AGE, проверяется is_usable() один раз за запрос при первом
+    обращении и переоткрывается, если сервер его разорвал.
+    """
+
+    health_check_done = False
+
+    @property
+    def health_check_enabled(self):
+        return self.settings_dict.get('CONN_HEALTH_CHECKS', False)
+
+    def connect(self):
+        super().connect()
+        self.health_check_done = True
+
+    def close_if_unusable_or_obsolete(self):
+        super().close_if_unusable_or_obsolete()
+        if self.connection is not None:
+            self.health_check_done = False
+
+    def close_if_health_check_failed(self):
+        if (
+            self.connection is None
+            or not self.health_check_enabled
+            or self.health_check_done
+            or self.in_atomic_block
+        ):
+            return
+        if not self.is_usable():
+            self.close()
+        self.health_check_done = True
+
+    def _cursor(self, name=None):
+        self.close_if_health_check_failed()
+        return super()._cursor(name)
+
+
+class PooledConnectionMixin:
+    """
+    Соединения из общего для потоков пула.
+
+    Пул включается ключом POOL настроек базы данных:
+    {'SIZE': 10, 'TIMEOUT': 10}. При закрытии соединение драйвера
+    не разрывается, а после отката незавершенной транзакции
+    возвращается в пул. Соединение, закрытое внутри atomic,
+    разрывается. Без POOL или с SIZE 0 поведение не меняется.
+    """
+
+    def get_pool(self):
+        options = self.settings_dict.get('POOL') or {}
+        if not options.get('SIZE'):
+            return None
+        return get_pool(
+            self.alias, options['SIZE'], options.get('TIMEOUT', 10)
+        )
+
+    def get_new_connection(self, conn_params):
+        pool = self.get_pool()
+        if pool is None:
+            return super().get_new_connection(conn_params)
+        return pool.acquire(
+            lambda: super(PooledConnectionMixin, self).get_new_connection(
+                conn_params
+            ),
+            self.is_connection_usable if self.health_check_enabled else None,
+        )
+
+    def is_connection_usable(self, connection):
+        """Проверяет соединение драйвера запросом SELECT 1."""
+        try:
+            connection.cursor().execute('SELECT 1')
+        except self.Database.Error:
+            return False
+        return True
+
+    def _close(self):
+        pool = self.get_pool()
+        if pool is None or self.connection is None:
+            return super()._close()
+        if self.in_atomic_block:
+            # Django оставляет ссылку на соединение до выхода из atomic,
+            # поэтому отдавать его другому потоку нельзя.
+            pool.release(self.connection, reusable=False)
+            return
+        try:
+            self.connection.rollback()
+        except self.Database.Error:
+            pool.release(self.connection, reusable=False)
+        else:
+            pool.release(self.connection)
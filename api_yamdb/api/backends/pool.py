@@ -0,0 +1,153 @@
+import threading
+import time
+from collections import deque
+
+from django.db import OperationalError
+
+
+class PoolTimeout(OperationalError):
+    """Свободное соединение не появилось за время ожидания."""
+
+
+class ConnectionPool:
+    """
+    Пул соединений с базой данных одного алиаса.
+
+    Хранит не больше size открытых соединений драйвера. Когда все они
+    заняты, запрос ждет освобождения до timeout секунд, затем получает
+    PoolTimeout. Время ожидания и число выдач накапливаются для
+    get_pool_stats().
+    """
+
+    def __init__(self, size, timeout):
+        self.size = size
+        self.timeout = timeout
+        self.idle = deque()
+        self.opened = 0
+        self.closed = False
+        self.condition = threading.Condition()
+        self.stats = {
+            'checkouts': 0,
+            'waits': 0,
+            'wait_seconds': 0.0,
+            'timeouts': 0,
+            'discarded': 0,
+        }
+
+    def acquire(self, connect, is_usable=None):
+        """
+        Выдает свободное соединение или открывает новое через connect().
+
+        Если передан is_usable, соединение из пула перед выдачей
+        проверяется, и сломанное заменяется новым.
+        """
+        started = time.monotonic()
+        connection = self.take(started)
+        if connection is not None and is_usable and not is_usable(connection):
+            self.discard(connection, release_slot=False)
+            connection = None
+        if connection is None:
+            try:
+                connection = connect()
+            except Exception:
+                with self.condition:
+                    self.opened -= 1
+                    self.condition.notify()
+                raise
+        return connection
+
+    def take(self, started):
+        """Занимает место в пуле, возвращает свободное соединение или None."""
+        with self.condition:
+            waited = False
+            while not self.idle and self.opened >= self.size:
+                remaining = self.timeout - (time.monotonic() - started)
+                if remaining <= 0:
+                    self.stats['timeouts'] += 1
+                    raise PoolTimeout(
+                        f'Нет свободного соединения в пуле из {self.size} '
+                        f'за {self.timeout} с.'
+                    )
+                waited = True
+                self.condition.wait(remaining)
+            if waited:
+                self.stats['waits'] += 1
+                self.stats['wait_seconds'] += time.monotonic() - started
+            self.stats['checkouts'] += 1
+            if self.idle:
+                return self.idle.pop()
+            self.opened += 1
+            return None
+
+    def release(self, connection, reusable=True):
+        """Возвращает соединение в пул или закрывает его."""
+        with self.condition:
+            if reusable and not self.closed:
+                self.idle.append(connection)
+                self.condition.notify()
+                return
+        self.discard(connection)
+
+    def discard(self, connection, release_slot=True):
+        """Закрывает соединение, по умолчанию освобождая его место."""
+        try:
+            connection.close()
+        except Exception:
+            pass
+        with self.condition:
+            self.stats['discarded'] += 1
+            if release_slot:
+                self.opened -= 1
+                self.condition.notify()
+
+    def close(self):
+        """
+        Закрывает свободные соединения.
+
+        Занятые соединения закрываются при возврате.
+        """
+        with self.condition:
+            self.closed = True
+            idle, self.idle = self.idle, deque()
+            self.opened -= len(idle)
+        for connection in idle:
+            try:
+                connection.close()
+            except Exception:
+                pass
+
+    def get_stats(self):
+        with self.condition:
+            return {
+                'size': self.size,
+                'opened': self.opened,
+                'idle': len(self.idle),
+                'in_use': self.opened - len(self.idle),
+                **self.stats,
+            }
+
+
+pools = {}
+pools_lock = threading.Lock()
+
+
+def get_pool(alias, size, timeout):
+    """Возвращает общий для процесса пул алиаса, создавая его."""
+    with pools_lock:
+        if alias not in pools:
+            pools[alias] = ConnectionPool(size, timeout)
+        return pools[alias]
+
+
+def get_pool_stats():
+    """Возвращает статистику пулов: алиас -> счетчики."""
+    with pools_lock:
+        return {alias: pool.get_stats() for alias, pool in pools.items()}
+
+
+def close_pools():
+    """Закрывает свободные соединения всех пулов и забывает пулы."""
+    with pools_lock:
+        for pool in pools.values():
+            pool.close()
+        pools.clear()
@@ -0,0 +1,8 @@
+from django.db.backends.postgresql import base
+
+from api.backends.mixins import HealthCheckMixin, PooledConnectionMixin
+
+
+class DatabaseWrapper(HealthCheckMixin, PooledConnectionMixin,
+                      base.DatabaseWrapper):
+    """PostgreSQL с проверкой и пулом соединений."""
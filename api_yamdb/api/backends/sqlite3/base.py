@@ -0,0 +1,8 @@
+from django.db.backends.sqlite3 import base
+
+from api.backends.mixins import HealthCheckMixin, PooledConnectionMixin
+
+
+class DatabaseWrapper(HealthCheckMixin, PooledConnectionMixin,
+                      base.DatabaseWrapper):
+    """SQLite с проверкой и пулом соединений."""
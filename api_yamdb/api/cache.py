@@ -0,0 +1,99 @@
+import hashlib
+import time
+from urllib.parse import urlencode
+
+from django.conf import settings
+from django.core.cache import caches
+from django.db import transaction
+
+
+CACHE_PREFIX = 'api-response'
+VERSION_PREFIX = 'api-response-version'
+STATS_PREFIX = 'api-response-stats'
+
+
+def get_cache():
+    """Возвращает кэш, выбранный настройкой API_RESPONSE_CACHE_ALIAS."""
+    return caches[settings.API_RESPONSE_CACHE_ALIAS]
+
+
+def get_versions(groups):
+    """
+    Возвращает текущие версии групп зависимостей.
+
+    Отсутствующая версия (новая группа или вытесненный ключ)
+    инициализируется текущим временем, чтобы не совпасть ни с одной
+    из версий, под которыми ответы уже могли быть сохранены.
+    """
+    cache = get_cache()
+    keys = [f'{VERSION_PREFIX}:{group}' for group in groups]
+    versions = cache.get_many(keys)
+    for key in keys:
+        if key not in versions:
+            cache.add(key, time.time_ns(), None)
+            versions[key] = cache.get(key)
+    return [versions[key] for key in keys]
+
+
+def invalidate(*groups):
+    """Сбрасывает закэшированные ответы, зависящие от групп."""
+    cache = get_cache()
+    for group in groups:
+        key = f'{VERSION_PREFIX}:{group}'
+        try:
+            cache.incr(key)
+        except ValueError:
+            cache.set(key, time.time_ns(), None)
+
+
+def invalidate_on_commit(*groups):
+    """
+    Сбрасывает кэш групп после фиксации текущей транзакции.
+
+    Если сбросить версии до фиксации, параллельный запрос может
+    прочитать еще старые данные и сохранить их под новой версией.
+    При откате транзакции кэш не сбрасывается, вне транзакции
+    сбрасывается сразу.
+    """
+    transaction.on_commit(lambda: invalidate(*groups))
+
+
+def count(event):
+    """Увеличивает счетчик попаданий или промахов кэша."""
+    cache = get_cache()
+    key = f'{STATS_PREFIX}:{event}'
+    try:
+        cache.incr(key)
+    except ValueError:
+        cache.add(key, 0, None)
+        cache.incr(key)
+
+
+def get_stats():
+    """Возвращает счетчики попаданий и промахов кэша ответов."""
+    events = ('hit', 'miss')
+    values = get_cache().get_many(
+        [f'{STATS_PREFIX}:{event}' for event in events]
+    )
+    return {
+        event: values.get(f'{STATS_PREFIX}:{event}', 0) for event in events
+    }
+
+
+def normalize_query(request):
+    """Возвращает строку запроса с параметрами в постоянном порядке."""
+    return urlencode(sorted(
+        (name, value)
+        for name, values in request.query_params.lists()
+        for value in values
+    ))
+
+
+def build_key(request, groups):
+    """Формирует ключ по адресу, нормализованной строке запроса и версиям."""
+    query = normalize_query(request)
+    address = hashlib.md5(
+        f'{request.get_host()}{request.path}?{query}'.encode()
+    ).hexdigest()
+    versions = '.'.join(map(str, get_versions(groups)))
+    return f'{CACHE_PREFIX}:{address}:{versions}'
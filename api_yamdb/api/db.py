@@ -0,0 +1,43 @@
+import re
+
+from django.conf import settings
+from django.core.exceptions import ImproperlyConfigured
+
+
+PRAGMA_VALUE = re.compile(r'^-?\w+$')
+
+
+def get_sqlite_pragmas():
+    """
+    Возвращает PRAGMA из настройки SQLITE_PRAGMAS без пустых значений.
+
+    Значения подставляются в SQL, поэтому допускаются только числа
+    и слова.
+    """
+    pragmas = {}
+    for name, value in settings.SQLITE_PRAGMAS.items():
+        if value in (None, ''):
+            continue
+        if not PRAGMA_VALUE.match(str(value)):
+            raise ImproperlyConfigured(
+                f'Недопустимое значение PRAGMA {name}: {value!r}'
+            )
+        pragmas[name] = value
+    return pragmas
+
+
+def configure_sqlite(sender, connection, **kwargs):
+    """
+    Применяет PRAGMA к каждому новому соединению с SQLite.
+
+    Запросы выполняются курсором драйвера, поэтому не попадают
+    в счетчики SQL-запросов представлений.
+    """
+    if connection.vendor != 'sqlite':
+        return
+    cursor = connection.connection.cursor()
+    try:
+        for name, value in get_sqlite_pragmas().items():
+            cursor.execute(f'PRAGMA {name} = {value}')
+    finally:
+        cursor.close()
@@ -1,15 +1,14 @@
 import django_filters
+from rest_framework.filters import OrderingFilter, SearchFilter
 
 from reviews.models import Title
+from reviews.search import get_search_backend
 
 
 class TitleFilter(django_filters.FilterSet):
     """Система фильтрации для модели Title."""
 
-    name = django_filters.CharFilter(
-        field_name='name',
-        lookup_expr='icontains'
-    )
+    name = django_filters.CharFilter(method='filter_name')
     category = django_filters.CharFilter(
         field_name='category__slug',
         lookup_expr='exact'
@@ -22,3 +21,27 @@ class TitleFilter(django_filters.FilterSet):
     class Meta:
         model = Title
         fields = ['name', 'year', 'genre', 'category']
+
+    def filter_name(self, queryset, name, value):
+        """Ищет подстроку в названии через поисковый индекс."""
+        return get_search_backend().filter_queryset(
+            queryset, value, fields=('name',), phrase=True
+        )
+
+
+class TitleSearchFilter(SearchFilter):
+    """
+    Поиск произведений по названию, описанию и жанрам через индекс.
+
+    Если порядок не задан параметром сортировки, результаты упорядочены
+    по релевантности.
+    """
+
+    def filter_queryset(self, request, queryset, view):
+        query = request.query_params.get(self.search_param, '').strip()
+        if not query:
+            return queryset
+        ranked = OrderingFilter.ordering_param not in request.query_params
+        return get_search_backend().filter_queryset(
+            queryset, query.replace('\x00', ''), ranked=ranked
+        )
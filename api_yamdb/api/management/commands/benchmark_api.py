@@ -0,0 +1,251 @@
+import json
+import random
+import statistics
+import subprocess
+import time
+from concurrent.futures import ThreadPoolExecutor
+
+from django.contrib.auth import get_user_model
+from django.core.management.base import BaseCommand, CommandError
+from django.db import connection
+from django.test import Client
+from django.test.utils import override_settings
+
+from api.authentication import get_token_for_user
+from reviews.models import Comment, Review, Title
+
+
+User = get_user_model()
+
+
+class Command(BaseCommand):
+    """
+    Нагрузочный тест эндпоинтов /api/v1/.
+
+    Запросы выполняются внутри процесса тестовым клиентом Django
+    в нескольких потоках, для каждого эндпоинта считаются перцентили
+    задержки, запросы в секунду и SQL-запросы на один HTTP-запрос.
+    """
+
+    PERCENTILES = (50, 95, 99)
+
+    help = 'Benchmark /api/v1/ endpoints and report latency and SQL queries'
+
+    def add_arguments(self, parser):
+        parser.add_argument('--requests', type=int, default=200,
+                            help='Requests per endpoint')
+        parser.add_argument('--concurrency', type=int, default=4)
+        parser.add_argument('--warmup', type=int, default=10,
+                            help='Unmeasured requests per endpoint')
+        parser.add_argument('--endpoints', nargs='*',
+                            help='Only run the listed endpoints')
+        parser.add_argument('--include-writes', action='store_true',
+                            help='Also benchmark comment creation')
+        parser.add_argument('--response-cache', action='store_true',
+                            help='Keep the anonymous response cache enabled')
+        parser.add_argument('--output', help='Write JSON results to a file')
+        parser.add_argument('--compare',
+                            help='JSON results of a previous run to compare')
+        parser.add_argument('--seed', type=int, default=0)
+
+    def handle(self, *args, **options):
+        """Основной метод обработки команды."""
+        self.random = random.Random(options['seed'])
+        endpoints = self.get_endpoints(options['include_writes'])
+        if options['endpoints']:
+            unknown = set(options['endpoints']) - set(endpoints)
+            if unknown:
+                raise CommandError(
+                    f'Неизвестные эндпоинты: {", ".join(sorted(unknown))}'
+                )
+            endpoints = {
+                name: endpoints[name] for name in options['endpoints']
+            }
+
+        with override_settings(
+            API_RESPONSE_CACHE_ENABLED=options['response_cache'],
+            API_THROTTLE_RATES={},
+            QUERY_BUDGET_ENABLED=False,
+        ):
+            results = {
+                name: self.run_endpoint(endpoint, options)
+                for name, endpoint in endpoints.items()
+            }
+
+        report = {
+            'meta': {
+                'commit': self.get_commit(),
+                'requests': options['requests'],
+                'concurrency': options['concurrency'],
+                'response_cache': options['response_cache'],
+                'dataset': {
+                    'titles': Title.objects.count(),
+                    'reviews': Review.objects.count(),
+                    'comments': Comment.objects.count(),
+                    'users': User.objects.count(),
+                },
+            },
+            'endpoints': results,
+        }
+        self.print_report(report)
+        if options['compare']:
+            with open(options['compare'], encoding='utf-8') as file:
+                self.print_comparison(json.load(file), report)
+        if options['output']:
+            with open(options['output'], 'w', encoding='utf-8') as file:
+                json.dump(report, file, ensure_ascii=False, indent=2)
+
+    def get_endpoints(self, include_writes):
+        """
+        Возвращает эндпоинты: имя -> (метод, функция адреса, токен, данные).
+
+        Адреса строятся по случайным объектам из текущей базы.
+        """
+        title_ids = list(Title.objects.values_list('id', flat=True)[:1000])
+        reviews = list(Review.objects.filter(
+            comments__isnull=False
+        ).values_list('id', 'title_id').distinct()[:1000])
+        if not title_ids or not reviews:
+            raise CommandError(
+                'В базе нет произведений с отзывами и комментариями, '
+                'загрузите данные командой load_csv_data.'
+            )
+        user = User.objects.filter(role=User.Role.ADMIN).first()
+        if user is None:
+            raise CommandError('В базе нет администратора.')
+        token = str(get_token_for_user(user))
+
+        def title_url(suffix=''):
+            return lambda: (
+                f'/api/v1/titles/{self.random.choice(title_ids)}/{suffix}'
+            )
+
+        def review_url(suffix=''):
+            def build():
+                review_id, title_id = self.random.choice(reviews)
+                return (
+                    f'/api/v1/titles/{title_id}/reviews/{review_id}/{suffix}'
+                )
+            return build
+
+        endpoints = {
+            'TitleViewSet.list': (
+                'get', lambda: '/api/v1/titles/', None, None),
+            'TitleViewSet.list-search': (
+                'get', lambda: '/api/v1/titles/?search=Произведение 100',
+                None, None),
+            'TitleViewSet.retrieve': ('get', title_url(), None, None),
+            'GenreViewSet.list': (
+                'get', lambda: '/api/v1/genres/', None, None),
+            'CategoryViewSet.list': (
+                'get', lambda: '/api/v1/categories/', None, None),
+            'ReviewViewSet.list': ('get', title_url('reviews/'), None, None),
+            'ReviewViewSet.retrieve': ('get', review_url(), None, None),
+            'CommentViewSet.list': (
+                'get', review_url('comments/'), None, None),
+            'UserViewSet.list': (
+                'get', lambda: '/api/v1/users/', token, None),
+            'UserViewSet.me': (
+                'get', lambda: '/api/v1/users/me/', token, None),
+        }
+        if include_writes:
+            endpoints['CommentViewSet.create'] = (
+                'post', review_url('comments/'), token,
+                {'text': 'Комментарий нагрузочного теста'},
+            )
+        return endpoints
+
+    def run_endpoint(self, endpoint, options):
+        """Выполняет запросы к одному эндпоинту и возвращает статистику."""
+        method, build_url, token, data = endpoint
+        headers = {'HTTP_AUTHORIZATION': f'Bearer {token}'} if token else {}
+
+        def send(_):
+            client = Client(**headers)
+            counter = {'queries': 0}
+
+            def count_query(execute, sql, params, many, context):
+                counter['queries'] += 1
+                return execute(sql, params, many, context)
+
+            with connection.execute_wrapper(count_query):
+                started = time.perf_counter()
+                response = getattr(client, method)(build_url(), data=data)
+                elapsed = time.perf_counter() - started
+            return elapsed, counter['queries'], response.status_code < 400
+
+        with ThreadPoolExecutor(options['concurrency']) as executor:
+            list(executor.map(send, range(options['warmup'])))
+            started = time.perf_counter()
+            samples = list(executor.map(send, range(options['requests'])))
+            total = time.perf_counter() - started
+
+        latencies = sorted(sample[0] * 1000 for sample in samples)
+        result = {
+            'requests': len(samples),
+            'errors': sum(1 for sample in samples if not sample[2]),
+            'rps': round(len(samples) / total, 1) if total else None,
+            'latency_ms': {
+                f'p{percentile}': round(
+                    self.percentile(latencies, percentile), 2
+                )
+                for percentile in self.PERCENTILES
+            },
+            'queries_per_request': round(
+                statistics.mean(sample[1] for sample in samples), 2
+            ),
+        }
+        result['latency_ms']['mean'] = round(statistics.mean(latencies), 2)
+        return result
+
+    @staticmethod
+    def percentile(values, percentile):
+        """Возвращает перцентиль по методу ближайшего ранга."""
+        index = max(0, -(-len(values) * percentile // 100) - 1)
+        return values[index]
+
+    @staticmethod
+    def get_commit():
+        """Возвращает текущий коммит git, если он доступен."""
+        try:
+            return subprocess.run(
+                ('git', 'rev-parse', '--short', 'HEAD'),
+                capture_output=True, text=True, check=True,
+            ).stdout.strip()
+        except (OSError, subprocess.CalledProcessError):
+            return None
+
+    def print_report(self, report):
+        """Выводит таблицу результатов."""
+        self.stdout.write(
+            f'{"endpoint":<28}{"rps":>8}{"p50":>9}{"p95":>9}{"p99":>9}'
+            f'{"sql/req":>9}{"errors":>8}'
+        )
+        for name, result in report['endpoints'].items():
+            latency = result['latency_ms']
+            self.stdout.write(
+                f'{name:<28}{result["rps"]:>8}{latency["p50"]:>9}'
+                f'{latency["p95"]:>9}{latency["p99"]:>9}'
+                f'{result["queries_per_request"]:>9}{result["errors"]:>8}'
+            )
+
+    def print_comparison(self, previous, report):
+        """Выводит изменения относительно предыдущего запуска в процентах."""
+        self.stdout.write(
+            f'\nСравнение с {previous["meta"].get("commit")}:'
+        )
+        for name, result in report['endpoints'].items():
+            old = previous['endpoints'].get(name)
+            if old is None:
+                continue
+            changes = []
+            for label, new_value, old_value in (
+                ('rps', result['rps'], old['rps']),
+                ('p95', result['latency_ms']['p95'], old['latency_ms']['p95']),
+                ('sql/req', result['queries_per_request'],
+                 old['queries_per_request']),
+            ):
+                if old_value:
+                    delta = (new_value - old_value) / old_value * 100
+                    changes.append(f'{label} {delta:+.1f}%')
+            self.stdout.write(f'{name:<28}' + ', '.join(changes))
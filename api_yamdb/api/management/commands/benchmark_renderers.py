@@ -0,0 +1,113 @@
+import timeit
+from datetime import datetime, timezone
+from io import BytesIO
+
+from django.core.management.base import BaseCommand
+from rest_framework.parsers import JSONParser
+from rest_framework.renderers import JSONRenderer
+from rest_framework.utils.serializer_helpers import ReturnDict, ReturnList
+
+from api.parsers import FastJSONParser
+from api.renderers import FastJSONRenderer, orjson
+
+
+class Command(BaseCommand):
+    """Сравнение JSONRenderer/JSONParser и их версий на orjson."""
+
+    help = 'Compare DRF JSON renderer/parser with the orjson-based ones'
+
+    def add_arguments(self, parser):
+        parser.add_argument('--number', type=int, default=200,
+                            help='Iterations per measurement')
+        parser.add_argument('--page-size', type=int, default=100,
+                            help='Items in list payloads')
+
+    def handle(self, *args, **options):
+        """Основной метод обработки команды."""
+        if orjson is None:
+            self.stdout.write(self.style.WARNING(
+                'orjson не установлен, сравниваются одинаковые реализации.'
+            ))
+        payloads = self.get_payloads(options['page_size'])
+        self.stdout.write(
+            f'{"payload":<16}{"operation":<10}{"drf, мкс":>12}'
+            f'{"orjson, мкс":>14}{"ускорение":>12}'
+        )
+        for name, data in payloads.items():
+            content = JSONRenderer().render(data)
+            assert FastJSONRenderer().render(data) == content
+            self.compare(
+                name, 'render', options['number'],
+                lambda: JSONRenderer().render(data),
+                lambda: FastJSONRenderer().render(data),
+            )
+            self.compare(
+                name, 'parse', options['number'],
+                lambda: JSONParser().parse(BytesIO(content)),
+                lambda: FastJSONParser().parse(BytesIO(content)),
+            )
+
+    def compare(self, name, operation, number, baseline, candidate):
+        """Измеряет и выводит среднее время одной операции."""
+        baseline_time = timeit.timeit(baseline, number=number) / number
+        candidate_time = timeit.timeit(candidate, number=number) / number
+        self.stdout.write(
+            f'{name:<16}{operation:<10}{baseline_time * 1e6:>12.1f}'
+            f'{candidate_time * 1e6:>14.1f}'
+            f'{baseline_time / candidate_time:>11.1f}x'
+        )
+
+    def get_payloads(self, page_size):
+        """Возвращает данные в форме ответов сериализаторов API."""
+        pub_date = datetime(2020, 1, 1, tzinfo=timezone.utc).isoformat()
+        titles = ReturnList([
+            ReturnDict({
+                'id': pk,
+                'name': f'Произведение {pk}',
+                'year': 1990 + pk % 30,
+                'rating': pk % 10 or None,
+                'description': 'Описание произведения ' * 5,
+                'genre': [
+                    {'name': 'Драма', 'slug': 'drama'},
+                    {'name': 'Комедия', 'slug': 'comedy'},
+                ],
+                'category': {'name': 'Фильм', 'slug': 'movie'},
+            }, serializer=None)
+            for pk in range(page_size)
+        ], serializer=None)
+        reviews = ReturnList([
+            ReturnDict({
+                'id': pk,
+                'text': 'Текст отзыва ' * 20,
+                'author': f'user{pk}',
+                'score': pk % 10 + 1,
+                'pub_date': pub_date,
+            }, serializer=None)
+            for pk in range(page_size)
+        ], serializer=None)
+        users = ReturnList([
+            ReturnDict({
+                'username': f'user{pk}',
+                'email': f'user{pk}@yamdb.fake',
+                'first_name': 'Имя',
+                'last_name': 'Фамилия',
+                'bio': '',
+                'role': 'user',
+            }, serializer=None)
+            for pk in range(page_size)
+        ], serializer=None)
+        return {
+            'titles': self.paginate(titles),
+            'reviews': self.paginate(reviews),
+            'users': self.paginate(users),
+        }
+
+    @staticmethod
+    def paginate(results):
+        """Оборачивает список в ответ LimitOffsetPagination."""
+        return {
+            'count': len(results) * 10,
+            'next': 'http://testserver/api/v1/titles/?limit=100&offset=100',
+            'previous': None,
+            'results': results,
+        }
@@ -0,0 +1,194 @@
+import os
+import random
+import sqlite3
+import tempfile
+import threading
+import time
+
+from django.core.management.base import BaseCommand
+
+from api.db import get_sqlite_pragmas
+
+
+class Command(BaseCommand):
+    """
+    Нагрузочный тест SQLite со смешанными чтением и записью.
+
+    Для каждого профиля PRAGMA создается временная база с произведениями
+    и отзывами. Потоки читают страницу отзывов произведения или, с
+    вероятностью --write-ratio, добавляют отзыв и обновляют рейтинг
+    в одной транзакции, как Review.save(). Профиль default повторяет
+    настройки SQLite по умолчанию, tuned - настройку SQLITE_PRAGMAS.
+    """
+
+    DEFAULT_PRAGMAS = {
+        'journal_mode': 'delete',
+        'synchronous': 'full',
+        'busy_timeout': '5000',
+    }
+    PERCENTILE = 95
+
+    help = 'Compare SQLite throughput with default and tuned pragmas'
+
+    def add_arguments(self, parser):
+        parser.add_argument('--threads', type=int, default=8)
+        parser.add_argument('--duration', type=float, default=5,
+                            help='Seconds per profile')
+        parser.add_argument('--write-ratio', type=float, default=0.2)
+        parser.add_argument('--titles', type=int, default=1000)
+        parser.add_argument('--reviews-per-title', type=int, default=10)
+        parser.add_argument('--seed', type=int, default=0)
+
+    def handle(self, *args, **options):
+        """Основной метод обработки команды."""
+        profiles = {
+            'default': self.DEFAULT_PRAGMAS,
+            'tuned': get_sqlite_pragmas(),
+        }
+        self.stdout.write(
+            f'{"profile":<10}{"ops/s":>9}{"reads/s":>9}{"writes/s":>10}'
+            f'{"read p95":>10}{"write p95":>11}{"locked":>8}'
+        )
+        for name, pragmas in profiles.items():
+            with tempfile.TemporaryDirectory() as directory:
+                path = os.path.join(directory, 'benchmark.sqlite3')
+                self.create_database(path, pragmas, options)
+                result = self.run_profile(path, pragmas, options)
+            self.stdout.write(
+                f'{name:<10}{result["ops"]:>9.0f}{result["reads"]:>9.0f}'
+                f'{result["writes"]:>10.0f}{result["read_p95"]:>10.2f}'
+                f'{result["write_p95"]:>11.2f}{result["locked"]:>8}'
+            )
+
+    def connect(self, path, pragmas):
+        """Открывает соединение в режиме autocommit, как Django."""
+        connection = sqlite3.connect(
+            path, isolation_level=None, check_same_thread=False
+        )
+        for name, value in pragmas.items():
+            connection.execute(f'PRAGMA {name} = {value}')
+        return connection
+
+    def create_database(self, path, pragmas, options):
+        """Создает таблицы произведений и отзывов с тестовыми данными."""
+        rows = random.Random(options['seed'])
+        connection = self.connect(path, pragmas)
+        connection.executescript('''
+            CREATE TABLE title (
+                id INTEGER PRIMARY KEY AUTOINCREMENT,
+                name VARCHAR(256) NOT NULL,
+                rating_sum INTEGER NOT NULL,
+                review_count INTEGER NOT NULL
+            );
+            CREATE TABLE review (
+                id INTEGER PRIMARY KEY AUTOINCREMENT,
+                title_id INTEGER NOT NULL REFERENCES title (id),
+                text TEXT NOT NULL,
+                score INTEGER NOT NULL,
+                pub_date DATETIME NOT NULL
+            );
+            CREATE INDEX review_title_id ON review (title_id);
+        ''')
+        connection.execute('BEGIN')
+        connection.executemany(
+            'INSERT INTO title (name, rating_sum, review_count) '
+            'VALUES (?, 0, 0)',
+            ((f'Произведение {index}',) for index in range(options['titles']))
+        )
+        connection.executemany(
+            'INSERT INTO review (title_id, text, score, pub_date) '
+            "VALUES (?, 'Отзыв', ?, datetime('now'))",
+            (
+                (title_id, rows.randint(1, 10))
+                for title_id in range(1, options['titles'] + 1)
+                for _ in range(options['reviews_per_title'])
+            )
+        )
+        connection.execute(
+            'UPDATE title SET rating_sum = (SELECT SUM(score) FROM review '
+            'WHERE title_id = title.id), review_count = (SELECT COUNT(*) '
+            'FROM review WHERE title_id = title.id)'
+        )
+        connection.execute('COMMIT')
+        connection.close()
+
+    def read(self, connection, title_id):
+        connection.execute(
+            'SELECT review.id, review.text, review.score, title.name '
+            'FROM review JOIN title ON title.id = review.title_id '
+            'WHERE review.title_id = ? ORDER BY review.pub_date DESC '
+            'LIMIT 10',
+            (title_id,),
+        ).fetchall()
+
+    def write(self, connection, title_id, score):
+        connection.execute('BEGIN')
+        try:
+            connection.execute(
+                'INSERT INTO review (title_id, text, score, pub_date) '
+                "VALUES (?, 'Отзыв', ?, datetime('now'))",
+                (title_id, score),
+            )
+            connection.execute(
+                'UPDATE title SET rating_sum = rating_sum + ?, '
+                'review_count = review_count + 1 WHERE id = ?',
+                (score, title_id),
+            )
+            connection.execute('COMMIT')
+        except sqlite3.OperationalError:
+            connection.execute('ROLLBACK')
+            raise
+
+    def run_profile(self, path, pragmas, options):
+        """Запускает потоки на --duration секунд и собирает статистику."""
+        reads, writes = [], []
+        locked = []
+        deadline = time.perf_counter() + options['duration']
+
+        def worker(seed):
+            rows = random.Random(seed)
+            connection = self.connect(path, pragmas)
+            while time.perf_counter() < deadline:
+                title_id = rows.randint(1, options['titles'])
+                is_write = rows.random() < options['write_ratio']
+                started = time.perf_counter()
+                try:
+                    if is_write:
+                        self.write(
+                            connection, title_id, rows.randint(1, 10)
+                        )
+                    else:
+                        self.read(connection, title_id)
+                except sqlite3.OperationalError:
+                    locked.append(1)
+                    continue
+                elapsed = (time.perf_counter() - started) * 1000
+                (writes if is_write else reads).append(elapsed)
+            connection.close()
+
+        threads = [
+            threading.Thread(target=worker, args=(options['seed'] + index,))
+            for index in range(options['threads'])
+        ]
+        started = time.perf_counter()
+        for thread in threads:
+            thread.start()
+        for thread in threads:
+            thread.join()
+        total = time.perf_counter() - started
+
+        return {
+            'ops': (len(reads) + len(writes)) / total,
+            'reads': len(reads) / total,
+            'writes': len(writes) / total,
+            'read_p95': self.percentile(reads),
+            'write_p95': self.percentile(writes),
+            'locked': len(locked),
+        }
+
+    def percentile(self, values):
+        """Возвращает перцентиль задержки по методу ближайшего ранга."""
+        if not values:
+            return 0.0
+        values = sorted(values)
+        return values[max(0, -(-len(values) * self.PERCENTILE // 100) - 1)]
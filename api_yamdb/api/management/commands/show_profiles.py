@@ -0,0 +1,48 @@
+from django.core.management.base import BaseCommand, CommandError
+
+from api.profiling import get_profile, get_profiles
+
+
+class Command(BaseCommand):
+    """
+    Вывод профилей запросов, сохраненных ProfilingMiddleware.
+
+    Без аргументов выводит список последних профилей, с id - статистику
+    cProfile или стеки и журнал SQL-запросов профиля. Профили хранятся
+    в кэше PROFILER_CACHE_ALIAS, поэтому команда видит профили сервера
+    только при общем для процессов кэше.
+    """
+
+    help = 'List recent request profiles or show one of them'
+
+    def add_arguments(self, parser):
+        parser.add_argument('profile_id', nargs='?')
+
+    def handle(self, *args, **options):
+        """Основной метод обработки команды."""
+        if options['profile_id'] is None:
+            for profile in get_profiles():
+                self.stdout.write(
+                    f'{profile["id"]}  {profile["duration"] * 1000:8.1f} ms  '
+                    f'{profile["query_count"]:4} sql  {profile["trigger"]:<6} '
+                    f'{profile["method"]} {profile["path"]} '
+                    f'({profile["view"]})'
+                )
+            return
+
+        profile = get_profile(options['profile_id'])
+        if profile is None:
+            raise CommandError('Профиль не найден.')
+        self.stdout.write(
+            f'{profile["method"]} {profile["path"]} ({profile["view"]}): '
+            f'{profile["status"]}, {profile["duration"] * 1000:.1f} ms'
+        )
+        if 'stats' in profile:
+            self.stdout.write(profile['stats'])
+        for item in profile.get('stacks', ()):
+            self.stdout.write(f'{item["samples"]:6} {item["stack"]}')
+        self.stdout.write(f'\nSQL-запросов: {profile["query_count"]}')
+        for query in profile['queries']:
+            self.stdout.write(
+                f'{query["time"] * 1000:8.2f} ms  {query["sql"]}'
+            )
@@ -0,0 +1,287 @@
+import threading
+import time
+from bisect import bisect_left
+from contextlib import ExitStack
+
+from django.conf import settings
+from django.db import connections
+
+from api.backends.pool import get_pool_stats
+from api.query_budget import get_view_action
+
+
+CONTENT_TYPE = 'text/plain; version=0.0.4; charset=utf-8'
+LATENCY_BUCKETS = (
+    0.005, 0.01, 0.025, 0.05, 0.1, 0.25, 0.5, 1, 2.5, 5, 10,
+)
+SIZE_BUCKETS = (100, 1000, 10000, 100000, 1000000, 10000000)
+
+
+class RequestStats:
+    """Счетчики запросов к одному представлению с одним статусом."""
+
+    __slots__ = (
+        'count', 'latency_buckets', 'latency_sum', 'size_buckets',
+        'size_sum', 'queries', 'query_seconds',
+    )
+
+    def __init__(self):
+        self.count = 0
+        self.latency_buckets = [0] * (len(LATENCY_BUCKETS) + 1)
+        self.latency_sum = 0.0
+        self.size_buckets = [0] * (len(SIZE_BUCKETS) + 1)
+        self.size_sum = 0
+        self.queries = 0
+        self.query_seconds = 0.0
+
+    def observe(self, duration, size, queries, query_seconds):
+        self.count += 1
+        self.latency_buckets[bisect_left(LATENCY_BUCKETS, duration)] += 1
+        self.latency_sum += duration
+        self.size_buckets[bisect_left(SIZE_BUCKETS, size)] += 1
+        self.size_sum += size
+        self.queries += queries
+        self.query_seconds += query_seconds
+
+    def merge(self, other):
+        self.count += other.count
+        for index, value in enumerate(other.latency_buckets):
+            self.latency_buckets[index] += value
+        self.latency_sum += other.latency_sum
+        for index, value in enumerate(other.size_buckets):
+            self.size_buckets[index] += value
+        self.size_sum += other.size_sum
+        self.queries += other.queries
+        self.query_seconds += other.query_seconds
+
+
+def merge_stats(target, source):
+    for key, stats in source.items():
+        if key not in target:
+            target[key] = RequestStats()
+        target[key].merge(stats)
+
+
+class MetricsRegistry:
+    """
+    Метрики запросов, собранные по потокам.
+
+    Каждый поток пишет в свой словарь без блокировок, блокировка
+    берется только при регистрации потока и при чтении метрик.
+    Счетчики завершившихся потоков переносятся в общий словарь,
+    чтобы пересоздание потоков сервером не сбрасывало их.
+    """
+
+    def __init__(self):
+        self.local = threading.local()
+        self.lock = threading.Lock()
+        self.threads = []
+        self.retired = {}
+
+    def get_thread_stats(self):
+        stats = getattr(self.local, 'stats', None)
+        if stats is None:
+            stats = self.local.stats = {}
+            with self.lock:
+                self.threads.append((threading.current_thread(), stats))
+        return stats
+
+    def observe(self, view, method, status, duration, size, queries,
+                query_seconds):
+        """Учитывает один HTTP-запрос."""
+        stats = self.get_thread_stats()
+        key = (view, method, status)
+        if key not in stats:
+            stats[key] = RequestStats()
+        stats[key].observe(duration, size, queries, query_seconds)
+
+    def collect(self):
+        """Возвращает сумму счетчиков всех потоков: ключ -> RequestStats."""
+        collected = {}
+        with self.lock:
+            alive = []
+            for thread, stats in self.threads:
+                if thread.is_alive():
+                    alive.append((thread, stats))
+                    merge_stats(collected, stats.copy())
+                else:
+                    merge_stats(self.retired, stats)
+            self.threads = alive
+            merge_stats(collected, self.retired)
+        return collected
+
+    def reset(self):
+        with self.lock:
+            for _, stats in self.threads:
+                stats.clear()
+            self.retired = {}
+
+
+registry = MetricsRegistry()
+
+
+def format_labels(**labels):
+    escaped = (
+        (name, str(value).replace('\\', '\\\\').replace('"', '\\"')
+         .replace('\n', '\\n'))
+        for name, value in labels.items()
+    )
+    return '{' + ','.join(f'{name}="{value}"' for name, value in escaped) + '}'
+
+
+def format_histogram(name, buckets, counts, total, labels):
+    lines = []
+    cumulative = 0
+    for bound, count in zip(buckets, counts):
+        cumulative += count
+        lines.append(
+            f'{name}_bucket{format_labels(**labels, le=bound)} {cumulative}'
+        )
+    lines.append(
+        f'{name}_bucket{format_labels(**labels, le="+Inf")} {sum(counts)}'
+    )
+    lines.append(f'{name}_sum{format_labels(**labels)} {total}')
+    lines.append(f'{name}_count{format_labels(**labels)} {sum(counts)}')
+    return lines
+
+
+def render_request_metrics(collected):
+    families = {
+        'api_requests_total': (
+            'counter', 'Число HTTP-запросов.', []),
+        'api_request_duration_seconds': (
+            'histogram', 'Время обработки HTTP-запроса.', []),
+        'api_response_size_bytes': (
+            'histogram', 'Размер тела ответа.', []),
+        'api_db_queries_total': (
+            'counter', 'Число SQL-запросов.', []),
+        'api_db_query_duration_seconds_total': (
+            'counter', 'Суммарное время SQL-запросов.', []),
+    }
+    for (view, method, status), stats in sorted(collected.items()):
+        labels = {'view': view, 'method': method, 'status': status}
+        families['api_requests_total'][2].append(
+            f'api_requests_total{format_labels(**labels)} {stats.count}'
+        )
+        families['api_request_duration_seconds'][2].extend(format_histogram(
+            'api_request_duration_seconds', LATENCY_BUCKETS,
+            stats.latency_buckets, stats.latency_sum, labels,
+        ))
+        families['api_response_size_bytes'][2].extend(format_histogram(
+            'api_response_size_bytes', SIZE_BUCKETS,
+            stats.size_buckets, stats.size_sum, labels,
+        ))
+        families['api_db_queries_total'][2].append(
+            f'api_db_queries_total{format_labels(**labels)} {stats.queries}'
+        )
+        families['api_db_query_duration_seconds_total'][2].append(
+            f'api_db_query_duration_seconds_total{format_labels(**labels)} '
+            f'{stats.query_seconds}'
+        )
+    lines = []
+    for name, (kind, description, samples) in families.items():
+        lines.append(f'# HELP {name} {description}')
+        lines.append(f'# TYPE {name} {kind}')
+        lines.extend(samples)
+    return lines
+
+
+def render_pool_metrics(pools):
+    gauges = {
+        'db_pool_size': ('gauge', 'Максимум соединений в пуле.', 'size'),
+        'db_pool_connections_in_use': (
+            'gauge', 'Выданные соединения пула.', 'in_use'),
+        'db_pool_connections_idle': (
+            'gauge', 'Свободные соединения пула.', 'idle'),
+        'db_pool_checkouts_total': (
+            'counter', 'Выдачи соединений из пула.', 'checkouts'),
+        'db_pool_waits_total': (
+            'counter', 'Выдачи с ожиданием свободного соединения.', 'waits'),
+        'db_pool_wait_seconds_total': (
+            'counter', 'Суммарное время ожидания соединения.',
+            'wait_seconds'),
+        'db_pool_timeouts_total': (
+            'counter', 'Ожидания, завершившиеся ошибкой.', 'timeouts'),
+    }
+    lines = []
+    for name, (kind, description, field) in gauges.items():
+        lines.append(f'# HELP {name} {description}')
+        lines.append(f'# TYPE {name} {kind}')
+        for alias, stats in sorted(pools.items()):
+            lines.append(
+                f'{name}{format_labels(alias=alias)} {stats[field]}'
+            )
+    return lines
+
+
+def render_metrics():
+    """Возвращает метрики в текстовом формате Prometheus."""
+    lines = render_request_metrics(registry.collect())
+    pools = get_pool_stats()
+    if pools:
+        lines.extend(render_pool_metrics(pools))
+    return '\n'.join(lines) + '\n'
+
+
+class QueryTimer:
+    """Считает SQL-запросы и их суммарное время."""
+
+    def __init__(self):
+        self.count = 0
+        self.seconds = 0.0
+        self.stack = ExitStack()
+
+    def __call__(self, execute, sql, params, many, context):
+        started = time.perf_counter()
+        try:
+            return execute(sql, params, many, context)
+        finally:
+            self.count += 1
+            self.seconds += time.perf_counter() - started
+
+    def __enter__(self):
+        for connection in connections.all():
+            self.stack.enter_context(connection.execute_wrapper(self))
+        return self
+
+    def __exit__(self, *exc_info):
+        self.stack.close()
+
+
+class MetricsMiddleware:
+    """
+    Метрики HTTP-запросов для Prometheus.
+
+    Для каждого запроса учитываются время обработки, размер ответа,
+    число и время SQL-запросов с метками view (вьюсет и действие,
+    например TitleViewSet.list), method и status. Отключается
+    настройкой API_METRICS_ENABLED.
+    """
+
+    def __init__(self, get_response):
+        self.get_response = get_response
+
+    def __call__(self, request):
+        if not settings.API_METRICS_ENABLED:
+            return self.get_response(request)
+        started = time.perf_counter()
+        with QueryTimer() as timer:
+            response = self.get_response(request)
+        duration = time.perf_counter() - started
+
+        if response.streaming:
+            size = int(response.get('Content-Length', 0))
+        else:
+            size = len(response.content)
+        registry.observe(
+            getattr(request, 'metrics_view', 'unmatched'),
+            request.method, response.status_code, duration, size,
+            timer.count, timer.seconds,
+        )
+        return response
+
+    def process_view(self, request, view_func, view_args, view_kwargs):
+        view_class, action = get_view_action(view_func, request.method)
+        request.metrics_view = (
+            f'{view_class.__name__}.{action}' if view_class else 'other'
+        )
@@ -1,5 +1,18 @@
+import hashlib
+from calendar import timegm
+
+from django.conf import settings
+from django.core.exceptions import ValidationError as DjangoValidationError
+from django.db.models import Max
+from django.http import Http404
+from django.utils.cache import get_conditional_response, quote_etag
+from django.utils.http import http_date
 from rest_framework import serializers
+from rest_framework.exceptions import ValidationError
+from rest_framework.permissions import SAFE_METHODS
+from rest_framework.response import Response
 
+from api import cache
 from constants import FORBIDDEN_NAMES
 
 
@@ -12,3 +25,319 @@ class UsernameValidationMixin:
                 f'Имя пользователя не может быть {data}'
             )
         return data
+
+
+class SparseFieldsSerializerMixin:
+    """Оставляет в сериализаторе только поля из аргумента fields."""
+
+    def __init__(self, *args, fields=None, **kwargs):
+        super().__init__(*args, **kwargs)
+        if fields is not None:
+            for name in set(self.fields) - set(fields):
+                self.fields.pop(name)
+
+
+class SparseFieldsMixin:
+    """
+    Поддерживает параметры fields, omit и expand в GET-запросах.
+
+    fields задает поля ответа через запятую, omit исключает поля,
+    expand добавляет к выбранным полям вложенные объекты из
+    expandable_fields. Словарь sparse_fields сопоставляет полям ответа
+    поля модели: по нему запрос загружает только нужные столбцы,
+    а связанные объекты соединяются или предзагружаются, только если
+    они попали в ответ. Столбцы из required_columns загружаются всегда.
+    """
+
+    fields_param = 'fields'
+    omit_param = 'omit'
+    expand_param = 'expand'
+    sparse_fields = {}
+    expandable_fields = ()
+    required_columns = ()
+
+    def get_param_names(self, param):
+        """Возвращает имена полей из параметра запроса."""
+        value = self.request.query_params.get(param, '')
+        return [name.strip() for name in value.split(',') if name.strip()]
+
+    def get_requested_fields(self):
+        """
+        Возвращает поля ответа в порядке sparse_fields.
+
+        Результат запоминается на время обработки запроса. Для запросов
+        на изменение возвращаются все поля.
+        """
+        if hasattr(self, '_requested_fields'):
+            return self._requested_fields
+        if self.request.method not in SAFE_METHODS:
+            self._requested_fields = tuple(self.sparse_fields)
+            return self._requested_fields
+
+        fields = self.get_param_names(self.fields_param)
+        omit = self.get_param_names(self.omit_param)
+        expand = self.get_param_names(self.expand_param)
+        errors = {}
+        for param, names, allowed in (
+            (self.fields_param, fields, self.sparse_fields),
+            (self.omit_param, omit, self.sparse_fields),
+            (self.expand_param, expand, self.expandable_fields),
+        ):
+            unknown = [name for name in names if name not in allowed]
+            if unknown:
+                errors[param] = [
+                    f'Неизвестные поля: {", ".join(unknown)}'
+                ]
+        if errors:
+            raise ValidationError(errors)
+
+        selected = set(fields or self.sparse_fields) | set(expand)
+        selected -= set(omit)
+        self._requested_fields = tuple(
+            name for name in self.sparse_fields if name in selected
+        )
+        return self._requested_fields
+
+    def get_sparse_lookups(self, model):
+        """
+        Возвращает (столбцы, select_related, prefetch_related) для модели.
+
+        Первичный ключ загружается всегда, для полей связанных моделей
+        загружается и внешний ключ.
+        """
+        columns = [model._meta.pk.name, *self.required_columns]
+        select_related = []
+        prefetch_related = []
+        for name in self.get_requested_fields():
+            for lookup in self.sparse_fields[name]:
+                relation, *path = lookup.split('__')
+                if model._meta.get_field(relation).many_to_many:
+                    prefetch_related.append(relation)
+                    continue
+                if path:
+                    select_related.append(relation)
+                    columns.append(relation)
+                columns.append(lookup)
+        return (
+            list(dict.fromkeys(columns)),
+            list(dict.fromkeys(select_related)),
+            prefetch_related,
+        )
+
+    def trim_queryset(self, queryset):
+        """
+        Подключает к queryset только связи и столбцы из ответа.
+
+        Запросы на изменение загружают все столбцы: частично загруженный
+        объект не сохранил бы поля, которых нет в ответе.
+        """
+        columns, select_related, prefetch_related = self.get_sparse_lookups(
+            queryset.model
+        )
+        # select_related() без аргументов соединил бы все связи.
+        if select_related:
+            queryset = queryset.select_related(*select_related)
+        if prefetch_related:
+            queryset = queryset.prefetch_related(*prefetch_related)
+        if self.request.method in SAFE_METHODS:
+            queryset = queryset.only(*columns)
+        return queryset
+
+    def get_serializer(self, *args, **kwargs):
+        if self.request.method in SAFE_METHODS:
+            kwargs.setdefault('fields', self.get_requested_fields())
+        return super().get_serializer(*args, **kwargs)
+
+
+class CachedResponseMixin:
+    """
+    Кэширует ответы на GET-запросы анонимных пользователей.
+
+    Ключ ответа включает версии групп зависимостей из
+    get_cache_dependencies(), сигналы изменения моделей увеличивают
+    версии и тем самым сбрасывают устаревшие ответы. Вместе с данными
+    сохраняются заголовки из get_cached_headers().
+    """
+
+    cache_dependencies = ()
+
+    def get_cache_dependencies(self):
+        """Возвращает группы данных, от которых зависит ответ."""
+        return self.cache_dependencies
+
+    def get_cached_headers(self, request, response):
+        """Возвращает заголовки, которые сохраняются вместе с ответом."""
+        return {}
+
+    def cached_response(self, handler, request, *args, **kwargs):
+        """Возвращает ответ из кэша или сохраняет в кэш новый."""
+        if (
+            not settings.API_RESPONSE_CACHE_ENABLED
+            or request.method != 'GET'
+            or request.user.is_authenticated
+        ):
+            return handler(request, *args, **kwargs)
+
+        key = cache.build_key(request, self.get_cache_dependencies())
+        entry = cache.get_cache().get(key)
+        if entry is not None:
+            cache.count('hit')
+            return Response(
+                entry['data'], headers={**entry['headers'], 'X-Cache': 'HIT'}
+            )
+
+        cache.count('miss')
+        response = handler(request, *args, **kwargs)
+        if response.status_code == 200:
+            headers = self.get_cached_headers(request, response)
+            for name, value in headers.items():
+                response[name] = value
+            cache.get_cache().set(
+                key,
+                {'data': response.data, 'headers': headers},
+                settings.API_RESPONSE_CACHE_TIMEOUT,
+            )
+            response['X-Cache'] = 'MISS'
+        return response
+
+
+class CachedListMixin(CachedResponseMixin):
+    """Кэширует ответы list для анонимных пользователей."""
+
+    def list(self, request, *args, **kwargs):
+        return self.cached_response(super().list, request, *args, **kwargs)
+
+
+class CachedRetrieveMixin(CachedResponseMixin):
+    """Кэширует ответы retrieve для анонимных пользователей."""
+
+    def retrieve(self, request, *args, **kwargs):
+        return self.cached_response(
+            super().retrieve, request, *args, **kwargs
+        )
+
+
+class ConditionalGetMixin:
+    """
+    Поддерживает условные GET-запросы для list и retrieve.
+
+    ETag и Last-Modified вычисляются по наибольшему значению поля
+    modified и id записей страницы, без загрузки и сериализации самих
+    объектов и без COUNT(*). Валидаторы вычисляются, только если в
+    запросе есть If-None-Match или If-Modified-Since или ответ
+    сохраняется в кэш; ответ из кэша отдает сохраненные с ним
+    валидаторы. При совпадении валидаторов возвращается ответ 304.
+    """
+
+    modified_field = 'modified'
+    conditional_actions = ('list', 'retrieve')
+    conditional_headers = ('HTTP_IF_NONE_MATCH', 'HTTP_IF_MODIFIED_SINCE')
+
+    def get_conditional_queryset(self):
+        """
+        Возвращает queryset, по которому вычисляются валидаторы.
+
+        Некорректное значение из URL дает 404, как в get_object().
+        """
+        queryset = self.filter_queryset(self.get_queryset())
+        if self.action == 'retrieve':
+            lookup_url_kwarg = self.lookup_url_kwarg or self.lookup_field
+            try:
+                queryset = queryset.filter(
+                    **{self.lookup_field: self.kwargs[lookup_url_kwarg]}
+                )
+            except (TypeError, ValueError, DjangoValidationError):
+                raise Http404
+        return queryset.order_by()
+
+    def paginate_queryset(self, queryset):
+        """Запоминает id записей страницы для валидаторов."""
+        page = super().paginate_queryset(queryset)
+        if page is not None:
+            self._page_ids = [
+                row['id'] if isinstance(row, dict) else row.pk
+                for row in page
+            ]
+        return page
+
+    def get_page_ids(self, request):
+        """
+        Возвращает id записей страницы списка.
+
+        Если страница еще не загружена, id запрашиваются у пагинатора
+        без подсчета записей. У retrieve объект задан адресом запроса.
+        """
+        if self.action != 'list' or self.paginator is None:
+            return []
+        if not hasattr(self, '_page_ids'):
+            self._page_ids = self.paginator.get_page_ids(
+                self.filter_queryset(self.get_queryset()), request, self
+            )
+        return self._page_ids
+
+    def get_validators(self, request):
+        """
+        Возвращает пару (ETag, Last-Modified) или None.
+
+        Результат запоминается на время обработки запроса.
+        """
+        if hasattr(self, '_validators'):
+            return self._validators
+        last_modified = self.get_conditional_queryset().aggregate(
+            last_modified=Max(self.modified_field),
+        )['last_modified']
+        self._validators = None
+        if last_modified is not None:
+            ids = ','.join(map(str, self.get_page_ids(request)))
+            digest = hashlib.md5(
+                f'{request.path}?{cache.normalize_query(request)}:'
+                f'{last_modified.isoformat()}:{ids}'.encode()
+            ).hexdigest()
+            self._validators = (
+                quote_etag(digest), timegm(last_modified.utctimetuple()),
+            )
+        return self._validators
+
+    def get_cached_headers(self, request, response):
+        """Сохраняет валидаторы list и retrieve вместе с ответом в кэше."""
+        headers = super().get_cached_headers(request, response)
+        if self.action not in self.conditional_actions:
+            return headers
+        validators = self.get_validators(request)
+        if validators is not None:
+            etag, last_modified = validators
+            headers.update({
+                'ETag': etag, 'Last-Modified': http_date(last_modified),
+            })
+        return headers
+
+    def conditional_response(self, handler, request, *args, **kwargs):
+        """Возвращает 304 или ответ обработчика с валидаторами."""
+        if request.method != 'GET' or not any(
+            name in request.META for name in self.conditional_headers
+        ):
+            return handler(request, *args, **kwargs)
+
+        validators = self.get_validators(request)
+        if validators is None:
+            return handler(request, *args, **kwargs)
+        etag, last_modified = validators
+        response = get_conditional_response(
+            request, etag=etag, last_modified=last_modified
+        )
+        if response is None:
+            response = handler(request, *args, **kwargs)
+        if response.status_code in (200, 304):
+            response['ETag'] = etag
+            response['Last-Modified'] = http_date(last_modified)
+        return response
+
+    def list(self, request, *args, **kwargs):
+        return self.conditional_response(
+            super().list, request, *args, **kwargs
+        )
+
+    def retrieve(self, request, *args, **kwargs):
+        return self.conditional_response(
+            super().retrieve, request, *args, **kwargs
+        )
@@ -0,0 +1,177 @@
+import hashlib
+
+from django.conf import settings
+from rest_framework.pagination import CursorPagination, LimitOffsetPagination
+from rest_framework.utils.urls import replace_query_param
+
+from api import cache
+from reviews.counts import bounded_count, estimate_count
+
+
+COUNT_PREFIX = 'api-count'
+
+
+class PubDateCursorPagination(CursorPagination):
+    """
+    Курсорная пагинация по дате публикации.
+
+    Использует индекс по pub_date, id служит для однозначного порядка
+    записей с одинаковой датой. Стоимость запроса не зависит от глубины
+    страницы, запрос COUNT(*) не выполняется.
+    """
+
+    ordering = ('-pub_date', '-id')
+    page_size_query_param = 'limit'
+
+
+class ApproximateCountPagination(LimitOffsetPagination):
+    """
+    Пагинация limit/offset без полного COUNT(*) по большим выборкам.
+
+    Число записей считается точно, пока оно меньше
+    PAGINATION_EXACT_COUNT_LIMIT. Большее число берется из статистики
+    базы для выборки без фильтров или считается один раз и кэшируется
+    на PAGINATION_COUNT_CACHE_TIMEOUT секунд для каждого набора
+    фильтров; ключ включает версии групп из get_cache_dependencies()
+    представления, поэтому изменения данных сбрасывают его. С
+    параметром `count=false` число не считается и возвращается null.
+    Если число неточное, наличие следующей страницы определяется
+    по лишней записи, загруженной вместе со страницей.
+    """
+
+    count_query_param = 'count'
+    omit_count_values = ('false', '0')
+
+    def omit_count(self, request):
+        """Проверяет, отказался ли клиент от подсчета записей."""
+        value = request.query_params.get(self.count_query_param, '')
+        return value.lower() in self.omit_count_values
+
+    def get_count_key(self, queryset, view):
+        """Ключ кэша числа записей для фильтров выборки."""
+        sql, params = queryset.order_by().values('pk').query.sql_with_params()
+        digest = hashlib.md5(f'{sql}:{params!r}'.encode()).hexdigest()
+        groups = ()
+        if hasattr(view, 'get_cache_dependencies'):
+            groups = view.get_cache_dependencies()
+        versions = '.'.join(map(str, cache.get_versions(groups)))
+        return f'{COUNT_PREFIX}:{digest}:{versions}'
+
+    def get_approximate_count(self, queryset, view):
+        """
+        Возвращает число записей и признак того, что оно точное.
+
+        COUNT(*) с LIMIT по порогу показывает, большая ли выборка:
+        меньшее число точное, большее считается один раз и берется
+        из кэша.
+        """
+        key = self.get_count_key(queryset, view)
+        count = cache.get_cache().get(key)
+        if count is not None:
+            return count, False
+        limit = settings.PAGINATION_EXACT_COUNT_LIMIT
+        count = bounded_count(queryset, limit)
+        if count < limit:
+            return count, True
+        estimate = None
+        if not queryset.query.where:
+            estimate = estimate_count(queryset.model, queryset.db)
+        if estimate is not None and estimate >= limit:
+            count = estimate
+        else:
+            count = queryset.count()
+        cache.get_cache().set(
+            key, count, settings.PAGINATION_COUNT_CACHE_TIMEOUT
+        )
+        return count, False
+
+    def paginate_queryset(self, queryset, request, view=None):
+        self.limit = self.get_limit(request)
+        if self.limit is None:
+            return None
+        self.offset = self.get_offset(request)
+        self.request = request
+        if self.omit_count(request):
+            self.count, exact = None, False
+        else:
+            self.count, exact = self.get_approximate_count(queryset, view)
+        if self.count and self.count > self.limit and self.template:
+            self.display_page_controls = True
+
+        if exact:
+            self.has_next = self.offset + self.limit < self.count
+            if self.count == 0 or self.offset > self.count:
+                return []
+            return list(queryset[self.offset:self.offset + self.limit])
+        page = list(queryset[self.offset:self.offset + self.limit + 1])
+        self.has_next = len(page) > self.limit
+        return page[:self.limit]
+
+    def get_page_ids(self, queryset, request, view=None):
+        """
+        Возвращает id записей страницы одним запросом без подсчета.
+
+        Используется для валидаторов условных запросов.
+        """
+        limit = self.get_limit(request)
+        queryset = queryset.values_list('pk', flat=True)
+        if limit is None:
+            return list(queryset)
+        offset = self.get_offset(request)
+        return list(queryset[offset:offset + limit])
+
+    def get_next_link(self):
+        if not self.has_next:
+            return None
+        url = self.request.build_absolute_uri()
+        url = replace_query_param(url, self.limit_query_param, self.limit)
+        return replace_query_param(
+            url, self.offset_query_param, self.offset + self.limit
+        )
+
+
+class ReviewCommentPagination(ApproximateCountPagination):
+    """
+    Пагинация для отзывов и комментариев.
+
+    По умолчанию работает как ApproximateCountPagination. Курсорный режим
+    включается параметром `pagination=cursor` или наличием параметра
+    `cursor` в запросе, ответ в этом режиме не содержит ключа `count`.
+    """
+
+    mode_query_param = 'pagination'
+    cursor_mode = 'cursor'
+    cursor_pagination_class = PubDateCursorPagination
+
+    def __init__(self):
+        self.cursor_paginator = None
+
+    def use_cursor(self, request):
+        """Проверяет, запрошен ли курсорный режим пагинации."""
+        params = request.query_params
+        return (
+            params.get(self.mode_query_param) == self.cursor_mode
+            or self.cursor_pagination_class.cursor_query_param in params
+        )
+
+    def paginate_queryset(self, queryset, request, view=None):
+        if self.use_cursor(request):
+            self.cursor_paginator = self.cursor_pagination_class()
+            return self.cursor_paginator.paginate_queryset(
+                queryset, request, view
+            )
+        return super().paginate_queryset(queryset, request, view)
+
+    def get_page_ids(self, queryset, request, view=None):
+        if self.use_cursor(request):
+            field = self.cursor_pagination_class.ordering[0].lstrip('-')
+            page = self.cursor_pagination_class().paginate_queryset(
+                queryset.values('pk', field), request, view
+            )
+            return [row['pk'] for row in page]
+        return super().get_page_ids(queryset, request, view)
+
+    def get_paginated_response(self, data):
+        if self.cursor_paginator is not None:
+            return self.cursor_paginator.get_paginated_response(data)
+        return super().get_paginated_response(data)
@@ -0,0 +1,234 @@
+import cProfile
+import io
+import pstats
+import random
+import sys
+import threading
+import time
+import uuid
+from collections import Counter
+
+from django.conf import settings
+from django.core.cache import caches
+from rest_framework.exceptions import APIException
+from rest_framework.settings import api_settings
+
+from api.query_budget import QueryRecorder, get_view_action
+
+
+PROFILE_PREFIX = 'api-profile'
+MAX_STACK_DEPTH = 64
+
+
+def get_cache():
+    """Возвращает кэш, выбранный настройкой PROFILER_CACHE_ALIAS."""
+    return caches[settings.PROFILER_CACHE_ALIAS]
+
+
+def save_profile(profile):
+    """
+    Сохраняет профиль в одну из PROFILER_KEEP ячеек кэша по кругу.
+
+    Номер ячейки берется атомарным cache.incr, поэтому процессы
+    с общим кэшем не перезаписывают профили друг друга, а в кэше
+    остаются последние PROFILER_KEEP профилей.
+    """
+    cache = get_cache()
+    counter_key = f'{PROFILE_PREFIX}:counter'
+    cache.add(counter_key, 0, None)
+    try:
+        number = cache.incr(counter_key)
+    except ValueError:
+        cache.add(counter_key, 1, None)
+        number = 1
+    cache.set(
+        f'{PROFILE_PREFIX}:{number % settings.PROFILER_KEEP}', profile, None
+    )
+
+
+def get_profiles():
+    """Возвращает сохраненные профили, начиная с последнего."""
+    cache = get_cache()
+    profiles = cache.get_many([
+        f'{PROFILE_PREFIX}:{slot}' for slot in range(settings.PROFILER_KEEP)
+    ]).values()
+    return sorted(profiles, key=lambda profile: profile['started'],
+                  reverse=True)
+
+
+def get_profile(profile_id):
+    for profile in get_profiles():
+        if profile['id'] == profile_id:
+            return profile
+    return None
+
+
+def format_stack(frame):
+    """Возвращает стек кадра в свернутом виде: внешний;...;внутренний."""
+    names = []
+    while frame is not None and len(names) < MAX_STACK_DEPTH:
+        code = frame.f_code
+        names.append(
+            f'{code.co_filename.rsplit("/", 1)[-1]}:{code.co_name}'
+        )
+        frame = frame.f_back
+    return ';'.join(reversed(names))
+
+
+class StackSampler:
+    """
+    Сэмплирующий профилировщик запросов в работе.
+
+    Фоновый поток раз в PROFILER_SAMPLE_INTERVAL секунд снимает стеки
+    потоков, которые обрабатывают запросы, и считает повторы каждого
+    стека. Нагрузка почти не зависит от числа вызовов функций, поэтому
+    сэмплер работает для всех запросов, а стеки сохраняются только для
+    медленных.
+    """
+
+    def __init__(self):
+        self.active = {}
+        self.lock = threading.Lock()
+        self.thread = None
+
+    def start(self):
+        with self.lock:
+            if self.thread is None or not self.thread.is_alive():
+                self.thread = threading.Thread(
+                    target=self.run, name='api-stack-sampler', daemon=True
+                )
+                self.thread.start()
+
+    def run(self):
+        while True:
+            time.sleep(settings.PROFILER_SAMPLE_INTERVAL)
+            # Счетчики меняются под блокировкой: после __exit__ поток
+            # запроса читает свои стеки, и сэмплер их уже не трогает.
+            with self.lock:
+                if not self.active:
+                    continue
+                frames = sys._current_frames()
+                for thread_id, stacks in self.active.items():
+                    frame = frames.get(thread_id)
+                    if frame is not None:
+                        stacks[format_stack(frame)] += 1
+
+    def __enter__(self):
+        self.start()
+        stacks = Counter()
+        with self.lock:
+            self.active[threading.get_ident()] = stacks
+        return stacks
+
+    def __exit__(self, *exc_info):
+        with self.lock:
+            self.active.pop(threading.get_ident(), None)
+
+
+sampler = StackSampler()
+
+
+def is_admin_request(request):
+    """Проверяет токен администратора в запросе без запуска представления."""
+    for authentication_class in api_settings.DEFAULT_AUTHENTICATION_CLASSES:
+        try:
+            result = authentication_class().authenticate(request)
+        except APIException:
+            return False
+        if result is not None:
+            return getattr(result[0], 'is_admin', False)
+    return False
+
+
+class ProfilingMiddleware:
+    """
+    Профилирование медленных и выбранных запросов.
+
+    Включается настройкой PROFILER_ENABLED. cProfile запускается для
+    доли запросов PROFILER_SAMPLE_RATE и для запросов администратора
+    с заголовком PROFILER_HEADER. При PROFILER_SLOW_THRESHOLD остальные
+    запросы сэмплируются StackSampler, и стеки сохраняются, если запрос
+    выполнялся дольше порога. Профиль сохраняется вместе с журналом
+    SQL-запросов, последние PROFILER_KEEP профилей отдает
+    /api/v1/profiles/.
+    """
+
+    def __init__(self, get_response):
+        self.get_response = get_response
+
+    def get_trigger(self, request):
+        if (
+            request.META.get(settings.PROFILER_HEADER)
+            and is_admin_request(request)
+        ):
+            return 'header'
+        if random.random() < settings.PROFILER_SAMPLE_RATE:
+            return 'sample'
+        if settings.PROFILER_SLOW_THRESHOLD:
+            return 'slow'
+        return None
+
+    def __call__(self, request):
+        if not settings.PROFILER_ENABLED:
+            return self.get_response(request)
+        trigger = self.get_trigger(request)
+        if trigger is None:
+            return self.get_response(request)
+
+        started = time.time()
+        with QueryRecorder(origins=False) as recorder:
+            response, result = self.profile(request, trigger)
+        duration = time.time() - started
+        if trigger == 'slow' and duration < settings.PROFILER_SLOW_THRESHOLD:
+            return response
+
+        profile = {
+            'id': uuid.uuid4().hex,
+            'trigger': trigger,
+            'method': request.method,
+            'path': request.get_full_path(),
+            'view': getattr(request, 'profile_view', None),
+            'status': response.status_code,
+            'started': started,
+            'duration': duration,
+            'queries': [
+                {'sql': query['sql'], 'time': query['time']}
+                for query in recorder.queries[:settings.PROFILER_MAX_QUERIES]
+            ],
+            'query_count': len(recorder.queries),
+        }
+        if isinstance(result, Counter):
+            profile['stacks'] = [
+                {'stack': stack, 'samples': count}
+                for stack, count in result.most_common(settings.PROFILER_TOP)
+            ]
+        else:
+            profile['stats'] = self.format_stats(result)
+        save_profile(profile)
+        response['X-Profile-Id'] = profile['id']
+        return response
+
+    def profile(self, request, trigger):
+        """Выполняет запрос, возвращает ответ и стеки или cProfile."""
+        if trigger == 'slow':
+            with sampler as stacks:
+                return self.get_response(request), stacks
+        profiler = cProfile.Profile()
+        profiler.enable()
+        try:
+            response = self.get_response(request)
+        finally:
+            profiler.disable()
+        return response, profiler
+
+    def format_stats(self, profiler):
+        output = io.StringIO()
+        pstats.Stats(profiler, stream=output).sort_stats(
+            'cumulative'
+        ).print_stats(settings.PROFILER_TOP)
+        return output.getvalue()
+
+    def process_view(self, request, view_func, view_args, view_kwargs):
+        view_class, action = get_view_action(view_func, request.method)
+        if view_class is not None:
+            request.profile_view = f'{view_class.__name__}.{action}'
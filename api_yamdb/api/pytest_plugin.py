@@ -0,0 +1,42 @@
+import pytest
+
+from api.query_budget import format_report, query_budget_exceeded
+
+
+def pytest_configure(config):
+    config.addinivalue_line(
+        'markers',
+        'no_query_budget: не проверять бюджет SQL-запросов в тесте',
+    )
+
+
+@pytest.fixture(autouse=True)
+def query_budget(request, settings):
+    """
+    Проваливает тест, если запрос к API превысил бюджет SQL-запросов.
+
+    Включает QueryBudgetMiddleware и собирает его отчеты: о превышении
+    query_budget представления и о повторяющихся запросах (N+1).
+    Отключается маркером no_query_budget.
+    """
+    if request.node.get_closest_marker('no_query_budget'):
+        settings.QUERY_BUDGET_ENABLED = False
+        yield []
+        return
+    settings.QUERY_BUDGET_ENABLED = True
+    reports = []
+
+    def collect(sender, report, **kwargs):
+        reports.append(report)
+
+    query_budget_exceeded.connect(collect, weak=False)
+    try:
+        yield reports
+    finally:
+        query_budget_exceeded.disconnect(collect)
+    if reports:
+        pytest.fail(
+            'Превышен бюджет SQL-запросов:\n'
+            + '\n'.join(format_report(report) for report in reports),
+            pytrace=False,
+        )
@@ -0,0 +1,191 @@
+import logging
+import os
+import re
+import sys
+import time
+from collections import Counter
+from contextlib import ExitStack
+
+from django.conf import settings
+from django.db import connections
+from django.dispatch import Signal
+
+
+logger = logging.getLogger(__name__)
+
+# Отправляется, когда запрос превысил бюджет или повторяет запросы.
+query_budget_exceeded = Signal()
+
+PLACEHOLDER_LIST = re.compile(r'\((?:%s, )+%s\)')
+
+
+def normalize_sql(sql):
+    """
+    Приводит SQL к структуре запроса.
+
+    Параметры уже вынесены драйвером в %s, остается свернуть списки
+    IN (%s, %s, ...) разной длины, чтобы запросы за разными наборами
+    объектов считались одинаковыми.
+    """
+    return PLACEHOLDER_LIST.sub('(%s)', sql)
+
+
+def get_origin():
+    """Возвращает место в коде проекта, откуда выполнен запрос."""
+    project_dir = str(settings.BASE_DIR) + os.sep
+    frame = sys._getframe(1)
+    while frame is not None:
+        filename = frame.f_code.co_filename
+        if (
+            filename.startswith(project_dir)
+            and filename != __file__
+            and 'site-packages' not in filename
+        ):
+            path = os.path.relpath(filename, project_dir)
+            return f'{path}:{frame.f_lineno} in {frame.f_code.co_name}'
+        frame = frame.f_back
+    return None
+
+
+class QueryRecorder:
+    """
+    Записывает SQL-запросы текущего потока ко всем базам данных.
+
+    Для каждого запроса сохраняются SQL, время выполнения и, если
+    origins, место вызова в коде проекта.
+    """
+
+    def __init__(self, origins=True):
+        self.queries = []
+        self.origins = origins
+        self.stack = ExitStack()
+
+    def __call__(self, execute, sql, params, many, context):
+        started = time.perf_counter()
+        try:
+            return execute(sql, params, many, context)
+        finally:
+            self.queries.append({
+                'sql': sql,
+                'time': time.perf_counter() - started,
+                'origin': get_origin() if self.origins else None,
+            })
+
+    def __enter__(self):
+        for connection in connections.all():
+            self.stack.enter_context(connection.execute_wrapper(self))
+        return self
+
+    def __exit__(self, *exc_info):
+        self.stack.close()
+
+    def find_repeated(self, threshold):
+        """
+        Ищет структурно одинаковые запросы, повторенные threshold раз.
+
+        Такие повторы обычно означают N+1: запрос выполняется в цикле
+        для каждого объекта. Возвращает список словарей с SQL,
+        количеством повторов и самым частым местом вызова.
+        """
+        groups = {}
+        for query in self.queries:
+            groups.setdefault(normalize_sql(query['sql']), []).append(query)
+        return [
+            {
+                'sql': sql,
+                'count': len(queries),
+                'origin': Counter(
+                    query['origin'] for query in queries
+                ).most_common(1)[0][0],
+            }
+            for sql, queries in groups.items()
+            if len(queries) >= threshold
+        ]
+
+
+def get_view_action(view_func, method):
+    """
+    Возвращает класс представления DRF и действие для метода запроса.
+
+    Для представлений не из DRF возвращает (None, None).
+    """
+    view_class = getattr(view_func, 'cls', None)
+    if view_class is None:
+        return None, None
+    actions = getattr(view_func, 'actions', None) or {}
+    return view_class, actions.get(method.lower(), method.lower())
+
+
+def get_view_budget(view_func, method):
+    """
+    Возвращает имя представления DRF и его бюджет запросов.
+
+    Бюджет задается атрибутом query_budget класса представления:
+    числом для всех действий или словарем действие -> число.
+    """
+    view_class, action = get_view_action(view_func, method)
+    if view_class is None:
+        return None, None
+    budget = getattr(view_class, 'query_budget', None)
+    if isinstance(budget, dict):
+        budget = budget.get(action)
+    return f'{view_class.__name__}.{action}', budget
+
+
+def format_report(report):
+    """Форматирует отчет о запросах для лога и сообщения теста."""
+    lines = [
+        f'{report["method"]} {report["path"]} ({report["view"]}): '
+        f'{report["count"]} SQL-запросов, бюджет {report["budget"]}'
+    ]
+    for repeated in report['repeated']:
+        lines.append(
+            f'  повтор x{repeated["count"]} из {repeated["origin"]}: '
+            f'{repeated["sql"]}'
+        )
+    return '\n'.join(lines)
+
+
+class QueryBudgetMiddleware:
+    """
+    Контроль числа SQL-запросов на HTTP-запрос.
+
+    Включается настройкой QUERY_BUDGET_ENABLED. Число запросов
+    возвращается в заголовке X-Query-Count. Если представление
+    превысило свой query_budget или повторило один запрос
+    QUERY_BUDGET_REPEAT_THRESHOLD раз, отчет пишется в лог и
+    отправляется сигналом query_budget_exceeded.
+    """
+
+    def __init__(self, get_response):
+        self.get_response = get_response
+
+    def __call__(self, request):
+        if not settings.QUERY_BUDGET_ENABLED:
+            return self.get_response(request)
+        with QueryRecorder() as recorder:
+            response = self.get_response(request)
+        response['X-Query-Count'] = len(recorder.queries)
+
+        view, budget = getattr(request, 'query_budget', (None, None))
+        report = {
+            'method': request.method,
+            'path': request.get_full_path(),
+            'view': view,
+            'budget': budget,
+            'count': len(recorder.queries),
+            'repeated': recorder.find_repeated(
+                settings.QUERY_BUDGET_REPEAT_THRESHOLD
+            ),
+        }
+        if report['repeated'] or (
+            budget is not None and report['count'] > budget
+        ):
+            logger.warning(format_report(report))
+            query_budget_exceeded.send(
+                sender=type(self), request=request, report=report
+            )
+        return response
+
+    def process_view(self, request, view_func, view_args, view_kwargs):
+        request.query_budget = get_view_budget(view_func, request.method)
@@ -1,18 +1,24 @@
 from django.contrib.auth import get_user_model
 from django.contrib.auth.tokens import default_token_generator
+from django.db import IntegrityError, connection, transaction
+from django.db.models import Q
 from django.shortcuts import get_object_or_404
+from django.utils import timezone
 from rest_framework import serializers
+from rest_framework.settings import api_settings
 
-from api.mixins import UsernameValidationMixin
+from api.mixins import SparseFieldsSerializerMixin, UsernameValidationMixin
 from constants import (MAX_EMAIL_LENGTH, MAX_FIRST_NAME_LENGTH,
                        MAX_LAST_NAME_LENGTH, MAX_USERNAME_LENGTH)
 from reviews.models import Category, Comment, Genre, Review, Title
+from reviews.signals import titles_bulk_saved
 
 
 User = get_user_model()
 
 
-class CommentSerializer(serializers.ModelSerializer):
+class CommentSerializer(SparseFieldsSerializerMixin,
+                        serializers.ModelSerializer):
     """Сериализатор для работы с комментариями к отзывам."""
 
     author = serializers.SlugRelatedField(
@@ -24,7 +30,8 @@ class CommentSerializer(serializers.ModelSerializer):
         fields = ('id', 'text', 'author', 'pub_date',)
 
 
-class ReviewSerializer(serializers.ModelSerializer):
+class ReviewSerializer(SparseFieldsSerializerMixin,
+                       serializers.ModelSerializer):
     """Сериализатор для работы с отзывами к произведениям."""
 
     author = serializers.SlugRelatedField(
@@ -35,18 +42,28 @@ class ReviewSerializer(serializers.ModelSerializer):
         model = Review
         fields = ('id', 'text', 'author', 'score', 'pub_date',)
 
-    def validate(self, data):
-        """Проверяет, чтобы был единственный отзыв."""
-        if self.context['request'].method != 'POST':
-            return data
-
-        title = self.context['view'].get_title()
-        user = self.context['request'].user
-        if Review.objects.filter(title=title, author=user).exists():
-            raise serializers.ValidationError(
-                'Вы уже оставляли отзыв на это произведение.'
-            )
-        return data
+    def create(self, validated_data):
+        """
+        Создает отзыв, единственность проверяется ограничением unique_review.
+
+        Отдельная проверка перед вставкой не выполняется: она стоила бы
+        лишнего запроса и не защищала бы от одновременных запросов.
+        Другие ошибки целостности, например удаление произведения
+        во время запроса, не подменяются ошибкой повторного отзыва.
+        """
+        try:
+            return super().create(validated_data)
+        except IntegrityError:
+            if not Review.objects.filter(
+                title=validated_data['title'],
+                author_id=validated_data['author_id'],
+            ).exists():
+                raise
+            raise serializers.ValidationError({
+                api_settings.NON_FIELD_ERRORS_KEY: [
+                    'Вы уже оставляли отзыв на это произведение.'
+                ]
+            })
 
 
 class CategorySerializer(serializers.ModelSerializer):
@@ -65,7 +82,8 @@ class GenreSerializer(serializers.ModelSerializer):
         fields = ('name', 'slug')
 
 
-class TitleReadSerializer(serializers.ModelSerializer):
+class TitleReadSerializer(SparseFieldsSerializerMixin,
+                          serializers.ModelSerializer):
     """Сериализатор для чтения данных о произведении."""
 
     genre = GenreSerializer(many=True, read_only=True)
@@ -79,6 +97,80 @@ class TitleReadSerializer(serializers.ModelSerializer):
         read_only_fields = fields
 
 
+class TitleLeanReadListSerializer(serializers.ListSerializer):
+    """Загружает жанры всех произведений страницы одним запросом."""
+
+    def to_representation(self, data):
+        rows = list(data)
+        genres = self.child.get_genres([row['id'] for row in rows])
+        return [self.child.build(row, genres) for row in rows]
+
+
+class TitleLeanReadSerializer(serializers.BaseSerializer):
+    """
+    Быстрый сериализатор для чтения произведений из строк values().
+
+    Возвращает тот же JSON, что и TitleReadSerializer, но строит словари
+    напрямую, без объектов моделей и вложенных сериализаторов.
+    Аргумент fields, как у TitleReadSerializer, ограничивает поля ответа.
+    """
+
+    field_names = TitleReadSerializer.Meta.fields
+
+    class Meta:
+        list_serializer_class = TitleLeanReadListSerializer
+
+    def __init__(self, *args, fields=None, **kwargs):
+        super().__init__(*args, **kwargs)
+        if fields is not None:
+            self.field_names = tuple(
+                name for name in self.field_names if name in fields
+            )
+
+    def get_genres(self, title_ids):
+        """Возвращает словарь id произведения -> список жанров."""
+        genres = {title_id: [] for title_id in title_ids}
+        if not genres or 'genre' not in self.field_names:
+            return genres
+        rows = Title.genre.through.objects.filter(
+            title_id__in=title_ids
+        ).order_by('genre__name').values_list(
+            'title_id', 'genre__name', 'genre__slug'
+        )
+        for title_id, name, slug in rows:
+            genres[title_id].append({'name': name, 'slug': slug})
+        return genres
+
+    @staticmethod
+    def get_rating(row, genres):
+        if not row['review_count']:
+            return None
+        return int(row['rating_sum'] / row['review_count'])
+
+    @staticmethod
+    def get_genre(row, genres):
+        return genres[row['id']]
+
+    @staticmethod
+    def get_category(row, genres):
+        if row['category__slug'] is None:
+            return None
+        return {'name': row['category__name'], 'slug': row['category__slug']}
+
+    def build(self, row, genres):
+        """Формирует представление произведения из строки values()."""
+        return {
+            name: (
+                getattr(self, f'get_{name}')(row, genres)
+                if name in ('rating', 'genre', 'category') else row[name]
+            )
+            for name in self.field_names
+        }
+
+    def to_representation(self, instance):
+        return self.build(instance, self.get_genres([instance['id']]))
+
+
 class TitleWriteSerializer(serializers.ModelSerializer):
     """Сериализатор для создания и обновления произведений."""
 
@@ -99,11 +191,296 @@ class TitleWriteSerializer(serializers.ModelSerializer):
         model = Title
         fields = '__all__'
 
+    def create(self, validated_data):
+        """Создает произведение с жанрами в одной транзакции."""
+        with transaction.atomic():
+            return super().create(validated_data)
+
+    def update(self, instance, validated_data):
+        """Обновляет произведение с жанрами в одной транзакции."""
+        with transaction.atomic():
+            return super().update(instance, validated_data)
+
     def to_representation(self, instance):
         """Переключение на сериализатор для чтения для ответа."""
         return TitleReadSerializer(instance).data
 
 
+class TitleBulkItemSerializer(serializers.ModelSerializer):
+    """
+    Проверяет одно произведение из пакетной записи.
+
+    Жанры и категории ищутся в словарях slug -> id из контекста,
+    загруженных заранее для всего пакета.
+    """
+
+    id = serializers.IntegerField(required=False)
+    genre = serializers.ListField(
+        child=serializers.CharField(), allow_empty=False
+    )
+    category = serializers.CharField()
+
+    class Meta:
+        model = Title
+        fields = ('id', 'name', 'year', 'description', 'genre', 'category')
+
+    @staticmethod
+    def get_does_not_exist_error(value):
+        return serializers.ValidationError(
+            serializers.SlugRelatedField.default_error_messages[
+                'does_not_exist'
+            ].format(slug_name='slug', value=value)
+        )
+
+    def validate_genre(self, value):
+        genres = self.context['genres']
+        for slug in value:
+            if slug not in genres:
+                raise self.get_does_not_exist_error(slug)
+        return list(dict.fromkeys(genres[slug] for slug in value))
+
+    def validate_category(self, value):
+        categories = self.context['categories']
+        if value not in categories:
+            raise self.get_does_not_exist_error(value)
+        return categories[value]
+
+
+class TitleBulkWriteSerializer(serializers.BaseSerializer):
+    """
+    Пакетное создание и изменение произведений.
+
+    Элементы с id изменяют существующие произведения (как PATCH),
+    элементы без id создают новые. Slug жанров и категорий всего пакета
+    загружаются одним запросом на модель, произведения и связи с жанрами
+    записываются в одной транзакции (см. write()). Ошибка в элементе
+    не мешает записи остальных: для каждого элемента в порядке запроса
+    возвращается статус или ошибки.
+    """
+
+    max_length = 500
+    id_field = serializers.IntegerField(min_value=1, max_value=2 ** 63 - 1)
+
+    def to_internal_value(self, data):
+        if not isinstance(data, list) or not data:
+            raise serializers.ValidationError({
+                api_settings.NON_FIELD_ERRORS_KEY: [
+                    'Ожидается непустой список произведений.'
+                ]
+            })
+        if len(data) > self.max_length:
+            raise serializers.ValidationError({
+                api_settings.NON_FIELD_ERRORS_KEY: [
+                    f'В пакете не может быть больше {self.max_length} '
+                    'произведений.'
+                ]
+            })
+        return {'titles': data}
+
+    @staticmethod
+    def get_item_context(items):
+        """Загружает id жанров и категорий для всех slug пакета."""
+        genre_slugs = set()
+        category_slugs = set()
+        for item in items:
+            if isinstance(item.get('genre'), list):
+                genre_slugs.update(
+                    slug for slug in item['genre'] if isinstance(slug, str)
+                )
+            if isinstance(item.get('category'), str):
+                category_slugs.add(item['category'])
+        return {
+            'genres': dict(Genre.objects.filter(
+                slug__in=genre_slugs
+            ).values_list('slug', 'pk')),
+            'categories': dict(Category.objects.filter(
+                slug__in=category_slugs
+            ).values_list('slug', 'pk')),
+        }
+
+    def get_item_id(self, item):
+        """
+        Возвращает id элемента пакета, None или словарь ошибок.
+
+        id приводится к числу так же, как в TitleBulkItemSerializer,
+        до поиска среди существующих произведений.
+        """
+        if not isinstance(item, dict) or 'id' not in item:
+            return None
+        try:
+            return self.id_field.run_validation(item['id'])
+        except serializers.ValidationError as error:
+            return {'id': error.detail}
+
+    def prepare_item(self, item, item_id, context, existing, seen):
+        """
+        Проверяет элемент пакета.
+
+        Возвращает (произведение, поля, id жанров или None) или словарь
+        ошибок.
+        """
+        if not isinstance(item, dict):
+            return {api_settings.NON_FIELD_ERRORS_KEY: [
+                'Ожидается объект произведения.'
+            ]}
+        if isinstance(item_id, dict):
+            return item_id
+        instance = None
+        if item_id is not None:
+            instance = existing.get(item_id)
+            if instance is None:
+                return {'id': [f'Произведение с id={item_id} не найдено.']}
+            if instance.pk in seen:
+                return {'id': ['Произведение уже изменяется в этом пакете.']}
+            seen.add(instance.pk)
+        serializer = TitleBulkItemSerializer(
+            instance, data=item, partial=instance is not None,
+            context=context,
+        )
+        if not serializer.is_valid():
+            return serializer.errors
+
+        data = dict(serializer.validated_data)
+        data.pop('id', None)
+        genre_ids = data.pop('genre', None)
+        if 'category' in data:
+            data['category_id'] = data.pop('category')
+        return instance or Title(), data, genre_ids
+
+    def create(self, validated_data):
+        items = validated_data['titles']
+        objects = [item for item in items if isinstance(item, dict)]
+        context = self.get_item_context(objects)
+        item_ids = [self.get_item_id(item) for item in items]
+        existing = Title.objects.in_bulk({
+            item_id for item_id in item_ids if isinstance(item_id, int)
+        })
+
+        results = []
+        pending = []
+        seen = set()
+        for item, item_id in zip(items, item_ids):
+            result = self.prepare_item(
+                item, item_id, context, existing, seen
+            )
+            if isinstance(result, dict):
+                results.append({'status': 'error', 'errors': result})
+                continue
+            title, data, genre_ids = result
+            for attr, value in data.items():
+                setattr(title, attr, value)
+            results.append({
+                'status': 'created' if title.pk is None else 'updated',
+                'title': title,
+            })
+            pending.append((results[-1], title, set(data), genre_ids))
+
+        self.write(pending)
+        for result in results:
+            if 'title' in result:
+                result['id'] = result.pop('title').pk
+        return results
+
+    def write(self, pending):
+        """
+        Записывает произведения и их жанры в одной транзакции.
+
+        Если база возвращает id из bulk_create, пакет записывается
+        постоянным числом запросов. Иначе, или если пакетная запись
+        нарушила ограничение базы, произведения записываются по одному,
+        каждое в своей точке сохранения: ошибка попадает в результат
+        своего элемента и не отменяет остальные.
+        """
+        with transaction.atomic():
+            if connection.features.can_return_rows_from_bulk_insert:
+                created = [
+                    title for _, title, _, _ in pending if title._state.adding
+                ]
+                try:
+                    with transaction.atomic():
+                        self.write_bulk(pending)
+                except IntegrityError:
+                    # bulk_create уже выдал id строкам отмененной вставки.
+                    for title in created:
+                        title.pk = None
+                        title._state.adding = True
+                else:
+                    titles_bulk_saved.send(sender=Title, title_ids=[
+                        title.pk for _, title, _, _ in pending
+                    ])
+                    return
+            for entry in pending:
+                self.write_row(*entry)
+
+    def write_bulk(self, pending):
+        """Записывает пакет через bulk_create и bulk_update."""
+        through = Title.genre.through
+        created = [
+            title for _, title, _, _ in pending if title._state.adding
+        ]
+        updated = [
+            title for _, title, _, _ in pending if not title._state.adding
+        ]
+        update_fields = {'modified'}.union(*(
+            fields for _, title, fields, _ in pending
+            if not title._state.adding
+        ))
+        replaced = [
+            title.pk for _, title, _, genre_ids in pending
+            if genre_ids is not None and not title._state.adding
+        ]
+        Title.objects.bulk_create(created)
+        if updated:
+            now = timezone.now()
+            for title in updated:
+                title.modified = now
+            Title.objects.bulk_update(updated, update_fields)
+        if replaced:
+            through.objects.filter(title_id__in=replaced).delete()
+        through.objects.bulk_create([
+            through(title_id=title.pk, genre_id=genre_id)
+            for _, title, _, genre_ids in pending
+            if genre_ids is not None
+            for genre_id in genre_ids
+        ])
+
+    def write_row(self, result, title, fields, genre_ids):
+        """Записывает одно произведение и его жанры в точке сохранения."""
+        through = Title.genre.through
+        adding = title._state.adding
+        try:
+            with transaction.atomic():
+                if adding:
+                    title.save()
+                else:
+                    title.save(update_fields={'modified', *fields})
+                if genre_ids is not None:
+                    if not adding:
+                        through.objects.filter(title_id=title.pk).delete()
+                    through.objects.bulk_create([
+                        through(title_id=title.pk, genre_id=genre_id)
+                        for genre_id in genre_ids
+                    ])
+        except IntegrityError:
+            if adding:
+                title.pk = None
+                title._state.adding = True
+            result.clear()
+            result.update({'status': 'error', 'errors': {
+                api_settings.NON_FIELD_ERRORS_KEY: [
+                    'Произведение не сохранено: нарушено ограничение '
+                    'базы данных.'
+                ]
+            }})
+
+    def to_representation(self, instance):
+        counts = {
+            status: sum(1 for item in instance if item['status'] == status)
+            for status in ('created', 'updated', 'error')
+        }
+        return {**counts, 'results': instance}
+
+
 class UserSerializer(UsernameValidationMixin, serializers.ModelSerializer):
     """Сериализатор для работы с данными пользователей."""
 
@@ -179,36 +556,50 @@ class SignUpSerializer(UsernameValidationMixin, serializers.Serializer):
     )
 
     def validate(self, data):
-        """Проверка доступности имени пользователя и электронной почты."""
+        """
+        Проверка доступности имени пользователя и электронной почты.
+
+        Все конфликты определяются одним запросом пользователей с тем же
+        именем или email. Если пользователь с такими именем и email уже
+        есть, он сохраняется в data['user'] для повторной отправки кода.
+        """
         username = data.get('username')
         email = data.get('email')
 
-        user_exists = User.objects.filter(
-            username=username,
-            email=email
-        ).exists()
-
-        if user_exists:
-            return data
-
-        username_exists = User.objects.filter(username=username).exists()
-        email_exists = User.objects.filter(email=email).exists()
-
-        if username_exists or email_exists:
-            errors = {}
-            if username_exists:
+        errors = {}
+        for user in User.objects.filter(
+            Q(username=username) | Q(email=email)
+        )[:2]:
+            if user.username == username and user.email == email:
+                data['user'] = user
+                return data
+            if user.username == username:
                 errors['username'] = 'Пользователь с таким именем существует'
-            if email_exists:
+            if user.email == email:
                 errors['email'] = 'Пользователь с таким email существует'
+
+        if errors:
             raise serializers.ValidationError(errors)
 
         return data
 
     def create(self, validated_data):
-        """Создает пользователя или возвращает существующего."""
-        user, _ = User.objects.get_or_create(
-            username=validated_data['username'],
-            email=validated_data['email'],
-        )
-
-        return user
+        """
+        Создает пользователя или возвращает существующего.
+
+        Одновременную регистрацию с теми же данными отсекают ограничения
+        уникальности username и email, тогда проверка повторяется.
+        """
+        if 'user' in validated_data:
+            return validated_data['user']
+        try:
+            with transaction.atomic():
+                return User.objects.create(
+                    username=validated_data['username'],
+                    email=validated_data['email'],
+                )
+        except IntegrityError:
+            data = self.validate(dict(validated_data))
+            if 'user' not in data:
+                raise
+            return data['user']
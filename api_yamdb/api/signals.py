@@ -0,0 +1,84 @@
+from django.contrib.auth import get_user_model
+from django.db.models.signals import m2m_changed, post_delete, post_save
+from django.dispatch import receiver
+
+from api.authentication import forget_user_state
+from api.cache import invalidate_on_commit
+from reviews.models import Category, Comment, Genre, Review, Title
+from reviews.signals import titles_bulk_saved
+
+
+User = get_user_model()
+
+
+@receiver(post_save, sender=Title)
+@receiver(post_delete, sender=Title)
+def invalidate_title(sender, instance, **kwargs):
+    """Сбрасывает кэш списков и страницы произведения."""
+    invalidate_on_commit(
+        'titles', f'title:{instance.pk}', f'reviews:{instance.pk}'
+    )
+
+
+@receiver(titles_bulk_saved, sender=Title)
+def invalidate_bulk_saved_titles(sender, title_ids, **kwargs):
+    """Сбрасывает кэш после пакетной записи произведений."""
+    invalidate_on_commit('titles', *(f'title:{pk}' for pk in title_ids))
+
+
+@receiver(m2m_changed, sender=Title.genre.through)
+def invalidate_title_genres(sender, instance, action, reverse, **kwargs):
+    """Сбрасывает кэш произведений при изменении их жанров."""
+    if not action.startswith('post_'):
+        return
+    if reverse:
+        invalidate_on_commit('genres')
+    else:
+        invalidate_on_commit('titles', f'title:{instance.pk}')
+
+
+@receiver(post_save, sender=Category)
+@receiver(post_delete, sender=Category)
+def invalidate_categories(sender, instance, **kwargs):
+    """Сбрасывает кэш категорий и произведений с ними."""
+    invalidate_on_commit('categories')
+
+
+@receiver(post_save, sender=Genre)
+@receiver(post_delete, sender=Genre)
+def invalidate_genres(sender, instance, **kwargs):
+    """Сбрасывает кэш жанров и произведений с ними."""
+    invalidate_on_commit('genres')
+
+
+@receiver(post_save, sender=Review)
+@receiver(post_delete, sender=Review)
+def invalidate_review(sender, instance, **kwargs):
+    """Сбрасывает кэш отзывов и рейтинга произведения."""
+    invalidate_on_commit(
+        f'reviews:{instance.title_id}',
+        f'comments:{instance.pk}',
+        'titles',
+        f'title:{instance.title_id}',
+    )
+
+
+@receiver(post_save, sender=Comment)
+@receiver(post_delete, sender=Comment)
+def invalidate_comment(sender, instance, **kwargs):
+    """Сбрасывает кэш комментариев к отзыву."""
+    invalidate_on_commit(f'comments:{instance.review_id}')
+
+
+@receiver(post_save, sender=User)
+@receiver(post_delete, sender=User)
+def invalidate_users(sender, instance, **kwargs):
+    """Сбрасывает кэш ответов с именами авторов."""
+    invalidate_on_commit('users')
+
+
+@receiver(post_save, sender=User)
+@receiver(post_delete, sender=User)
+def forget_token_user_state(sender, instance, **kwargs):
+    """Сбрасывает сохраненную роль для проверки JWT-токенов."""
+    forget_user_state(instance.pk)
@@ -0,0 +1,158 @@
+import hashlib
+import math
+import time
+
+from django.conf import settings
+from django.core.cache import cache
+from rest_framework.permissions import SAFE_METHODS
+from rest_framework.throttling import BaseThrottle
+
+
+THROTTLE_PREFIX = 'throttle'
+PERIODS = {'s': 1, 'm': 60, 'h': 3600, 'd': 86400}
+
+
+def parse_rate(rate):
+    """Разбирает скорость '5/min' в пару (запросов, секунд)."""
+    count, period = rate.split('/')
+    return int(count), PERIODS[period[0]]
+
+
+class TokenBucketThrottle(BaseThrottle):
+    """
+    Ограничение частоты запросов по алгоритму маркерной корзины.
+
+    Скорость задается в API_THROTTLE_RATES для scope в формате DRF:
+    '5/min' - корзина на 5 запросов, которая пополняется со скоростью
+    5 запросов в минуту. Корзина хранится в кэше одним числом -
+    теоретическим временем прибытия следующего запроса (GCRA) - и
+    меняется атомарным cache.incr, поэтому параллельные запросы
+    не обходят ограничение. Запрос проверяется по всем корзинам из
+    get_idents(): например, по IP-адресу и по имени пользователя.
+    """
+
+    scope = None
+
+    def get_rate(self):
+        """Возвращает (емкость, интервал пополнения в мс) или None."""
+        rate = settings.API_THROTTLE_RATES.get(self.scope)
+        if not rate:
+            return None
+        capacity, duration = parse_rate(rate)
+        return capacity, max(1, duration * 1000 // capacity)
+
+    def get_idents(self, request, view):
+        """Возвращает пары (тип, значение), по которым считаются корзины."""
+        return [('ip', self.get_ident(request))]
+
+    def get_cache_key(self, kind, value):
+        digest = hashlib.md5(str(value).encode()).hexdigest()
+        return f'{THROTTLE_PREFIX}:{self.scope}:{kind}:{digest}'
+
+    def take(self, key, capacity, interval, now):
+        """
+        Забирает маркер из корзины.
+
+        Возвращает None, если маркер есть, иначе время ожидания в мс.
+        """
+        if cache.add(key, now + interval, math.ceil(interval / 1000)):
+            return None
+        try:
+            arrival = cache.incr(key, interval)
+        except ValueError:
+            # Корзина истекла между add и incr - она снова полна.
+            cache.add(key, now + interval, math.ceil(interval / 1000))
+            return None
+        # Ключ живет до целой секунды дольше корзины, и сохраненное время
+        # может быть в прошлом: отсчет идет от max(сохраненное, now).
+        # Если параллельный запрос уже сдвинул время, сдвиг повторится,
+        # и ограничение станет строже, но не мягче.
+        stale = now - (arrival - interval)
+        if stale > 0:
+            arrival = cache.incr(key, stale)
+        if arrival - now > capacity * interval:
+            cache.decr(key, interval)
+            return arrival - now - capacity * interval
+        cache.touch(key, math.ceil((arrival - now) / 1000))
+        return None
+
+    def allow_request(self, request, view):
+        self.wait_ms = None
+        rate = self.get_rate()
+        if rate is None:
+            return True
+        capacity, interval = rate
+        now = int(time.time() * 1000)
+        taken = []
+        for kind, value in self.get_idents(request, view):
+            if not value:
+                continue
+            key = self.get_cache_key(kind, value)
+            wait = self.take(key, capacity, interval, now)
+            if wait is not None:
+                # Возвращает маркеры, уже взятые из других корзин.
+                for taken_key in taken:
+                    try:
+                        cache.decr(taken_key, interval)
+                    except ValueError:
+                        pass
+                self.wait_ms = wait
+                return False
+            taken.append(key)
+        return True
+
+    def wait(self):
+        if self.wait_ms is None:
+            return None
+        return self.wait_ms / 1000
+
+
+class AuthThrottle(TokenBucketThrottle):
+    """
+    Ограничение регистрации и получения токена.
+
+    Корзины считаются по IP-адресу и по полям тела запроса из
+    ident_fields, поэтому смена IP не помогает перебирать коды
+    подтверждения одного пользователя.
+    """
+
+    ident_fields = ('username',)
+
+    def get_idents(self, request, view):
+        idents = super().get_idents(request, view)
+        data = request.data if hasattr(request.data, 'get') else {}
+        for field in self.ident_fields:
+            value = data.get(field)
+            if isinstance(value, str):
+                idents.append((field, value.strip().lower()))
+        return idents
+
+
+class SignUpThrottle(AuthThrottle):
+    """Ограничение регистрации по IP-адресу, имени и email."""
+
+    scope = 'signup'
+    ident_fields = ('username', 'email')
+
+
+class TokenThrottle(AuthThrottle):
+    """Ограничение получения токена по IP-адресу и имени."""
+
+    scope = 'token'
+
+
+class WriteThrottle(TokenBucketThrottle):
+    """Ограничение запросов на изменение данных для пользователя."""
+
+    scope = 'write'
+
+    def get_idents(self, request, view):
+        if request.user.is_authenticated:
+            return [('user', request.user.pk)]
+        return super().get_idents(request, view)
+
+    def allow_request(self, request, view):
+        if request.method in SAFE_METHODS:
+            self.wait_ms = None
+            return True
+        return super().allow_request(request, view)
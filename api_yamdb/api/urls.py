@@ -2,7 +2,8 @@ from django.urls import include, path
 from rest_framework import routers
 
 from api.views import (AuthViewSet, CategoryViewSet, CommentViewSet,
-                       GenreViewSet, ReviewViewSet, TitleViewSet, UserViewSet)
+                       GenreViewSet, MetricsViewSet, ProfileViewSet,
+                       ReviewViewSet, TitleViewSet, UserViewSet)
 
 
 app_name = 'api'
@@ -24,6 +25,8 @@ v1_router.register('genres', GenreViewSet, basename='genres')
 v1_router.register('categories', CategoryViewSet, basename='categories')
 v1_router.register('users', UserViewSet, basename='users')
 v1_router.register('auth', AuthViewSet, basename='auth')
+v1_router.register('metrics', MetricsViewSet, basename='metrics')
+v1_router.register('profiles', ProfileViewSet, basename='profiles')
 
 v1_api_urlpatterns = [
     path('', include(v1_router.urls)),
@@ -1,81 +1,148 @@
+import random
+
+from django.conf import settings
 from django.contrib.auth import get_user_model
-from django.db.models import Avg
+from django.http import HttpResponse
 from django.shortcuts import get_object_or_404
 from django_filters.rest_framework import DjangoFilterBackend
 from rest_framework import filters, mixins, status, viewsets
 from rest_framework.decorators import action
+from rest_framework.exceptions import NotFound, ValidationError
 from rest_framework.filters import SearchFilter
 from rest_framework.pagination import LimitOffsetPagination
 from rest_framework.permissions import (SAFE_METHODS, AllowAny,
                                         IsAuthenticated,
                                         IsAuthenticatedOrReadOnly)
 from rest_framework.response import Response
-from rest_framework_simplejwt.tokens import AccessToken
 
-from api.filters import TitleFilter
+from api.authentication import get_token_for_user
+from api.filters import TitleFilter, TitleSearchFilter
+from api.metrics import CONTENT_TYPE, render_metrics
+from api.mixins import (CachedListMixin, CachedRetrieveMixin,
+                        ConditionalGetMixin, SparseFieldsMixin)
+from api.pagination import (ApproximateCountPagination,
+                            ReviewCommentPagination)
 from api.permissions import IsAdmin, IsAdminOrReadOnly, IsAuthorOrStaff
+from api.profiling import get_profile, get_profiles
 from api.serializers import (CategorySerializer, CommentSerializer,
                              GenreSerializer, ReviewSerializer,
-                             SignUpSerializer, TitleReadSerializer,
+                             SignUpSerializer, TitleBulkWriteSerializer,
+                             TitleLeanReadSerializer, TitleReadSerializer,
                              TitleWriteSerializer, TokenSerializer,
                              UserSerializer)
+from api.throttling import SignUpThrottle, TokenThrottle, WriteThrottle
 from reviews.models import Category, Genre, Review, Title
+from users.mail_queue import enqueue_confirmation_email
 
 
 User = get_user_model()
 
 
-class ReviewViewSet(viewsets.ModelViewSet):
+class ReviewViewSet(SparseFieldsMixin, ConditionalGetMixin, CachedListMixin,
+                    CachedRetrieveMixin, viewsets.ModelViewSet):
     """Вьюсет для работы с отзывами."""
 
     serializer_class = ReviewSerializer
     permission_classes = (IsAuthenticatedOrReadOnly, IsAuthorOrStaff,)
-    pagination_class = LimitOffsetPagination
+    throttle_classes = (WriteThrottle,)
+    pagination_class = ReviewCommentPagination
     http_method_names = ['get', 'post', 'patch', 'delete']
+    sparse_fields = {
+        'id': ('id',),
+        'text': ('text',),
+        'author': ('author__username',),
+        'score': ('score',),
+        'pub_date': ('pub_date',),
+    }
+    required_columns = ('title',)
+    # Первая страница большой выборки считает записи дважды.
+    query_budget = {
+        'list': 6, 'retrieve': 4, 'create': 6,
+        'partial_update': 6, 'destroy': 7,
+    }
+
+    def get_cache_dependencies(self):
+        """Кэш отзывов зависит от отзывов произведения и авторов."""
+        return (f'reviews:{self.kwargs.get("title_id")}', 'users')
 
     def get_title(self):
-        """Получает произведение по id из URL или возвращает 404."""
-        return get_object_or_404(Title, id=self.kwargs.get('title_id'))
+        """
+        Получает произведение по id из URL или возвращает 404.
+
+        Результат запоминается на время обработки запроса.
+        """
+        if not hasattr(self, '_title'):
+            self._title = get_object_or_404(
+                Title, id=self.kwargs.get('title_id')
+            )
+        return self._title
 
     def get_queryset(self):
         """Возвращает queryset отзывов для конкретного произведения."""
         title = self.get_title()
-        return title.reviews.select_related('author').all()
+        return self.trim_queryset(title.reviews.all())
 
     def perform_create(self, serializer):
         """Создает новый отзыв с привязкой к произведению и автору."""
         title = self.get_title()
-        serializer.save(author=self.request.user, title=title)
+        serializer.save(author_id=self.request.user.pk, title=title)
 
 
-class CommentViewSet(viewsets.ModelViewSet):
+class CommentViewSet(SparseFieldsMixin, ConditionalGetMixin,
+                     CachedListMixin, CachedRetrieveMixin,
+                     viewsets.ModelViewSet):
     """Вьюсет для работы с комментариями."""
 
     serializer_class = CommentSerializer
     permission_classes = (IsAuthenticatedOrReadOnly, IsAuthorOrStaff,)
-    pagination_class = LimitOffsetPagination
+    throttle_classes = (WriteThrottle,)
+    pagination_class = ReviewCommentPagination
     http_method_names = ['get', 'post', 'patch', 'delete']
+    sparse_fields = {
+        'id': ('id',),
+        'text': ('text',),
+        'author': ('author__username',),
+        'pub_date': ('pub_date',),
+    }
+    required_columns = ('review',)
+    # Первая страница большой выборки считает записи дважды.
+    query_budget = {
+        'list': 6, 'retrieve': 4, 'create': 4,
+        'partial_update': 4, 'destroy': 5,
+    }
+
+    def get_cache_dependencies(self):
+        """Кэш комментариев зависит от комментариев отзыва и авторов."""
+        return (f'comments:{self.kwargs.get("review_id")}', 'users')
 
     def get_review(self):
-        """Получает отзыв по id и произведени из URL или возвращает 404."""
-        return get_object_or_404(
-            Review,
-            pk=self.kwargs.get('review_id'),
-            title__id=self.kwargs.get('title_id'),
-        )
+        """
+        Получает отзыв по id и произведению из URL или возвращает 404.
+
+        Принадлежность отзыва произведению проверяется тем же запросом,
+        результат запоминается на время обработки запроса.
+        """
+        if not hasattr(self, '_review'):
+            self._review = get_object_or_404(
+                Review,
+                pk=self.kwargs.get('review_id'),
+                title_id=self.kwargs.get('title_id'),
+            )
+        return self._review
 
     def get_queryset(self):
         """Возвращает queryset комментариев для конкретного отзыва."""
         review = self.get_review()
-        return review.comments.select_related('author').all()
+        return self.trim_queryset(review.comments.all())
 
     def perform_create(self, serializer):
         """Создает новый комментарий с привязкой к отзыву и автору."""
         review = self.get_review()
-        serializer.save(author=self.request.user, review=review)
+        serializer.save(author_id=self.request.user.pk, review=review)
 
 
-class CategoryGenreBaseViewSet(mixins.CreateModelMixin,
+class CategoryGenreBaseViewSet(CachedListMixin,
+                               mixins.CreateModelMixin,
                                mixins.DestroyModelMixin,
                                mixins.ListModelMixin,
                                viewsets.GenericViewSet):
@@ -94,6 +161,8 @@ class CategoryViewSet(CategoryGenreBaseViewSet):
 
     queryset = Category.objects.all()
     serializer_class = CategorySerializer
+    cache_dependencies = ('categories',)
+    query_budget = {'list': 3, 'create': 4, 'destroy': 6}
 
 
 class GenreViewSet(CategoryGenreBaseViewSet):
@@ -101,55 +170,176 @@ class GenreViewSet(CategoryGenreBaseViewSet):
 
     queryset = Genre.objects.all()
     serializer_class = GenreSerializer
+    cache_dependencies = ('genres',)
+    # Удаление жанра переиндексирует его произведения одним пакетом.
+    query_budget = {'list': 3, 'create': 4, 'destroy': 11}
 
 
-class TitleViewSet(viewsets.ModelViewSet):
+class TitleViewSet(SparseFieldsMixin, ConditionalGetMixin, CachedListMixin,
+                   CachedRetrieveMixin, viewsets.ModelViewSet):
     """Вьюсет для работы с произведениями."""
 
-    queryset = Title.objects.select_related(
-        'category'
-    ).prefetch_related(
-        'genre'
-    ).annotate(
-        rating=Avg('reviews__score')
-    )
+    queryset = Title.objects.all()
     filter_backends = (
         DjangoFilterBackend,
         filters.OrderingFilter,
-        filters.SearchFilter,
+        TitleSearchFilter,
     )
     filterset_class = TitleFilter
     ordering_fields = ('name', 'year',)
-    search_fields = ('name', 'genre__name',)
-    pagination_class = LimitOffsetPagination
+    pagination_class = ApproximateCountPagination
     permission_classes = (IsAdminOrReadOnly,)
     http_method_names = ['get', 'post', 'patch', 'delete']
+    sparse_fields = {
+        'id': ('id',),
+        'name': ('name',),
+        'year': ('year',),
+        'rating': ('rating_sum', 'review_count'),
+        'description': ('description',),
+        'genre': ('genre',),
+        'category': ('category__name', 'category__slug'),
+    }
+    expandable_fields = ('genre', 'category')
+    batch_param = 'ids'
+    batch_max_size = 100
+    batch_max_id = 2 ** 63 - 1
+    # Запись обновляет поисковый индекс и дату изменения произведения,
+    # первая страница большой выборки считает записи дважды. У bulk
+    # нет бюджета: без возврата id из bulk_create (SQLite) произведения
+    # записываются по одному и число запросов растет с размером пакета.
+    query_budget = {
+        'list': 6, 'retrieve': 4, 'batch': 2,
+        'create': 15, 'partial_update': 17, 'destroy': 8,
+    }
+
+    def get_cache_dependencies(self):
+        """Кэш произведений зависит от произведения, жанров и категорий."""
+        if self.action == 'retrieve':
+            title = f'title:{self.kwargs.get(self.lookup_field)}'
+        else:
+            title = 'titles'
+        return (title, 'genres', 'categories')
+
+    def use_lean_read(self):
+        """
+        Решает, читать ли произведения быстрым путем через values().
+
+        Доля таких запросов задается настройкой TITLE_LEAN_READ_RATIO,
+        решение запоминается на время обработки запроса. Browsable API
+        всегда работает с объектами: ему нужны формы редактирования.
+        """
+        if not hasattr(self, '_lean_read'):
+            renderer = getattr(self.request, 'accepted_renderer', None)
+            self._lean_read = (
+                self.request.method in SAFE_METHODS
+                and getattr(renderer, 'format', None) != 'api'
+                and random.random() < settings.TITLE_LEAN_READ_RATIO
+            )
+        return self._lean_read
+
+    def get_queryset(self):
+        """Возвращает строки values() для быстрого чтения или объекты."""
+        if self.use_lean_read():
+            columns, _, _ = self.get_sparse_lookups(Title)
+            return Title.objects.values(*columns)
+        return self.trim_queryset(super().get_queryset())
 
     def get_serializer_class(self):
         """Возвращает нужный сериализатор в зависимости от метода."""
         if self.request.method in SAFE_METHODS:
+            if self.use_lean_read():
+                return TitleLeanReadSerializer
             return TitleReadSerializer
         return TitleWriteSerializer
 
+    def get_batch_ids(self):
+        """Возвращает id из параметра ids без повторов, в порядке запроса."""
+        values = [
+            value.strip()
+            for param in self.request.query_params.getlist(self.batch_param)
+            for value in param.split(',')
+            if value.strip()
+        ]
+        if not values:
+            raise ValidationError({self.batch_param: ['Не указаны id.']})
+        # isdigit() без isascii() пропускает цифры вроде '²', которые
+        # int() не разбирает; слишком большие id не поместятся в базу.
+        if not all(
+            value.isascii() and value.isdigit()
+            and int(value) <= self.batch_max_id
+            for value in values
+        ):
+            raise ValidationError(
+                {self.batch_param: ['id должны быть целыми числами.']}
+            )
+        ids = list(dict.fromkeys(map(int, values)))
+        if len(ids) > self.batch_max_size:
+            raise ValidationError({self.batch_param: [
+                f'Можно запросить не больше {self.batch_max_size} '
+                'произведений.'
+            ]})
+        return ids
+
+    @action(detail=False, methods=['get'])
+    def batch(self, request):
+        """
+        Возвращает произведения по списку id за один запрос.
+
+        Результаты идут в порядке id из запроса, отсутствующие id
+        перечислены в missing.
+        """
+        return self.cached_response(self.get_batch, request)
+
+    def get_batch(self, request):
+        """Загружает произведения и жанры двумя запросами к базе."""
+        ids = self.get_batch_ids()
+        titles = {
+            title['id'] if isinstance(title, dict) else title.pk: title
+            for title in self.get_queryset().filter(pk__in=ids)
+        }
+        serializer = self.get_serializer(
+            [titles[pk] for pk in ids if pk in titles], many=True
+        )
+        return Response({
+            'results': serializer.data,
+            'missing': [pk for pk in ids if pk not in titles],
+        })
+
+    @action(detail=False, methods=['post'])
+    def bulk(self, request):
+        """Пакетное создание и изменение произведений администратором."""
+        serializer = TitleBulkWriteSerializer(data=request.data)
+        serializer.is_valid(raise_exception=True)
+        serializer.save()
+        return Response(serializer.data, status=status.HTTP_200_OK)
+
 
 class AuthViewSet(viewsets.ViewSet):
     """Вьюсет для работы с регистрацией и аутентификацией."""
 
     permission_classes = (AllowAny,)
+    query_budget = {'signup': 5, 'token': 1}
 
-    @action(detail=False, methods=['post'])
+    @action(detail=False, methods=['post'],
+            throttle_classes=(SignUpThrottle,))
     def signup(self, request):
-        """Регистрация пользователя и отправка кода подтверждения"""
+        """
+        Регистрация пользователя и постановка письма с кодом в очередь.
+
+        Письмо отправляет воркер process_email_queue, поэтому ответ
+        не ждет почтового сервера.
+        """
         serializer = SignUpSerializer(data=request.data)
         serializer.is_valid(raise_exception=True)
 
         user = serializer.save()
 
-        user.send_confirmation_email()
+        enqueue_confirmation_email(user)
 
         return Response(serializer.data, status=status.HTTP_200_OK)
 
-    @action(detail=False, methods=['post'])
+    @action(detail=False, methods=['post'],
+            throttle_classes=(TokenThrottle,))
     def token(self, request):
         """Получение токена по коду подтверждения."""
         serializer = TokenSerializer(data=request.data)
@@ -157,7 +347,7 @@ class AuthViewSet(viewsets.ViewSet):
 
         user = serializer.validated_data['user']
 
-        token = AccessToken.for_user(user)
+        token = get_token_for_user(user)
         return Response({'token': str(token)}, status=status.HTTP_200_OK)
 
 
@@ -171,6 +361,15 @@ class UserViewSet(viewsets.ModelViewSet):
     filter_backends = (SearchFilter,)
     search_fields = ('username',)
     http_method_names = ['get', 'post', 'patch', 'delete']
+    # Первая страница большой выборки считает записи дважды.
+    query_budget = {
+        'list': 4, 'retrieve': 2, 'create': 4,
+        'partial_update': 3, 'destroy': 10, 'me': 4,
+    }
+
+    def get_cache_dependencies(self):
+        """Кэш числа пользователей в пагинации сбрасывается их изменением."""
+        return ('users',)
 
     @action(
         detail=False,
@@ -179,7 +378,7 @@ class UserViewSet(viewsets.ModelViewSet):
     )
     def me(self, request):
         """Получить или изменить данные своей учетной записи"""
-        user = request.user
+        user = get_object_or_404(User, pk=request.user.pk)
         if request.method == 'GET':
             serializer = self.get_serializer(user)
             return Response(serializer.data)
@@ -192,3 +391,39 @@ class UserViewSet(viewsets.ModelViewSet):
         serializer.is_valid(raise_exception=True)
         serializer.save(role=user.role)
         return Response(serializer.data)
+
+
+class MetricsViewSet(viewsets.ViewSet):
+    """Метрики API в текстовом формате Prometheus для администраторов."""
+
+    permission_classes = (IsAuthenticated, IsAdmin,)
+
+    def list(self, request):
+        return HttpResponse(render_metrics(), content_type=CONTENT_TYPE)
+
+
+class ProfileViewSet(viewsets.ViewSet):
+    """
+    Последние профили запросов для администраторов.
+
+    Список содержит описание профилей без статистики и SQL-запросов,
+    полный профиль доступен по id.
+    """
+
+    permission_classes = (IsAuthenticated, IsAdmin,)
+    summary_fields = (
+        'id', 'trigger', 'method', 'path', 'view', 'status', 'started',
+        'duration', 'query_count',
+    )
+
+    def list(self, request):
+        return Response([
+            {field: profile[field] for field in self.summary_fields}
+            for profile in get_profiles()
+        ])
+
+    def retrieve(self, request, pk=None):
+        profile = get_profile(pk)
+        if profile is None:
+            raise NotFound('Профиль не найден.')
+        return Response(profile)
@@ -1,11 +1,102 @@
+from django import forms
 from django.contrib import admin
+from django.contrib.admin.widgets import AutocompleteSelect
+from django.db.models import Q
+from django.utils.translation import gettext_lazy as _
 
+from reviews.counts import EstimatedCountPaginator
 from reviews.models import Category, Comment, Genre, Review, Title
+from reviews.search import get_search_backend
 
 
 admin.site.empty_value_display = '-пусто-'
 
 
+class AutocompleteFilter(admin.FieldListFilter):
+    """
+    Фильтр списка по внешнему ключу с полем автодополнения.
+
+    Стандартный RelatedFieldListFilter выводит в боковую панель все
+    связанные объекты. Этот фильтр показывает только поле выбора,
+    которое ищет объекты через autocomplete_view связанной модели,
+    поэтому для нее должна быть зарегистрирована админка с
+    search_fields.
+    """
+
+    template = 'admin/autocomplete_filter.html'
+
+    def __init__(self, field, request, params, model, model_admin,
+                 field_path):
+        self.lookup_kwarg = (
+            f'{field_path}__{field.target_field.name}__exact'
+        )
+        self.lookup_val = params.get(self.lookup_kwarg)
+        self.admin_site = model_admin.admin_site
+        self.request = request
+        super().__init__(
+            field, request, params, model, model_admin, field_path
+        )
+
+    def has_output(self):
+        return True
+
+    def expected_parameters(self):
+        return [self.lookup_kwarg]
+
+    def choices(self, changelist):
+        yield {
+            'selected': self.lookup_val is None,
+            'query_string': changelist.get_query_string(
+                remove=[self.lookup_kwarg]
+            ),
+            'display': _('All'),
+        }
+
+    @property
+    def hidden_params(self):
+        """Остальные параметры списка, которые сохраняет форма фильтра."""
+        return [
+            (name, value)
+            for name, value in self.request.GET.items()
+            if name not in (self.lookup_kwarg, 'p')
+        ]
+
+    @property
+    def rendered_widget(self):
+        """Поле автодополнения для выбора связанного объекта."""
+        field = forms.ModelChoiceField(
+            queryset=self.field.remote_field.model.objects.all(),
+            required=False,
+            widget=AutocompleteSelect(self.field, self.admin_site),
+        )
+        return field.widget.render(
+            self.lookup_kwarg,
+            self.lookup_val,
+            attrs={'id': f'id_filter_{self.field_path}'},
+        )
+
+
+class LargeTableAdmin(admin.ModelAdmin):
+    """
+    Базовая админка для таблиц с миллионами строк.
+
+    Число строк для пагинации оценивается по статистике базы, а
+    полный COUNT(*) для ссылки «Показать все» не выполняется.
+    date_hierarchy не используется: он выбирает даты всей таблицы при
+    каждой загрузке списка; дату публикации фильтрует
+    DateFieldListFilter, ссылки которого не требуют запросов.
+    """
+
+    paginator = EstimatedCountPaginator
+    show_full_result_count = False
+
+    @property
+    def media(self):
+        return super().media + AutocompleteSelect(
+            None, self.admin_site
+        ).media
+
+
 @admin.register(Category)
 class CategoryAdmin(admin.ModelAdmin):
     """Административный интерфейс для модели категорий."""
@@ -32,12 +123,36 @@ class TitleAdmin(admin.ModelAdmin):
 
     list_display = ('name', 'year', 'description',
                     'category', 'display_genres')
-    search_fields = ('name', 'year', 'category__name')
+    search_fields = ('name', 'year', 'category__name', 'category__slug')
     list_filter = ('year', 'category', 'genre')
     filter_horizontal = ('genre',)
     list_select_related = ('category',)
     list_editable = ('category',)
 
+    def get_search_results(self, request, queryset, search_term):
+        """
+        Поиск по названию, точному году, названию или slug категории.
+
+        Название ищется через индекс поиска произведений, категории -
+        подзапросом к небольшой таблице категорий без JOIN.
+        """
+        search_term = search_term.strip()
+        if not search_term:
+            return queryset, False
+        names = get_search_backend().filter_queryset(
+            Title.objects.all(), search_term, fields=('name',)
+        ).values('pk')
+        categories = Category.objects.filter(
+            Q(name__icontains=search_term) | Q(slug=search_term)
+        ).values('pk')
+        condition = Q(pk__in=names) | Q(category__in=categories)
+        if (
+            search_term.isascii() and search_term.isdigit()
+            and len(search_term) <= 4
+        ):
+            condition |= Q(year=int(search_term))
+        return queryset.filter(condition), False
+
     @admin.display(description='Жанры')
     def display_genres(self, obj):
         """Отображает жанры через запятую."""
@@ -50,22 +165,47 @@ class TitleAdmin(admin.ModelAdmin):
 
 
 @admin.register(Comment)
-class CommentAdmin(admin.ModelAdmin):
+class CommentAdmin(LargeTableAdmin):
     """Административный интерфейс для модели комментариев."""
 
     list_display = ('review', 'author', 'text', 'pub_date')
-    search_fields = ('review', 'author__username',)
-    list_filter = ('review', 'author',)
-    list_select_related = ('title', 'author')
-    date_hierarchy = 'pub_date'
+    search_fields = ('author__username__exact',)
+    list_filter = (
+        ('review', AutocompleteFilter),
+        ('author', AutocompleteFilter),
+        ('pub_date', admin.DateFieldListFilter),
+    )
+    list_select_related = ('author', 'review__author', 'review__title')
+    autocomplete_fields = ('review', 'author')
 
 
 @admin.register(Review)
-class ReviewAdmin(admin.ModelAdmin):
+class ReviewAdmin(LargeTableAdmin):
     """Административный интерфейс для модели отзывов."""
 
     list_display = ('title', 'author', 'text', 'score', 'pub_date',)
-    search_fields = ('title', 'author__username', 'text', 'score',)
-    list_filter = ('title', 'author', 'score',)
+    search_fields = ('author__username__exact',)
+    list_filter = (
+        ('title', AutocompleteFilter),
+        ('author', AutocompleteFilter),
+        'score',
+        ('pub_date', admin.DateFieldListFilter),
+    )
     list_select_related = ('title', 'author')
-    date_hierarchy = 'pub_date'
+    autocomplete_fields = ('title', 'author')
+
+    def get_search_results(self, request, queryset, search_term):
+        """
+        Поиск по точному имени автора или по названию произведения.
+
+        Название ищется через индекс поиска произведений, а отзывы
+        отбираются по индексу внешнего ключа title_id.
+        """
+        if not search_term:
+            return queryset, False
+        titles = get_search_backend().filter_queryset(
+            Title.objects.all(), search_term, fields=('name',)
+        ).values('pk')
+        return queryset.filter(
+            Q(author__username=search_term) | Q(title__in=titles)
+        ), False
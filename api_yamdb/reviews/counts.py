@@ -0,0 +1,75 @@
+from django.core.paginator import Paginator
+from django.db import OperationalError, connections
+from django.utils.functional import cached_property
+
+
+def estimate_count(model, using='default'):
+    """
+    Возвращает оценку числа строк таблицы модели по статистике базы.
+
+    Для PostgreSQL используется pg_class.reltuples, для SQLite -
+    sqlite_stat1, которую заполняет ANALYZE. Если статистики нет,
+    возвращает None.
+    """
+    connection = connections[using]
+    table = model._meta.db_table
+    with connection.cursor() as cursor:
+        if connection.vendor == 'postgresql':
+            cursor.execute(
+                'SELECT reltuples FROM pg_class WHERE oid = to_regclass(%s)',
+                [table],
+            )
+        elif connection.vendor == 'sqlite':
+            # sqlite_stat1 создается первым ANALYZE. Ошибка чтения
+            # не прерывает транзакцию SQLite.
+            try:
+                cursor.execute(
+                    'SELECT stat FROM sqlite_stat1 WHERE tbl = %s LIMIT 1',
+                    [table],
+                )
+            except OperationalError:
+                return None
+        else:
+            return None
+        row = cursor.fetchone()
+    if row is None:
+        return None
+    # В sqlite_stat1 первое число строки stat - количество строк.
+    estimate = int(float(str(row[0]).split()[0]))
+    return estimate if estimate >= 0 else None
+
+
+def bounded_count(queryset, limit):
+    """
+    Считает строки набора, но не больше limit.
+
+    COUNT выполняется по подзапросу с LIMIT, поэтому база прекращает
+    чтение после limit строк. Сортировка на число строк не влияет
+    и сбрасывается.
+    """
+    return queryset.order_by()[:limit].count()
+
+
+class EstimatedCountPaginator(Paginator):
+    """
+    Пагинатор без полного COUNT(*) по большим таблицам.
+
+    Для набора без фильтров число строк берется из статистики базы,
+    если оно не меньше exact_count_limit, иначе считается точно. Для
+    отфильтрованного набора считается не больше exact_count_limit
+    строк: номера дальних страниц не показываются, но первые страницы
+    и переход между ними работают.
+    """
+
+    exact_count_limit = 10000
+
+    @cached_property
+    def count(self):
+        queryset = self.object_list
+        if not hasattr(queryset, 'query'):
+            return super().count
+        if not queryset.query.where:
+            estimate = estimate_count(queryset.model, queryset.db)
+            if estimate is not None and estimate >= self.exact_count_limit:
+                return estimate
+        return bounded_count(queryset, self.exact_count_limit)
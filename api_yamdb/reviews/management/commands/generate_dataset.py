@@ -0,0 +1,132 @@
+import csv
+import os
+import random
+from datetime import datetime, timedelta
+
+from django.core.management.base import BaseCommand, CommandError
+
+from constants import MAX_SCORE, MIN_SCORE
+
+
+class Command(BaseCommand):
+    """Генерация синтетического набора данных в формате static/data."""
+
+    CSV_ENCODING = 'utf-8'
+    START_DATE = datetime(2019, 1, 1)
+    ROLES = ('user', 'user', 'user', 'moderator', 'admin')
+
+    help = 'Generate a synthetic dataset in the static/data CSV layout'
+
+    def add_arguments(self, parser):
+        parser.add_argument('output', help='Directory for generated CSV files')
+        parser.add_argument('--titles', type=int, default=1000)
+        parser.add_argument('--genres', type=int, default=20)
+        parser.add_argument('--categories', type=int, default=5)
+        parser.add_argument('--users', type=int, default=200)
+        parser.add_argument('--reviews-per-title', type=int, default=10)
+        parser.add_argument('--comments-per-review', type=int, default=2)
+        parser.add_argument('--genres-per-title', type=int, default=2)
+        parser.add_argument('--seed', type=int, default=0)
+
+    def handle(self, *args, **options):
+        """Основной метод обработки команды."""
+        if options['reviews_per_title'] > options['users']:
+            raise CommandError(
+                'Отзывов на произведение не может быть больше, '
+                'чем пользователей: отзыв уникален для автора.'
+            )
+        if options['genres_per_title'] > options['genres']:
+            raise CommandError(
+                'Жанров у произведения не может быть больше, чем жанров.'
+            )
+        self.random = random.Random(options['seed'])
+        self.output = options['output']
+        os.makedirs(self.output, exist_ok=True)
+
+        # Первый пользователь всегда администратор: он нужен benchmark_api.
+        user_ids = range(1, options['users'] + 1)
+        genre_ids = range(1, options['genres'] + 1)
+        category_ids = range(1, options['categories'] + 1)
+        title_ids = range(1, options['titles'] + 1)
+
+        self.write('users.csv', (
+            'id', 'username', 'email', 'role', 'bio',
+            'first_name', 'last_name',
+        ), (
+            (pk, f'user{pk}', f'user{pk}@yamdb.fake',
+             'admin' if pk == 1 else self.random.choice(self.ROLES),
+             '', '', '')
+            for pk in user_ids
+        ))
+        self.write('category.csv', ('id', 'name', 'slug'), (
+            (pk, f'Категория {pk}', f'category-{pk}') for pk in category_ids
+        ))
+        self.write('genre.csv', ('id', 'name', 'slug'), (
+            (pk, f'Жанр {pk}', f'genre-{pk}') for pk in genre_ids
+        ))
+        self.write('titles.csv', ('id', 'name', 'year', 'category'), (
+            (pk, f'Произведение {pk}', self.random.randint(1900, 2020),
+             self.random.choice(category_ids))
+            for pk in title_ids
+        ))
+        self.write('genre_title.csv', ('id', 'title_id', 'genre_id'), (
+            (pk, title_id, genre_id)
+            for pk, (title_id, genre_id) in enumerate((
+                (title_id, genre_id)
+                for title_id in title_ids
+                for genre_id in self.random.sample(
+                    genre_ids, options['genres_per_title']
+                )
+            ), 1)
+        ))
+        review_count = self.write('review.csv', (
+            'id', 'title_id', 'text', 'author', 'score', 'pub_date',
+        ), (
+            (pk, title_id, f'Отзыв {pk}', author_id,
+             self.random.randint(MIN_SCORE, MAX_SCORE), self.pub_date())
+            for pk, (title_id, author_id) in enumerate((
+                (title_id, author_id)
+                for title_id in title_ids
+                for author_id in self.random.sample(
+                    user_ids, options['reviews_per_title']
+                )
+            ), 1)
+        ))
+        self.write('comments.csv', (
+            'id', 'review_id', 'text', 'author', 'pub_date',
+        ), (
+            (pk, review_id, f'Комментарий {pk}',
+             self.random.choice(user_ids), self.pub_date())
+            for pk, review_id in enumerate((
+                review_id
+                for review_id in range(1, review_count + 1)
+                for _ in range(options['comments_per_review'])
+            ), 1)
+        ))
+
+        self.stdout.write(self.style.SUCCESS(
+            f'Набор данных сохранен в {self.output}'
+        ))
+
+    def pub_date(self):
+        """Возвращает случайную дату в формате static/data."""
+        date = self.START_DATE + timedelta(
+            seconds=self.random.randint(0, 3 * 365 * 24 * 3600),
+            milliseconds=self.random.randint(0, 999),
+        )
+        return date.strftime('%Y-%m-%dT%H:%M:%S.%f')[:-3] + 'Z'
+
+    def write(self, filename, header, rows):
+        """Записывает строки в CSV и возвращает их количество."""
+        count = 0
+        with open(
+            os.path.join(self.output, filename), 'w',
+            encoding=self.CSV_ENCODING, newline='',
+        ) as csvfile:
+            writer = csv.writer(csvfile)
+            writer.writerow(header)
+            for row in rows:
+                writer.writerow(row)
+                count += 1
+        self.stdout.write(f'{filename}: {count} строк')
+        return count
@@ -1,8 +1,13 @@
 import csv
+import os
+import time
 from datetime import datetime
+from itertools import islice
 
 from django.contrib.auth import get_user_model
+from django.core.management import call_command
 from django.core.management.base import BaseCommand
+from django.db import transaction
 from django.db.utils import IntegrityError
 
 from reviews.models import Category, Comment, Genre, Review, Title
@@ -17,11 +22,36 @@ class Command(BaseCommand):
     DATA_PATH = 'static/data/'
     DATE_FORMAT = '%Y-%m-%dT%H:%M:%S.%fZ'
     CSV_ENCODING = 'utf-8'
+    DEFAULT_CHUNK_SIZE = 1000
 
     help = 'Load data from CSV files into database'
 
+    def add_arguments(self, parser):
+        parser.add_argument(
+            '--data-path',
+            default=self.DATA_PATH,
+            help='Directory with CSV files',
+        )
+        parser.add_argument(
+            '--bulk',
+            action='store_true',
+            help='Load files in chunks with bulk_create',
+        )
+        parser.add_argument(
+            '--chunk-size',
+            type=int,
+            default=self.DEFAULT_CHUNK_SIZE,
+            help='Number of rows per chunk in bulk mode',
+        )
+
     def handle(self, *args, **options):
         """Основной метод обработки команды."""
+        self.data_path = options['data_path']
+        if options['bulk']:
+            self.bulk_load(options['chunk_size'])
+            self.stdout.write(self.style.SUCCESS('Данные успешно загружены!'))
+            return
+
         loaders = {
             'users.csv': (User, self.load_data),
             'category.csv': (Category, self.load_data),
@@ -43,7 +73,7 @@ class Command(BaseCommand):
     def load_data(self, filename, model):
         """Общая функция загрузки моделей категорий и жанров."""
         with open(
-            f'{self.DATA_PATH}{filename}', encoding=self.CSV_ENCODING
+            os.path.join(self.data_path, filename), encoding=self.CSV_ENCODING
         ) as csvfile:
             reader = csv.DictReader(csvfile)
             for row in reader:
@@ -58,7 +88,7 @@ class Command(BaseCommand):
     def load_titles(self, filename):
         """Загрузка произведений."""
         with open(
-            f'{self.DATA_PATH}{filename}', encoding=self.CSV_ENCODING
+            os.path.join(self.data_path, filename), encoding=self.CSV_ENCODING
         ) as csvfile:
             reader = csv.DictReader(csvfile)
             for row in reader:
@@ -76,7 +106,7 @@ class Command(BaseCommand):
     def load_genre_title(self, filename):
         """Загрузка жанра к произведению (связь ManyToMany)."""
         with open(
-            f'{self.DATA_PATH}{filename}', encoding=self.CSV_ENCODING
+            os.path.join(self.data_path, filename), encoding=self.CSV_ENCODING
         ) as csvfile:
             reader = csv.DictReader(csvfile)
             for row in reader:
@@ -105,7 +135,7 @@ class Command(BaseCommand):
     def load_reviews_comments(self, filename, model):
         """Общая функция загрузки моделей комментариев и отзывов."""
         with open(
-            f'{self.DATA_PATH}{filename}', encoding=self.CSV_ENCODING
+            os.path.join(self.data_path, filename), encoding=self.CSV_ENCODING
         ) as csvfile:
             reader = csv.DictReader(csvfile)
             for row in reader:
@@ -142,3 +172,104 @@ class Command(BaseCommand):
                     self.stdout.write(self.style.ERROR(
                         f'Пользователь {row["author"]} не найден: {str(error)}'
                     ))
+
+    def bulk_load(self, chunk_size):
+        """Потоковая загрузка всех файлов пачками через bulk_create."""
+        # Файл, модель и внешние ключи: колонка CSV -> (поле, модель).
+        loaders = (
+            ('users.csv', User, {}),
+            ('category.csv', Category, {}),
+            ('genre.csv', Genre, {}),
+            ('titles.csv', Title, {'category': ('category_id', Category)}),
+            ('genre_title.csv', Title.genre.through, {
+                'title_id': ('title_id', Title),
+                'genre_id': ('genre_id', Genre),
+            }),
+            ('review.csv', Review, {
+                'title_id': ('title_id', Title),
+                'author': ('author_id', User),
+            }),
+            ('comments.csv', Comment, {
+                'review_id': ('review_id', Review),
+                'author': ('author_id', User),
+            }),
+        )
+        known_ids = {}
+
+        for filename, model, foreign_keys in loaders:
+            for _, related_model in foreign_keys.values():
+                if related_model not in known_ids:
+                    known_ids[related_model] = set(
+                        related_model.objects.values_list('id', flat=True)
+                    )
+            # ignore_conflicts молча пропускает существующие строки,
+            # поэтому добавленные строки считаются по числу записей.
+            before = model.objects.count()
+            started = time.perf_counter()
+            processed, skipped = self.bulk_load_file(
+                filename, model, foreign_keys, known_ids, chunk_size
+            )
+            elapsed = time.perf_counter() - started
+            loaded = model.objects.count() - before
+            known_ids.pop(model, None)
+            self.stdout.write(
+                f'{filename}: добавлено {loaded}, обработано {processed} '
+                f'строк за {elapsed:.2f} с '
+                f'({processed / elapsed if elapsed else 0:.0f} строк/с), '
+                f'уже существовало: {processed - loaded}, '
+                f'пропущено: {skipped}'
+            )
+
+        # bulk_create не вызывает save и сигналы, поэтому сохраненные
+        # рейтинги и поисковый индекс перестраиваются целиком.
+        call_command('rebuild_title_ratings', stdout=self.stdout)
+        call_command('rebuild_title_search', stdout=self.stdout)
+
+    def bulk_load_file(self, filename, model, foreign_keys, known_ids,
+                       chunk_size):
+        """
+        Загружает один файл пачками, каждая пачка в своей транзакции.
+
+        Возвращает число переданных в bulk_create и пропущенных строк.
+        """
+        processed = skipped = 0
+        with open(
+            os.path.join(self.data_path, filename), encoding=self.CSV_ENCODING
+        ) as csvfile:
+            reader = csv.DictReader(csvfile)
+            while True:
+                rows = list(islice(reader, chunk_size))
+                if not rows:
+                    break
+                objects = []
+                for row in rows:
+                    obj = self.build_object(
+                        row, model, foreign_keys, known_ids
+                    )
+                    if obj is None:
+                        skipped += 1
+                    else:
+                        objects.append(obj)
+                with transaction.atomic():
+                    model.objects.bulk_create(
+                        objects, batch_size=chunk_size, ignore_conflicts=True
+                    )
+                processed += len(objects)
+        return processed, skipped
+
+    def build_object(self, row, model, foreign_keys, known_ids):
+        """Создает объект модели из строки CSV без запросов к базе."""
+        for column, (field, related_model) in foreign_keys.items():
+            value = int(row.pop(column))
+            if value not in known_ids[related_model]:
+                self.stdout.write(self.style.ERROR(
+                    f'{related_model.__name__} с id={value} не найден '
+                    f'для {model.__name__} {row.get("id")}'
+                ))
+                return None
+            row[field] = value
+        if 'pub_date' in row:
+            row['pub_date'] = datetime.strptime(
+                row['pub_date'], self.DATE_FORMAT
+            )
+        return model(**row)
@@ -0,0 +1,46 @@
+from django.core.management.base import BaseCommand
+from django.db import transaction
+from django.db.models import Count, Sum
+from django.db.models.functions import Coalesce
+from django.utils import timezone
+
+from reviews.models import Title
+
+
+class Command(BaseCommand):
+    """Пересчет сохраненных рейтингов произведений по отзывам."""
+
+    BATCH_SIZE = 500
+
+    help = 'Rebuild stored rating_sum and review_count for all titles'
+
+    def handle(self, *args, **options):
+        """Основной метод обработки команды."""
+        titles = Title.objects.annotate(
+            actual_sum=Coalesce(Sum('reviews__score'), 0),
+            actual_count=Count('reviews'),
+        ).only('id', 'rating_sum', 'review_count')
+
+        changed = []
+        now = timezone.now()
+        for title in titles.iterator():
+            if (
+                title.rating_sum == title.actual_sum
+                and title.review_count == title.actual_count
+            ):
+                continue
+            title.rating_sum = title.actual_sum
+            title.review_count = title.actual_count
+            title.modified = now
+            changed.append(title)
+
+        with transaction.atomic():
+            Title.objects.bulk_update(
+                changed,
+                ('rating_sum', 'review_count', 'modified'),
+                batch_size=self.BATCH_SIZE,
+            )
+
+        self.stdout.write(self.style.SUCCESS(
+            f'Рейтинги пересчитаны, обновлено произведений: {len(changed)}'
+        ))
@@ -0,0 +1,14 @@
+from django.core.management.base import BaseCommand
+
+from reviews.search import get_search_backend
+
+
+class Command(BaseCommand):
+    """Перестроение поискового индекса произведений."""
+
+    help = 'Rebuild the full-text search index for titles'
+
+    def handle(self, *args, **options):
+        """Основной метод обработки команды."""
+        get_search_backend().rebuild()
+        self.stdout.write(self.style.SUCCESS('Поисковый индекс перестроен'))
@@ -0,0 +1,44 @@
+from django.db import migrations
+
+
+CREATE_INDEX = """
+CREATE VIRTUAL TABLE IF NOT EXISTS reviews_title_search
+USING fts5(name, description, genres, tokenize='trigram')
+"""
+
+FILL_INDEX = """
+INSERT INTO reviews_title_search(rowid, name, description, genres)
+SELECT title.id, title.name, title.description, COALESCE((
+    SELECT group_concat(genre.name, ' ')
+    FROM reviews_title_genre AS title_genre
+    JOIN reviews_genre AS genre ON genre.id = title_genre.genre_id
+    WHERE title_genre.title_id = title.id
+), '')
+FROM reviews_title AS title
+"""
+
+DROP_INDEX = 'DROP TABLE IF EXISTS reviews_title_search'
+
+
+def create_search_index(apps, schema_editor):
+    if schema_editor.connection.vendor != 'sqlite':
+        return
+    schema_editor.execute(CREATE_INDEX)
+    schema_editor.execute(FILL_INDEX)
+
+
+def drop_search_index(apps, schema_editor):
+    if schema_editor.connection.vendor != 'sqlite':
+        return
+    schema_editor.execute(DROP_INDEX)
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('reviews', '0008_auto_20261018_0754'),
+    ]
+
+    operations = [
+        migrations.RunPython(create_search_index, drop_search_index),
+    ]
@@ -3,7 +3,9 @@ from datetime import datetime
 from django.contrib.auth import get_user_model
 from django.core.exceptions import ValidationError
 from django.core.validators import MaxValueValidator, MinValueValidator
-from django.db import models
+from django.db import models, transaction
+from django.db.models import F
+from django.utils import timezone
 from django.utils.text import slugify
 
 from constants import CHAR_LIMIT, MAX_NAME_LENGTH, MAX_SCORE, MIN_SCORE
@@ -79,6 +81,14 @@ class Title(models.Model):
         description (TextField): Описание.
         genre (ManyToManyField): Жанр.
         category (ForeignKey): Категория.
+        rating_sum (PositiveIntegerField): Сумма оценок всех отзывов.
+        review_count (PositiveIntegerField): Количество отзывов.
+        modified (DateTimeField): Дата последнего изменения данных,
+            включая рейтинг, жанры и категорию.
+
+    Свойства:
+        rating (float | None): Средняя оценка произведения или None,
+            если отзывов нет.
     """
 
     name = models.CharField(max_length=MAX_NAME_LENGTH,
@@ -96,6 +106,16 @@ class Title(models.Model):
                                  null=True,
                                  blank=True,
                                  on_delete=models.SET_NULL,)
+    rating_sum = models.PositiveIntegerField(verbose_name='Сумма оценок',
+                                             default=0,
+                                             editable=False,)
+    review_count = models.PositiveIntegerField(
+        verbose_name='Количество отзывов',
+        default=0,
+        editable=False,
+    )
+    modified = models.DateTimeField(verbose_name='Дата изменения',
+                                    auto_now=True,)
 
     class Meta:
         verbose_name = 'произведение'
@@ -109,6 +129,27 @@ class Title(models.Model):
     def __str__(self):
         return self.name
 
+    @property
+    def rating(self):
+        """Возвращает среднюю оценку по сохраненным счетчикам."""
+        if not self.review_count:
+            return None
+        return self.rating_sum / self.review_count
+
+    @classmethod
+    def update_rating(cls, title_id, score_delta, count_delta):
+        """Атомарно изменяет счетчики рейтинга произведения."""
+        cls.objects.filter(pk=title_id).update(
+            rating_sum=F('rating_sum') + score_delta,
+            review_count=F('review_count') + count_delta,
+            modified=timezone.now(),
+        )
+
+    @classmethod
+    def touch(cls, **lookups):
+        """Обновляет дату изменения произведений без их загрузки."""
+        cls.objects.filter(**lookups).update(modified=timezone.now())
+
 
 class ReviewCommentBaseModel(models.Model):
     """
@@ -118,6 +159,7 @@ class ReviewCommentBaseModel(models.Model):
         author (ForeignKey): Автор.
         text (TextField): Текст.
         pub_date (DateTimeField): Дата добавления.
+        modified (DateTimeField): Дата последнего изменения.
     """
 
     author = models.ForeignKey(User,
@@ -127,6 +169,8 @@ class ReviewCommentBaseModel(models.Model):
     pub_date = models.DateTimeField(verbose_name='Дата добавления',
                                     auto_now_add=True,
                                     db_index=True,)
+    modified = models.DateTimeField(verbose_name='Дата изменения',
+                                    auto_now=True,)
 
     class Meta:
         abstract = True
@@ -172,6 +216,29 @@ class Review(ReviewCommentBaseModel):
     def __str__(self):
         return f'Отзыв {self.author} на {self.title}'
 
+    @classmethod
+    def from_db(cls, db, field_names, values):
+        """Запоминает загруженную оценку для расчета изменения рейтинга."""
+        instance = super().from_db(db, field_names, values)
+        instance._loaded_score = instance.__dict__.get('score')
+        return instance
+
+    def save(self, *args, **kwargs):
+        """Сохраняет отзыв и обновляет рейтинг произведения."""
+        adding = self._state.adding
+        with transaction.atomic():
+            super().save(*args, **kwargs)
+            if adding:
+                Title.update_rating(self.title_id, self.score, 1)
+            else:
+                previous = getattr(self, '_loaded_score', None)
+                if previous is None:
+                    previous = self.score
+                Title.update_rating(
+                    self.title_id, self.score - previous, 0
+                )
+        self._loaded_score = self.score
+
 
 class Comment(ReviewCommentBaseModel):
     """
@@ -197,4 +264,4 @@ class Comment(ReviewCommentBaseModel):
         ]
 
     def __str__(self):
-        return f'Комментарий {self.author} к отзыву {self.review.id}'
+        return f'Комментарий {self.author} к отзыву {self.review_id}'
@@ -0,0 +1,164 @@
+from django.conf import settings
+from django.db import connection
+from django.db.models import Q
+from django.db.models.expressions import RawSQL
+from django.utils.module_loading import import_string
+
+from reviews.models import Title
+
+
+class LikeTitleSearchBackend:
+    """
+    Поиск произведений через LIKE по полям модели.
+
+    Используется для баз данных без полнотекстового индекса и для
+    запросов, которые индекс обработать не может. Отбор выполняется
+    подзапросом по id, поэтому соединение с жанрами не дублирует строки.
+    """
+
+    search_fields = {
+        'name': 'name',
+        'description': 'description',
+        'genres': 'genre__name',
+    }
+
+    def get_terms(self, query, phrase):
+        """Разбивает запрос на слова или возвращает его целиком."""
+        if phrase:
+            return [query] if query else []
+        return query.split()
+
+    def filter_queryset(self, queryset, query, fields=None, ranked=False,
+                        phrase=False):
+        """
+        Возвращает произведения, содержащие каждое слово запроса.
+
+        Параметры:
+            queryset (QuerySet): Исходный набор произведений.
+            query (str): Поисковый запрос.
+            fields (tuple | None): Поля индекса для поиска, по умолчанию все.
+            ranked (bool): Упорядочить ли результат по релевантности.
+            phrase (bool): Искать запрос целиком, а не по отдельным словам.
+        """
+        fields = fields or tuple(self.search_fields)
+        condition = Q()
+        for term in self.get_terms(query, phrase):
+            term_condition = Q()
+            for field in fields:
+                term_condition |= Q(**{
+                    f'{self.search_fields[field]}__icontains': term
+                })
+            condition &= term_condition
+        matched = Title.objects.filter(condition).values('pk')
+        return queryset.filter(pk__in=matched)
+
+    def index_titles(self, title_ids):
+        """Обновляет записи индекса для указанных произведений."""
+
+    def remove_titles(self, title_ids):
+        """Удаляет записи индекса для указанных произведений."""
+
+    def rebuild(self):
+        """Полностью перестраивает индекс."""
+
+
+class SQLiteFTSTitleSearchBackend(LikeTitleSearchBackend):
+    """
+    Полнотекстовый поиск произведений на SQLite FTS5.
+
+    Индекс хранится в виртуальной таблице с триграммным токенизатором:
+    он находит подстроки без учета регистра, как icontains, и дает
+    оценку релевантности bm25. Запросы из слов короче трех символов
+    обрабатываются базовым LIKE-поиском.
+    """
+
+    table = 'reviews_title_search'
+    min_term_length = 3
+    batch_size = 500
+
+    def is_available(self):
+        """Проверяет, что индекс поддерживается текущей базой данных."""
+        return connection.vendor == 'sqlite'
+
+    def build_match(self, terms, fields):
+        """Формирует выражение MATCH, экранируя слова запроса."""
+        phrases = ' AND '.join(
+            '"{}"'.format(term.replace('"', '""')) for term in terms
+        )
+        return '{{{}}} : ({})'.format(' '.join(fields), phrases)
+
+    def filter_queryset(self, queryset, query, fields=None, ranked=False,
+                        phrase=False):
+        terms = self.get_terms(query, phrase)
+        if (
+            not self.is_available()
+            or not terms
+            or min(map(len, terms)) < self.min_term_length
+        ):
+            return super().filter_queryset(
+                queryset, query, fields, ranked, phrase
+            )
+
+        match = self.build_match(terms, fields or tuple(self.search_fields))
+        queryset = queryset.filter(pk__in=RawSQL(
+            f'SELECT rowid FROM {self.table} WHERE {self.table} MATCH %s',
+            (match,),
+        ))
+        if not ranked:
+            return queryset
+        return queryset.annotate(search_rank=RawSQL(
+            f'SELECT rank FROM {self.table} WHERE {self.table} MATCH %s '
+            f'AND rowid = {Title._meta.db_table}.id',
+            (match,),
+        )).order_by(
+            'search_rank',
+            *(queryset.query.order_by or Title._meta.ordering),
+        )
+
+    def index_titles(self, title_ids):
+        if not self.is_available() or not title_ids:
+            return
+        titles = Title.objects.filter(
+            pk__in=title_ids
+        ).prefetch_related('genre').only('id', 'name', 'description')
+        rows = [
+            (
+                title.id,
+                title.name,
+                title.description,
+                ' '.join(genre.name for genre in title.genre.all()),
+            )
+            for title in titles
+        ]
+        self.remove_titles(title_ids)
+        with connection.cursor() as cursor:
+            cursor.executemany(
+                f'INSERT INTO {self.table} '
+                '(rowid, name, description, genres) VALUES (%s, %s, %s, %s)',
+                rows,
+            )
+
+    def remove_titles(self, title_ids):
+        if not self.is_available() or not title_ids:
+            return
+        title_ids = list(title_ids)
+        placeholders = ', '.join(['%s'] * len(title_ids))
+        with connection.cursor() as cursor:
+            cursor.execute(
+                f'DELETE FROM {self.table} WHERE rowid IN ({placeholders})',
+                title_ids,
+            )
+
+    def rebuild(self):
+        if not self.is_available():
+            return
+        with connection.cursor() as cursor:
+            cursor.execute(f'DELETE FROM {self.table}')
+        title_ids = list(Title.objects.values_list('id', flat=True))
+        for start in range(0, len(title_ids), self.batch_size):
+            self.index_titles(title_ids[start:start + self.batch_size])
+
+
+def get_search_backend():
+    """Возвращает backend поиска из настройки TITLE_SEARCH_BACKEND."""
+    return import_string(settings.TITLE_SEARCH_BACKEND)()
@@ -0,0 +1,135 @@
+from django.db import connection, transaction
+from django.db.models.signals import (m2m_changed, post_delete, post_save,
+                                      pre_delete)
+from django.dispatch import Signal, receiver
+
+from reviews.models import Category, Genre, Review, Title
+from reviews.search import get_search_backend
+
+
+# Отправляется после пакетной записи произведений в обход save():
+# аргумент title_ids содержит id созданных и измененных произведений.
+titles_bulk_saved = Signal()
+
+
+class TitleIndexBatch:
+    """Произведения, ожидающие переиндексации после транзакции."""
+
+    def __init__(self):
+        self.title_ids = set()
+
+    def __call__(self):
+        get_search_backend().index_titles(list(self.title_ids))
+
+
+def schedule_index(title_ids):
+    """
+    Переиндексирует произведения после фиксации транзакции.
+
+    Все изменения произведений в одной транзакции, например save()
+    и genre.set() при обновлении, дают одну переиндексацию. Вне
+    транзакции индекс обновляется сразу.
+    """
+    if not connection.in_atomic_block:
+        get_search_backend().index_titles(title_ids)
+        return
+    batch = getattr(connection, 'title_index_batch', None)
+    # Откат транзакции или точки сохранения отменяет и переиндексацию.
+    if batch is None or not any(
+        callback is batch for _, callback in connection.run_on_commit
+    ):
+        batch = connection.title_index_batch = TitleIndexBatch()
+        batch.title_ids.update(title_ids)
+        transaction.on_commit(batch)
+        return
+    batch.title_ids.update(title_ids)
+
+
+@receiver(post_delete, sender=Review)
+def decrease_title_rating(sender, instance, **kwargs):
+    """Уменьшает счетчики рейтинга при удалении отзыва."""
+    Title.update_rating(instance.title_id, -instance.score, -1)
+
+
+@receiver(post_save, sender=Title)
+def index_title(sender, instance, **kwargs):
+    """Обновляет запись поискового индекса для произведения."""
+    schedule_index([instance.pk])
+
+
+@receiver(titles_bulk_saved, sender=Title)
+def index_bulk_saved_titles(sender, title_ids, **kwargs):
+    """Обновляет индекс после пакетной записи произведений."""
+    schedule_index(title_ids)
+
+
+@receiver(post_delete, sender=Title)
+def unindex_title(sender, instance, **kwargs):
+    """Удаляет произведение из поискового индекса."""
+    get_search_backend().remove_titles([instance.pk])
+
+
+@receiver(m2m_changed, sender=Title.genre.through)
+def index_title_genres(sender, instance, action, reverse, pk_set, **kwargs):
+    """Обновляет индекс при изменении жанров произведения."""
+    if not reverse:
+        if action in ('post_add', 'post_remove', 'post_clear'):
+            schedule_index([instance.pk])
+    elif action == 'pre_clear':
+        instance._cleared_title_ids = list(
+            instance.titles.values_list('pk', flat=True)
+        )
+    elif action == 'post_clear':
+        schedule_index(instance._cleared_title_ids)
+    elif action in ('post_add', 'post_remove'):
+        schedule_index(pk_set)
+
+
+@receiver(post_save, sender=Genre)
+def index_genre_titles(sender, instance, created, **kwargs):
+    """Переиндексирует произведения при изменении названия жанра."""
+    if not created:
+        schedule_index(
+            list(instance.titles.values_list('pk', flat=True))
+        )
+
+
+@receiver(pre_delete, sender=Genre)
+def remember_deleted_genre_titles(sender, instance, **kwargs):
+    """Запоминает произведения удаляемого жанра."""
+    instance._deleted_title_ids = list(
+        instance.titles.values_list('pk', flat=True)
+    )
+
+
+@receiver(post_delete, sender=Genre)
+def index_deleted_genre_titles(sender, instance, **kwargs):
+    """Переиндексирует произведения после удаления жанра."""
+    schedule_index(instance._deleted_title_ids)
+
+
+@receiver(m2m_changed, sender=Title.genre.through)
+def touch_title_genres(sender, instance, action, reverse, pk_set, **kwargs):
+    """Обновляет дату изменения произведений при смене жанров."""
+    if action not in ('pre_clear', 'post_add', 'post_remove'):
+        return
+    if not reverse:
+        Title.touch(pk=instance.pk)
+    elif action == 'pre_clear':
+        Title.touch(genre=instance)
+    else:
+        Title.touch(pk__in=pk_set)
+
+
+@receiver(post_save, sender=Category)
+@receiver(pre_delete, sender=Category)
+def touch_category_titles(sender, instance, **kwargs):
+    """Обновляет дату изменения произведений категории."""
+    Title.touch(category=instance)
+
+
+@receiver(post_save, sender=Genre)
+@receiver(pre_delete, sender=Genre)
+def touch_genre_titles(sender, instance, **kwargs):
+    """Обновляет дату изменения произведений жанра."""
+    Title.touch(genre=instance)
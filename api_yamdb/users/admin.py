@@ -2,7 +2,7 @@ from django.contrib import admin
 from django.contrib.auth.admin import UserAdmin
 from django.utils.translation import gettext_lazy as _
 
-from users.models import User
+from users.models import EmailJob, User
 
 
 @admin.register(User)
@@ -61,3 +61,14 @@ class ExtendedUserAdmin(UserAdmin):
             )
         }),
     )
+
+
+@admin.register(EmailJob)
+class EmailJobAdmin(admin.ModelAdmin):
+    """Административный интерфейс для очереди писем."""
+
+    list_display = ('user', 'status', 'attempts', 'run_at', 'sent_at')
+    list_filter = ('status',)
+    list_select_related = ('user',)
+    raw_id_fields = ('user',)
+    readonly_fields = ('created', 'sent_at', 'last_error')
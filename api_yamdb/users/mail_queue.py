@@ -0,0 +1,116 @@
+import uuid
+from datetime import timedelta
+
+from django.conf import settings
+from django.core.mail import get_connection
+from django.db.models import F, Q
+from django.utils import timezone
+
+from users.models import EmailJob
+
+
+def enqueue_confirmation_email(user):
+    """
+    Ставит письмо с кодом подтверждения в очередь.
+
+    При EMAIL_QUEUE_EAGER письмо сразу отправляется тем же кодом,
+    что и у воркера.
+    """
+    job = EmailJob.objects.create(user=user)
+    if settings.EMAIL_QUEUE_EAGER:
+        deliver([job])
+    return job
+
+
+def get_retry_delay(attempts):
+    """Возвращает задержку перед следующей попыткой с ростом в 2 раза."""
+    delay = settings.EMAIL_QUEUE_RETRY_DELAY * 2 ** (attempts - 1)
+    return timedelta(seconds=min(delay, settings.EMAIL_QUEUE_MAX_RETRY_DELAY))
+
+
+def claim(batch_size):
+    """
+    Забирает из очереди до batch_size задач, готовых к отправке.
+
+    Задачи помечаются меткой воркера и арендуются на EMAIL_QUEUE_LEASE
+    секунд: если воркер упадет, после окончания аренды их заберет
+    другой. Метка позволяет нескольким воркерам не отправлять
+    одно письмо дважды.
+    """
+    now = timezone.now()
+    ready = EmailJob.objects.filter(
+        Q(status=EmailJob.Status.PENDING) | Q(status=EmailJob.Status.SENDING),
+        run_at__lte=now,
+    )
+    ids = list(ready.values_list('pk', flat=True)[:batch_size])
+    if not ids:
+        return []
+    token = uuid.uuid4().hex
+    ready.filter(pk__in=ids).update(
+        status=EmailJob.Status.SENDING,
+        claim=token,
+        run_at=now + timedelta(seconds=settings.EMAIL_QUEUE_LEASE),
+    )
+    return list(EmailJob.objects.filter(claim=token).select_related('user'))
+
+
+def deliver(jobs):
+    """
+    Отправляет письма задач через одно соединение с почтовым сервером.
+
+    Ошибка отправки одного письма не мешает остальным: задача
+    возвращается в очередь с экспоненциальной задержкой или, после
+    EMAIL_QUEUE_MAX_ATTEMPTS попыток, помечается ошибочной.
+    Возвращает пару (отправлено, ошибок).
+    """
+    sent, failed = [], []
+    connection = get_connection(fail_silently=False)
+    try:
+        connection.open()
+    except Exception as error:
+        failed = [(job, error) for job in jobs]
+    else:
+        try:
+            for job in jobs:
+                message = job.user.get_confirmation_email()
+                message.connection = connection
+                try:
+                    message.send()
+                except Exception as error:
+                    failed.append((job, error))
+                else:
+                    sent.append(job.pk)
+        finally:
+            connection.close()
+
+    now = timezone.now()
+    if sent:
+        EmailJob.objects.filter(pk__in=sent).update(
+            status=EmailJob.Status.SENT,
+            attempts=F('attempts') + 1,
+            claim='',
+            last_error='',
+            sent_at=now,
+        )
+    for job, error in failed:
+        job.attempts += 1
+        job.claim = ''
+        job.last_error = f'{type(error).__name__}: {error}'
+        if job.attempts >= settings.EMAIL_QUEUE_MAX_ATTEMPTS:
+            job.status = EmailJob.Status.FAILED
+        else:
+            job.status = EmailJob.Status.PENDING
+            job.run_at = now + get_retry_delay(job.attempts)
+    EmailJob.objects.bulk_update(
+        [job for job, _ in failed],
+        ('attempts', 'claim', 'last_error', 'status', 'run_at'),
+    )
+    return len(sent), len(failed)
+
+
+def process(batch_size):
+    """Отправляет одну пачку писем, возвращает (отправлено, ошибок)."""
+    jobs = claim(batch_size)
+    if not jobs:
+        return 0, 0
+    return deliver(jobs)
@@ -0,0 +1,47 @@
+import time
+
+from django.core.management.base import BaseCommand
+
+from users import mail_queue
+
+
+class Command(BaseCommand):
+    """
+    Воркер очереди писем с кодами подтверждения.
+
+    Забирает задачи пачками и отправляет каждую пачку через одно
+    соединение с почтовым сервером. Без --once работает, пока его
+    не остановят, и при пустой очереди ждет --interval секунд.
+    """
+
+    help = 'Send queued confirmation emails'
+
+    def add_arguments(self, parser):
+        parser.add_argument('--batch-size', type=int, default=50,
+                            help='Emails sent over one SMTP connection')
+        parser.add_argument('--interval', type=float, default=5,
+                            help='Seconds to wait when the queue is empty')
+        parser.add_argument('--once', action='store_true',
+                            help='Exit when no jobs are ready')
+
+    def handle(self, *args, **options):
+        """Основной метод обработки команды."""
+        total_sent = total_failed = 0
+        try:
+            while True:
+                sent, failed = mail_queue.process(options['batch_size'])
+                total_sent += sent
+                total_failed += failed
+                if sent or failed:
+                    self.stdout.write(
+                        f'Отправлено: {sent}, ошибок: {failed}'
+                    )
+                    continue
+                if options['once']:
+                    break
+                time.sleep(options['interval'])
+        except KeyboardInterrupt:
+            pass
+        self.stdout.write(self.style.SUCCESS(
+            f'Всего отправлено: {total_sent}, ошибок: {total_failed}'
+        ))
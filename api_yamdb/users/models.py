@@ -2,8 +2,9 @@ from django.conf import settings
 from django.contrib.auth.models import AbstractUser
 from django.contrib.auth.tokens import default_token_generator
 from django.core.exceptions import ValidationError
-from django.core.mail import send_mail
+from django.core.mail import EmailMessage
 from django.db import models
+from django.utils import timezone
 
 from constants import FORBIDDEN_NAMES, MAX_USERNAME_LENGTH
 
@@ -32,6 +33,7 @@ class User(AbstractUser):
             имеет роль модератора.
 
     Методы:
+        get_confirmation_email(): Возвращает письмо с кодом подтверждения.
         send_confirmation_email(): Отправляет email с кодом подтверждения
             на адрес пользователя.
     """
@@ -79,18 +81,88 @@ class User(AbstractUser):
         """Проверяет, является ли пользователь модератором."""
         return self.role == self.Role.MODERATOR
 
-    def send_confirmation_email(self):
+    def get_confirmation_email(self):
         """
-        Генерирует письмо с кодом подтверждения и отправляет его
-        на email пользователя.
+        Генерирует письмо с кодом подтверждения на email пользователя.
+
+        Код создается в момент вызова, поэтому письма из очереди не
+        хранят его в базе.
         """
         subject = 'Код подтверждения для YaMDb'
         confirmation_code = default_token_generator.make_token(self)
         message = f'Ваш код подтверждения: {confirmation_code}'
-        send_mail(
+        return EmailMessage(
             subject,
             message,
             settings.DEFAULT_FROM_EMAIL,
             [self.email],
-            fail_silently=False
         )
+
+    def send_confirmation_email(self):
+        """
+        Генерирует письмо с кодом подтверждения и отправляет его
+        на email пользователя.
+        """
+        self.get_confirmation_email().send(fail_silently=False)
+
+
+class EmailJob(models.Model):
+    """
+    Задача очереди на отправку письма с кодом подтверждения.
+
+    Атрибуты:
+        user (ForeignKey): Получатель письма.
+        status (CharField): Состояние задачи.
+        attempts (PositiveSmallIntegerField): Число попыток отправки.
+        run_at (DateTimeField): Время следующей попытки; для задачи,
+            которую обрабатывает воркер, - время окончания аренды.
+        claim (CharField): Метка воркера, взявшего задачу.
+        last_error (TextField): Текст последней ошибки отправки.
+        created (DateTimeField): Дата постановки в очередь.
+        sent_at (DateTimeField): Дата успешной отправки.
+    """
+
+    class Status(models.TextChoices):
+        """Состояния задачи."""
+
+        PENDING = 'pending', 'Ожидает отправки'
+        SENDING = 'sending', 'Отправляется'
+        SENT = 'sent', 'Отправлено'
+        FAILED = 'failed', 'Ошибка'
+
+    user = models.ForeignKey(
+        User,
+        on_delete=models.CASCADE,
+        related_name='email_jobs',
+        verbose_name='Получатель',
+    )
+    status = models.CharField(
+        max_length=max(len(status) for status in Status.values),
+        choices=Status.choices,
+        default=Status.PENDING,
+        verbose_name='Состояние',
+    )
+    attempts = models.PositiveSmallIntegerField(
+        default=0, verbose_name='Попытки',
+    )
+    run_at = models.DateTimeField(
+        default=timezone.now, verbose_name='Следующая попытка',
+    )
+    claim = models.CharField(max_length=32, blank=True,
+                             verbose_name='Метка воркера',)
+    last_error = models.TextField(blank=True, verbose_name='Ошибка',)
+    created = models.DateTimeField(auto_now_add=True,
+                                   verbose_name='Дата создания',)
+    sent_at = models.DateTimeField(null=True, blank=True,
+                                   verbose_name='Дата отправки',)
+
+    class Meta:
+        verbose_name = 'письмо в очереди'
+        verbose_name_plural = 'Очередь писем'
+        ordering = ['run_at']
+        indexes = [
+            models.Index(fields=['status', 'run_at']),
+        ]
+
+    def __str__(self):
+        return f'{self.user_id}: {self.get_status_display()}'
@@ -1,6 +1,7 @@
 import os
 import sys
 
+import pytest
 from django.utils.version import get_version
 
 BASE_DIR = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
@@ -31,5 +32,41 @@ if FILENAME not in project_dir_content:
 assert get_version() < '4.0.0', 'Пожалуйста, используйте версию Django < 4.0.0'
 
 pytest_plugins = [
+    'api.pytest_plugin',
     'tests.fixtures.fixture_user',
 ]
+
+
+@pytest.fixture(autouse=True)
+def clear_cache():
+    from django.core.cache import cache
+
+    yield
+    cache.clear()
+
+
+@pytest.fixture(autouse=True)
+def email_queue_eager(settings):
+    """
+    Отправляет письма из очереди сразу при постановке.
+
+    Так тесты видят письма в mail.outbox без запуска воркера; очередь
+    проверяется отдельно в test_22_email_queue.
+    """
+    settings.EMAIL_QUEUE_EAGER = True
+
+
+@pytest.fixture(scope='session')
+def django_db_modify_db_settings():
+    """
+    Хранит тестовую базу SQLite в файле, а не в общей памяти.
+
+    База в памяти с общим кэшем блокирует таблицы целиком и не ждет
+    освобождения блокировки, из-за чего тесты с параллельными запросами
+    падают с ошибкой `database table is locked`.
+    """
+    from django.db import connections
+
+    test_settings = connections['default'].settings_dict['TEST']
+    if not test_settings.get('NAME'):
+        test_settings['NAME'] = os.path.join(BASE_DIR, 'test_db.sqlite3')
@@ -0,0 +1,80 @@
+from http import HTTPStatus
+
+import pytest
+from django.core.management import call_command
+
+from tests.utils import create_single_review, create_titles
+
+
+@pytest.mark.django_db(transaction=True)
+class Test08TitleRating:
+
+    TITLE_DETAIL_URL_TEMPLATE = '/api/v1/titles/{title_id}/'
+    REVIEW_DETAIL_URL_TEMPLATE = (
+        '/api/v1/titles/{title_id}/reviews/{review_id}/'
+    )
+
+    def test_01_rating_follows_review_changes(self, admin_client,
+                                              user_client,
+                                              moderator_client):
+        from reviews.models import Title
+
+        titles, _, _ = create_titles(admin_client)
+        title_id = titles[0]['id']
+        title_url = self.TITLE_DETAIL_URL_TEMPLATE.format(title_id=title_id)
+
+        review_id = create_single_review(
+            user_client, title_id, 'Текст', 2
+        ).json()['id']
+        create_single_review(moderator_client, title_id, 'Текст', 8)
+        title = Title.objects.get(id=title_id)
+        assert (title.rating_sum, title.review_count) == (10, 2), (
+            'Проверьте, что при создании отзыва обновляются сохраненные '
+            'счетчики рейтинга произведения.'
+        )
+        assert admin_client.get(title_url).json()['rating'] == 5
+
+        response = user_client.patch(
+            self.REVIEW_DETAIL_URL_TEMPLATE.format(
+                title_id=title_id, review_id=review_id
+            ),
+            data={'score': 6}
+        )
+        assert response.status_code == HTTPStatus.OK
+        assert admin_client.get(title_url).json()['rating'] == 7, (
+            'Проверьте, что при изменении оценки отзыва пересчитывается '
+            'рейтинг произведения.'
+        )
+
+        response = user_client.delete(
+            self.REVIEW_DETAIL_URL_TEMPLATE.format(
+                title_id=title_id, review_id=review_id
+            )
+        )
+        assert response.status_code == HTTPStatus.NO_CONTENT
+        title.refresh_from_db()
+        assert (title.rating_sum, title.review_count) == (8, 1), (
+            'Проверьте, что при удалении отзыва уменьшаются сохраненные '
+            'счетчики рейтинга произведения.'
+        )
+
+    def test_02_rebuild_title_ratings(self, admin_client, user_client):
+        from reviews.models import Title
+
+        titles, _, _ = create_titles(admin_client)
+        title_id = titles[0]['id']
+        create_single_review(user_client, title_id, 'Текст', 9)
+        Title.objects.filter(id=title_id).update(rating_sum=0, review_count=0)
+        modified = Title.objects.get(id=title_id).modified
+
+        call_command('rebuild_title_ratings')
+
+        title = Title.objects.get(id=title_id)
+        assert (title.rating_sum, title.review_count) == (9, 1), (
+            'Проверьте, что команда `rebuild_title_ratings` пересчитывает '
+            'рейтинг произведений по отзывам.'
+        )
+        assert title.modified > modified, (
+            'Проверьте, что команда `rebuild_title_ratings` обновляет дату '
+            'изменения пересчитанных произведений.'
+        )
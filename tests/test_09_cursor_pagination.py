@@ -0,0 +1,71 @@
+from http import HTTPStatus
+
+import pytest
+
+from tests.utils import create_comments, create_reviews
+
+
+@pytest.mark.django_db(transaction=True)
+class Test09CursorPagination:
+
+    REVIEWS_URL_TEMPLATE = '/api/v1/titles/{title_id}/reviews/'
+    COMMENTS_URL_TEMPLATE = (
+        '/api/v1/titles/{title_id}/reviews/{review_id}/comments/'
+    )
+
+    def collect_pages(self, client, url):
+        ids = []
+        while url:
+            response = client.get(url)
+            assert response.status_code == HTTPStatus.OK
+            data = response.json()
+            assert 'count' not in data, (
+                'Проверьте, что в курсорном режиме пагинации не выполняется '
+                'подсчет количества объектов.'
+            )
+            ids.extend(item['id'] for item in data['results'])
+            url = data['next']
+        return ids
+
+    def test_01_reviews_cursor_pages(self, client, admin_client, admin,
+                                     user_client, user, moderator_client,
+                                     moderator):
+        author_map = {
+            admin: admin_client,
+            user: user_client,
+            moderator: moderator_client
+        }
+        reviews, titles = create_reviews(admin_client, author_map)
+        url = self.REVIEWS_URL_TEMPLATE.format(title_id=titles[0]['id'])
+
+        ids = self.collect_pages(client, f'{url}?pagination=cursor&limit=2')
+        assert ids == [review['id'] for review in reversed(reviews)], (
+            f'Проверьте, что курсорная пагинация `{url}` возвращает все '
+            'отзывы от новых к старым без повторов.'
+        )
+
+        data = client.get(f'{url}?limit=2&offset=1').json()
+        assert data['count'] == len(reviews), (
+            f'Проверьте, что для `{url}` по-прежнему работает пагинация '
+            'limit/offset.'
+        )
+        assert len(data['results']) == 2
+
+    def test_02_comments_cursor_pages(self, client, admin_client, admin,
+                                      user_client, user, moderator_client,
+                                      moderator):
+        author_map = {
+            admin: admin_client,
+            user: user_client,
+            moderator: moderator_client
+        }
+        comments, reviews, titles = create_comments(admin_client, author_map)
+        url = self.COMMENTS_URL_TEMPLATE.format(
+            title_id=titles[0]['id'], review_id=reviews[0]['id']
+        )
+
+        ids = self.collect_pages(client, f'{url}?pagination=cursor&limit=1')
+        assert sorted(ids) == sorted(comment['id'] for comment in comments), (
+            f'Проверьте, что курсорная пагинация `{url}` возвращает все '
+            'комментарии без повторов.'
+        )
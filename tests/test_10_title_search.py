@@ -0,0 +1,62 @@
+from http import HTTPStatus
+
+import pytest
+
+from tests.utils import create_titles
+
+
+@pytest.mark.django_db(transaction=True)
+class Test10TitleSearch:
+
+    TITLES_URL = '/api/v1/titles/'
+
+    def get_names(self, client, query):
+        response = client.get(f'{self.TITLES_URL}?{query}')
+        assert response.status_code == HTTPStatus.OK
+        return [title['name'] for title in response.json()['results']]
+
+    def test_01_search_by_name_description_and_genre(self, client,
+                                                     admin_client):
+        titles, _, genres = create_titles(admin_client)
+
+        assert self.get_names(client, 'search=ТЕРМИН') == [titles[0]['name']], (
+            'Проверьте, что поиск по `search` находит произведение по части '
+            'названия без учета регистра.'
+        )
+        assert self.get_names(client, 'search=Yippie') == [titles[1]['name']], (
+            'Проверьте, что поиск по `search` учитывает описание '
+            'произведения.'
+        )
+        assert self.get_names(client, 'search=Комедия') == [
+            titles[0]['name']
+        ], (
+            'Проверьте, что поиск по `search` учитывает названия жанров и не '
+            'дублирует произведения.'
+        )
+        assert self.get_names(client, 'name=орешек') == [titles[1]['name']], (
+            'Проверьте, что фильтр `name` ищет по подстроке названия.'
+        )
+
+    def test_02_index_follows_genre_changes(self, client, admin_client):
+        from reviews.models import Genre
+
+        titles, _, genres = create_titles(admin_client)
+        genre = Genre.objects.get(slug=genres[2]['slug'])
+        genre.name = 'Боевик'
+        genre.save()
+
+        assert self.get_names(client, 'search=боевик') == [
+            titles[1]['name']
+        ], (
+            'Проверьте, что поисковый индекс обновляется при изменении '
+            'названия жанра.'
+        )
+
+        admin_client.patch(
+            f'{self.TITLES_URL}{titles[1]["id"]}/',
+            data={'genre': [genres[0]['slug']]}
+        )
+        assert self.get_names(client, 'search=боевик') == [], (
+            'Проверьте, что поисковый индекс обновляется при изменении '
+            'жанров произведения.'
+        )
@@ -0,0 +1,98 @@
+from http import HTTPStatus
+
+import pytest
+
+from tests.utils import create_single_review, create_titles
+
+
+@pytest.mark.django_db(transaction=True)
+class Test11ResponseCache:
+
+    TITLES_URL = '/api/v1/titles/'
+    GENRES_URL = '/api/v1/genres/'
+    REVIEWS_URL_TEMPLATE = '/api/v1/titles/{title_id}/reviews/'
+
+    def test_01_anonymous_list_is_cached(self, client, admin_client,
+                                         django_assert_max_num_queries):
+        from api.cache import get_stats
+
+        create_titles(admin_client)
+        first = client.get(f'{self.TITLES_URL}?offset=0&limit=5')
+        assert first['X-Cache'] == 'MISS'
+
+        # Валидаторы ETag сохраняются в кэше вместе с ответом.
+        with django_assert_max_num_queries(0):
+            second = client.get(f'{self.TITLES_URL}?limit=5&offset=0')
+        assert second['X-Cache'] == 'HIT', (
+            'Проверьте, что повторный анонимный GET-запрос с теми же '
+            'параметрами в другом порядке обслуживается из кэша.'
+        )
+        assert second.json() == first.json()
+        assert get_stats()['hit'] >= 1
+
+        response = admin_client.get(self.TITLES_URL)
+        assert not response.has_header('X-Cache'), (
+            'Проверьте, что ответы авторизованным пользователям не кэшируются.'
+        )
+
+    def test_02_changes_invalidate_cache(self, client, admin_client,
+                                         user_client):
+        titles, _, genres = create_titles(admin_client)
+        title_id = titles[0]['id']
+        reviews_url = self.REVIEWS_URL_TEMPLATE.format(title_id=title_id)
+        title_url = f'{self.TITLES_URL}{title_id}/'
+
+        assert client.get(reviews_url).json()['count'] == 0
+        assert client.get(title_url).json()['rating'] is None
+        create_single_review(user_client, title_id, 'Текст', 6)
+        assert client.get(reviews_url).json()['count'] == 1, (
+            'Проверьте, что создание отзыва сбрасывает кэш списка отзывов.'
+        )
+        assert client.get(title_url).json()['rating'] == 6, (
+            'Проверьте, что создание отзыва сбрасывает кэш произведения.'
+        )
+
+        client.get(self.GENRES_URL)
+        response = admin_client.delete(f'{self.GENRES_URL}{genres[0]["slug"]}/')
+        assert response.status_code == HTTPStatus.NO_CONTENT
+        response = client.get(self.GENRES_URL)
+        assert response['X-Cache'] == 'MISS'
+        assert response.json()['count'] == len(genres) - 1, (
+            'Проверьте, что удаление жанра сбрасывает кэш списка жанров.'
+        )
+
+    def test_03_invalidation_after_commit(self, client, admin_client, user):
+        from django.db import transaction
+
+        from reviews.models import Review
+
+        titles, _, _ = create_titles(admin_client)
+        title_id = titles[0]['id']
+        reviews_url = self.REVIEWS_URL_TEMPLATE.format(title_id=title_id)
+        assert client.get(reviews_url).json()['count'] == 0
+
+        with pytest.raises(RuntimeError):
+            with transaction.atomic():
+                Review.objects.create(
+                    title_id=title_id, author=user, text='Текст', score=5
+                )
+                response = client.get(reviews_url)
+                assert response['X-Cache'] == 'HIT', (
+                    'Проверьте, что кэш сбрасывается только после '
+                    'фиксации транзакции.'
+                )
+                raise RuntimeError
+        response = client.get(reviews_url)
+        assert response.json()['count'] == 0, (
+            'Проверьте, что незафиксированные данные не попадают в кэш.'
+        )
+
+        with transaction.atomic():
+            Review.objects.create(
+                title_id=title_id, author=user, text='Текст', score=5
+            )
+        response = client.get(reviews_url)
+        assert response['X-Cache'] == 'MISS'
+        assert response.json()['count'] == 1, (
+            'Проверьте, что фиксация транзакции сбрасывает кэш.'
+        )
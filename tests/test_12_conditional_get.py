@@ -0,0 +1,138 @@
+from http import HTTPStatus
+
+import pytest
+from django.db import connection
+from django.test.utils import CaptureQueriesContext
+
+from tests.utils import create_single_review, create_titles
+
+
+@pytest.mark.django_db(transaction=True)
+class Test12ConditionalGet:
+
+    TITLE_DETAIL_URL_TEMPLATE = '/api/v1/titles/{title_id}/'
+    REVIEWS_URL_TEMPLATE = '/api/v1/titles/{title_id}/reviews/'
+
+    def test_01_title_not_modified(self, admin_client, user_client,
+                                   django_assert_max_num_queries):
+        titles, _, _ = create_titles(admin_client)
+        url = self.TITLE_DETAIL_URL_TEMPLATE.format(title_id=titles[0]['id'])
+
+        response = user_client.get(url, HTTP_IF_NONE_MATCH='"stale"')
+        etag = response['ETag']
+        assert etag and response.has_header('Last-Modified'), (
+            f'Проверьте, что ответ на условный GET-запрос к `{url}` '
+            'содержит заголовки ETag и Last-Modified.'
+        )
+        with django_assert_max_num_queries(2):
+            response = user_client.get(url, HTTP_IF_NONE_MATCH=etag)
+        assert response.status_code == HTTPStatus.NOT_MODIFIED, (
+            'Проверьте, что при совпадении If-None-Match возвращается 304.'
+        )
+
+        create_single_review(user_client, titles[0]['id'], 'Текст', 3)
+        response = user_client.get(url, HTTP_IF_NONE_MATCH=etag)
+        assert response.status_code == HTTPStatus.OK, (
+            'Проверьте, что ETag произведения меняется при изменении '
+            'рейтинга.'
+        )
+        assert response['ETag'] != etag
+
+        etag = response['ETag']
+        admin_client.patch(url, data={'genre': [titles[1]['genre'][0]]})
+        response = user_client.get(url, HTTP_IF_NONE_MATCH=etag)
+        assert response.status_code == HTTPStatus.OK, (
+            'Проверьте, что ETag произведения меняется при изменении жанров.'
+        )
+
+    def test_02_review_list_not_modified(self, admin_client, user_client):
+        titles, _, _ = create_titles(admin_client)
+        review = create_single_review(
+            user_client, titles[0]['id'], 'Текст', 3
+        ).json()
+        url = self.REVIEWS_URL_TEMPLATE.format(title_id=titles[0]['id'])
+
+        etag = user_client.get(url, HTTP_IF_NONE_MATCH='"stale"')['ETag']
+        response = user_client.get(url, HTTP_IF_NONE_MATCH=etag)
+        assert response.status_code == HTTPStatus.NOT_MODIFIED
+
+        user_client.patch(f'{url}{review["id"]}/', data={'text': 'Новый'})
+        response = user_client.get(url, HTTP_IF_NONE_MATCH=etag)
+        assert response.status_code == HTTPStatus.OK, (
+            'Проверьте, что ETag списка отзывов меняется при изменении '
+            'отзыва.'
+        )
+
+        etag = response['ETag']
+        user_client.delete(f'{url}{review["id"]}/')
+        response = user_client.get(url, HTTP_IF_NONE_MATCH=etag)
+        assert response.status_code != HTTPStatus.NOT_MODIFIED, (
+            'Проверьте, что ETag списка отзывов меняется при удалении '
+            'отзыва.'
+        )
+
+    def test_03_invalid_lookup_not_found(self, admin_client, client):
+        titles, _, _ = create_titles(admin_client)
+        reviews_url = self.REVIEWS_URL_TEMPLATE.format(
+            title_id=titles[0]['id']
+        )
+        for url in (
+            self.TITLE_DETAIL_URL_TEMPLATE.format(title_id='abc'),
+            f'{reviews_url}abc/',
+        ):
+            for headers in ({}, {'HTTP_IF_NONE_MATCH': '"etag"'}):
+                response = client.get(url, **headers)
+                assert response.status_code == HTTPStatus.NOT_FOUND, (
+                    f'Проверьте, что GET-запрос к `{url}` с нечисловым id '
+                    'возвращает 404.'
+                )
+
+    def test_04_cached_response_keeps_validators(
+            self, admin_client, client, django_assert_num_queries):
+        titles, _, _ = create_titles(admin_client)
+        url = self.TITLE_DETAIL_URL_TEMPLATE.format(title_id=titles[0]['id'])
+
+        first = client.get(url)
+        assert first['X-Cache'] == 'MISS'
+        with django_assert_num_queries(0):
+            second = client.get(url)
+        assert second['X-Cache'] == 'HIT', (
+            'Проверьте, что ответ из кэша не вычисляет валидаторы заново.'
+        )
+        assert second['ETag'] == first['ETag']
+        assert second['Last-Modified'] == first['Last-Modified']
+
+        response = client.get(url, HTTP_IF_NONE_MATCH=first['ETag'])
+        assert response.status_code == HTTPStatus.NOT_MODIFIED
+
+    def test_05_validators_only_when_needed(self, admin_client, user_client):
+        titles, _, _ = create_titles(admin_client)
+        create_single_review(user_client, titles[0]['id'], 'Текст', 3)
+        url = self.REVIEWS_URL_TEMPLATE.format(title_id=titles[0]['id'])
+
+        for params in ({'count': 'false'}, {'pagination': 'cursor'}):
+            with CaptureQueriesContext(connection) as queries:
+                response = user_client.get(url, params)
+            assert response.status_code == HTTPStatus.OK
+            assert not response.has_header('ETag')
+            assert not any(
+                'MAX(' in query['sql'] or 'COUNT(' in query['sql']
+                for query in queries
+            ), (
+                'Проверьте, что без условных заголовков и без сохранения в '
+                f'кэш валидаторы не вычисляются: {params}'
+            )
+
+            response = user_client.get(
+                url, params, HTTP_IF_NONE_MATCH='"stale"'
+            )
+            etag = response['ETag']
+            with CaptureQueriesContext(connection) as queries:
+                response = user_client.get(
+                    url, params, HTTP_IF_NONE_MATCH=etag
+                )
+            assert response.status_code == HTTPStatus.NOT_MODIFIED
+            assert not any('COUNT(' in query['sql'] for query in queries), (
+                'Проверьте, что ETag вычисляется без COUNT(*): '
+                f'{params}'
+            )
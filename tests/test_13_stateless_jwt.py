@@ -0,0 +1,69 @@
+from http import HTTPStatus
+
+import pytest
+from rest_framework.test import APIClient
+
+
+@pytest.mark.django_db(transaction=True)
+class Test13StatelessJWT:
+
+    TOKEN_URL = '/api/v1/auth/token/'
+    USERS_URL = '/api/v1/users/'
+
+    def get_client(self, user):
+        from django.contrib.auth.tokens import default_token_generator
+
+        response = APIClient().post(self.TOKEN_URL, data={
+            'username': user.username,
+            'confirmation_code': default_token_generator.make_token(user),
+        })
+        assert response.status_code == HTTPStatus.OK
+        client = APIClient()
+        client.credentials(
+            HTTP_AUTHORIZATION=f'Bearer {response.json()["token"]}'
+        )
+        return client
+
+    def test_01_token_user_without_user_query(self, admin,
+                                              django_assert_num_queries):
+        client = self.get_client(admin)
+        client.get(self.USERS_URL)
+
+        # Список пользователей и подсчет количества, без загрузки admin.
+        with django_assert_num_queries(2):
+            response = client.get(self.USERS_URL)
+        assert response.status_code == HTTPStatus.OK, (
+            'Проверьте, что токен с ролью аутентифицирует пользователя без '
+            'запроса к таблице пользователей.'
+        )
+
+    def test_02_demoted_admin_loses_access(self, admin):
+        client = self.get_client(admin)
+        assert client.get(self.USERS_URL).status_code == HTTPStatus.OK
+
+        admin.role = 'user'
+        admin.save()
+        response = client.get(self.USERS_URL)
+        assert response.status_code == HTTPStatus.UNAUTHORIZED, (
+            'Проверьте, что после смены роли старый токен перестает '
+            'действовать.'
+        )
+
+    def test_03_token_user_writes_review(self, admin_client, user):
+        from tests.utils import create_single_review, create_titles
+
+        titles, _, _ = create_titles(admin_client)
+        client = self.get_client(user)
+        response = create_single_review(client, titles[0]['id'], 'Текст', 5)
+        assert response.json()['author'] == user.username
+        response = client.patch(
+            f'/api/v1/titles/{titles[0]["id"]}/reviews/'
+            f'{response.json()["id"]}/',
+            data={'text': 'Новый текст'}
+        )
+        assert response.status_code == HTTPStatus.OK, (
+            'Проверьте, что автор может изменять свой отзыв с токеном без '
+            'загрузки пользователя.'
+        )
+        response = client.get(f'{self.USERS_URL}me/')
+        assert response.json()['username'] == user.username
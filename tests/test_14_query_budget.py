@@ -0,0 +1,61 @@
+from http import HTTPStatus
+
+import pytest
+
+from tests.utils import create_single_review, create_titles
+
+# Бюджет запросов к базе для вложенных эндпоинтов отзывов и комментариев.
+# Учитывается загрузка пользователя по токену из фикстур, а также
+# BEGIN транзакции при сохранении отзыва и пересчете рейтинга.
+QUERY_BUDGET = {
+    'review-create': 6,
+    'review-list': 5,
+    'comment-create': 4,
+    'comment-list': 5,
+}
+
+
+@pytest.mark.django_db(transaction=True)
+class Test14QueryBudget:
+
+    REVIEWS_URL_TEMPLATE = '/api/v1/titles/{title_id}/reviews/'
+    COMMENTS_URL_TEMPLATE = (
+        '/api/v1/titles/{title_id}/reviews/{review_id}/comments/'
+    )
+
+    def test_01_nested_endpoints_query_budget(self, admin_client,
+                                              user_client,
+                                              django_assert_max_num_queries):
+        titles, _, _ = create_titles(admin_client)
+        title_id = titles[0]['id']
+        reviews_url = self.REVIEWS_URL_TEMPLATE.format(title_id=title_id)
+
+        with django_assert_max_num_queries(QUERY_BUDGET['review-create']):
+            review = create_single_review(
+                user_client, title_id, 'Текст', 5
+            ).json()
+        with django_assert_max_num_queries(QUERY_BUDGET['review-list']):
+            user_client.get(reviews_url)
+
+        comments_url = self.COMMENTS_URL_TEMPLATE.format(
+            title_id=title_id, review_id=review['id']
+        )
+        with django_assert_max_num_queries(QUERY_BUDGET['comment-create']):
+            response = user_client.post(comments_url, data={'text': 'Текст'})
+        assert response.status_code == HTTPStatus.CREATED
+        with django_assert_max_num_queries(QUERY_BUDGET['comment-list']):
+            user_client.get(comments_url)
+
+    def test_02_comment_requires_matching_title(self, admin_client,
+                                                user_client):
+        titles, _, _ = create_titles(admin_client)
+        review = create_single_review(
+            user_client, titles[0]['id'], 'Текст', 5
+        ).json()
+        url = self.COMMENTS_URL_TEMPLATE.format(
+            title_id=titles[1]['id'], review_id=review['id']
+        )
+        assert user_client.get(url).status_code == HTTPStatus.NOT_FOUND, (
+            'Проверьте, что комментарии доступны только для отзыва, '
+            'относящегося к произведению из адреса.'
+        )
@@ -0,0 +1,70 @@
+import threading
+from http import HTTPStatus
+
+import pytest
+from django.db import connection
+from rest_framework.test import APIClient
+
+from tests.utils import create_titles
+
+
+@pytest.mark.django_db(transaction=True)
+class Test15ConcurrentReview:
+
+    REVIEWS_URL_TEMPLATE = '/api/v1/titles/{title_id}/reviews/'
+    THREADS = 4
+
+    def test_01_parallel_posts_create_one_review(self, admin_client, user,
+                                                 token_user):
+        from reviews.models import Review, Title
+
+        titles, _, _ = create_titles(admin_client)
+        url = self.REVIEWS_URL_TEMPLATE.format(title_id=titles[0]['id'])
+        barrier = threading.Barrier(self.THREADS)
+        statuses = []
+
+        def post_review():
+            client = APIClient()
+            client.credentials(
+                HTTP_AUTHORIZATION=f'Bearer {token_user["access"]}'
+            )
+            try:
+                barrier.wait()
+                response = client.post(url, data={'text': 'Текст', 'score': 5})
+                statuses.append(response.status_code)
+            finally:
+                connection.close()
+
+        threads = [
+            threading.Thread(target=post_review) for _ in range(self.THREADS)
+        ]
+        for thread in threads:
+            thread.start()
+        for thread in threads:
+            thread.join()
+
+        assert sorted(statuses) == (
+            [HTTPStatus.CREATED] + [HTTPStatus.BAD_REQUEST] * (self.THREADS - 1)
+        ), (
+            'Проверьте, что при одновременных POST-запросах одного '
+            'пользователя создается один отзыв, а остальные запросы '
+            'получают ответ со статусом 400.'
+        )
+        assert Review.objects.filter(author=user).count() == 1
+        assert Title.objects.get(id=titles[0]['id']).review_count == 1, (
+            'Проверьте, что отклоненные запросы не меняют рейтинг '
+            'произведения.'
+        )
+
+    def test_02_other_integrity_errors_not_masked(self, admin_client):
+        from django.db import IntegrityError
+
+        from api.serializers import ReviewSerializer
+        from reviews.models import Title
+
+        titles, _, _ = create_titles(admin_client)
+        title = Title.objects.get(id=titles[0]['id'])
+        with pytest.raises(IntegrityError):
+            ReviewSerializer().create({
+                'title': title, 'author_id': 0, 'text': 'Текст', 'score': 5,
+            })
@@ -0,0 +1,35 @@
+import json
+
+import pytest
+from django.core.management import call_command
+
+
+@pytest.mark.django_db(transaction=True)
+class Test16Benchmark:
+
+    def test_01_generate_load_and_benchmark(self, tmp_path):
+        from reviews.models import Comment, Review, Title
+
+        data_path = tmp_path / 'data'
+        call_command(
+            'generate_dataset', str(data_path), '--titles', '5',
+            '--users', '4', '--reviews-per-title', '2',
+            '--comments-per-review', '1', '--genres', '3',
+        )
+        call_command('load_csv_data', '--bulk', '--data-path', str(data_path))
+        assert Title.objects.count() == 5
+        assert Review.objects.count() == 10
+        assert Comment.objects.count() == 10
+
+        output = tmp_path / 'result.json'
+        call_command(
+            'benchmark_api', '--requests', '4', '--warmup', '0',
+            '--concurrency', '1', '--output', str(output),
+            '--endpoints', 'TitleViewSet.list', 'CommentViewSet.list',
+        )
+        with open(output, encoding='utf-8') as file:
+            report = json.load(file)
+        result = report['endpoints']['TitleViewSet.list']
+        assert result['requests'] == 4 and result['errors'] == 0
+        assert set(result['latency_ms']) == {'p50', 'p95', 'p99', 'mean'}
+        assert result['queries_per_request'] > 0
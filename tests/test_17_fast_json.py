@@ -0,0 +1,82 @@
+import datetime
+import decimal
+from io import BytesIO
+
+import pytest
+from django.utils.translation import gettext_lazy
+from rest_framework.parsers import JSONParser
+from rest_framework.renderers import JSONRenderer
+
+from api.parsers import FastJSONParser
+from api.renderers import FastJSONRenderer
+
+
+class Test17FastJSON:
+
+    DATA = {
+        'name': 'Произведение\u2028с переносом\u2029',
+        'description': None,
+        'rating': decimal.Decimal('7.50'),
+        'pub_date': datetime.datetime(2021, 1, 1, 12, 30, 15, 123456),
+        'label': gettext_lazy('Название'),
+        'scores': {1: 10, 2: 9},
+        'genre': [{'name': 'Жанр', 'slug': 'genre'}],
+    }
+
+    def test_01_render_matches_drf(self):
+        assert FastJSONRenderer().render(self.DATA) == (
+            JSONRenderer().render(self.DATA)
+        ), (
+            'Проверьте, что FastJSONRenderer выводит те же байты, '
+            'что и JSONRenderer.'
+        )
+        assert FastJSONRenderer().render(None) == b'', (
+            'Проверьте, что FastJSONRenderer возвращает пустой ответ для None.'
+        )
+
+    def test_02_render_with_indent(self):
+        context = {'indent': 2}
+        assert FastJSONRenderer().render(
+            self.DATA, 'application/json', context
+        ) == JSONRenderer().render(self.DATA, 'application/json', context), (
+            'Проверьте, что при запросе отступов используется '
+            'стандартный вывод JSONRenderer.'
+        )
+
+    def test_03_parse_matches_drf(self):
+        from rest_framework.exceptions import ParseError
+
+        content = JSONRenderer().render({
+            'name': 'Произведение', 'year': 2000, 'genre': ['a', 'b'],
+        })
+        assert FastJSONParser().parse(BytesIO(content)) == (
+            JSONParser().parse(BytesIO(content))
+        ), 'Проверьте, что FastJSONParser разбирает JSON как JSONParser.'
+        with pytest.raises(ParseError):
+            FastJSONParser().parse(BytesIO(b'{"name": '))
+
+
+@pytest.mark.django_db(transaction=True)
+class Test17FastJSONAPI:
+
+    def test_01_api_accepts_and_renders_json(self, admin_client):
+        response = admin_client.post(
+            '/api/v1/categories/',
+            data='{"name": "Фильм", "slug": "films"}',
+            content_type='application/json',
+        )
+        assert response.status_code == 201, (
+            'Проверьте, что API принимает JSON в теле запроса.'
+        )
+        assert response['Content-Type'] == 'application/json', (
+            'Проверьте, что API отвечает в формате JSON.'
+        )
+        assert response.json() == {'name': 'Фильм', 'slug': 'films'}
+
+        response = admin_client.post(
+            '/api/v1/categories/', data='{"name": ',
+            content_type='application/json',
+        )
+        assert response.status_code == 400, (
+            'Проверьте, что некорректный JSON возвращает статус 400.'
+        )
@@ -0,0 +1,63 @@
+from http import HTTPStatus
+
+import pytest
+from django.test import override_settings
+
+from tests.utils import create_single_review, create_titles
+
+
+@pytest.mark.django_db(transaction=True)
+class Test18LeanTitleRead:
+
+    TITLES_URL = '/api/v1/titles/'
+
+    def get_both(self, client, url):
+        responses = []
+        for ratio in (0, 1):
+            with override_settings(
+                TITLE_LEAN_READ_RATIO=ratio,
+                API_RESPONSE_CACHE_ENABLED=False,
+            ):
+                response = client.get(url)
+            assert response.status_code == HTTPStatus.OK
+            responses.append(response.content)
+        return responses
+
+    def test_01_same_json_as_model_serializer(self, client, admin_client,
+                                              user_client, moderator_client):
+        from reviews.models import Title
+
+        titles, _, _ = create_titles(admin_client)
+        create_single_review(user_client, titles[0]['id'], 'Текст', 3)
+        create_single_review(moderator_client, titles[0]['id'], 'Текст', 8)
+        Title.objects.create(name='Без категории', year=2000)
+
+        for url in (
+            self.TITLES_URL,
+            f'{self.TITLES_URL}?ordering=-year',
+            f'{self.TITLES_URL}?search=Терминатор',
+            f'{self.TITLES_URL}?genre={titles[0]["genre"][1]}',
+            f'{self.TITLES_URL}{titles[0]["id"]}/',
+        ):
+            model, lean = self.get_both(client, url)
+            assert lean == model, (
+                'Проверьте, что быстрый сериализатор произведений '
+                f'возвращает тот же JSON, что и TitleReadSerializer: {url}'
+            )
+
+    def test_02_genres_loaded_with_one_query(self, client, admin_client,
+                                             django_assert_num_queries):
+        from reviews.models import Genre, Title
+
+        create_titles(admin_client)
+        for name in ('Чужой', 'Хищник'):
+            Title.objects.create(name=name, year=1987).genre.set(
+                Genre.objects.all()
+            )
+
+        # Количество, строки произведений и жанры всех строк.
+        with override_settings(
+            TITLE_LEAN_READ_RATIO=1, API_RESPONSE_CACHE_ENABLED=False
+        ), django_assert_num_queries(3):
+            response = client.get(self.TITLES_URL)
+        assert len(response.json()['results']) == 4
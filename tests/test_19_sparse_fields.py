@@ -0,0 +1,105 @@
+from http import HTTPStatus
+
+import pytest
+from django.db import connection
+from django.test import override_settings
+from django.test.utils import CaptureQueriesContext
+
+from tests.utils import create_comments, create_titles
+
+
+@pytest.mark.django_db(transaction=True)
+class Test19SparseFields:
+
+    TITLES_URL = '/api/v1/titles/'
+    REVIEWS_URL_TEMPLATE = '/api/v1/titles/{title_id}/reviews/'
+    COMMENTS_URL_TEMPLATE = (
+        '/api/v1/titles/{title_id}/reviews/{review_id}/comments/'
+    )
+
+    def get(self, client, url):
+        with CaptureQueriesContext(connection) as context:
+            response = client.get(url)
+        assert response.status_code == HTTPStatus.OK, url
+        data = response.json()
+        results = data['results'] if 'results' in data else [data]
+        sql = ' '.join(query['sql'] for query in context.captured_queries)
+        return results, sql
+
+    @pytest.mark.parametrize('ratio', (0, 1))
+    def test_01_title_fields(self, client, admin_client, ratio):
+        titles, _, _ = create_titles(admin_client)
+        detail_url = f'{self.TITLES_URL}{titles[0]["id"]}/'
+
+        with override_settings(
+            TITLE_LEAN_READ_RATIO=ratio, API_RESPONSE_CACHE_ENABLED=False
+        ):
+            for url in (self.TITLES_URL, detail_url):
+                results, sql = self.get(client, f'{url}?fields=id,name,rating')
+                assert all(
+                    list(title) == ['id', 'name', 'rating']
+                    for title in results
+                ), (
+                    'Проверьте, что параметр `fields` оставляет в ответе '
+                    'только перечисленные поля.'
+                )
+                assert 'description' not in sql, (
+                    'Проверьте, что параметр `fields` исключает '
+                    'ненужные столбцы из запроса к базе.'
+                )
+                assert 'reviews_genre' not in sql, (
+                    'Проверьте, что жанры не загружаются, если их нет '
+                    'в ответе.'
+                )
+
+            results, _ = self.get(client, f'{self.TITLES_URL}?omit=genre')
+            assert 'genre' not in results[0] and 'category' in results[0], (
+                'Проверьте, что параметр `omit` исключает поля из ответа.'
+            )
+            results, _ = self.get(
+                client, f'{self.TITLES_URL}?fields=id&expand=genre,category'
+            )
+            assert list(results[0]) == ['id', 'genre', 'category'], (
+                'Проверьте, что параметр `expand` добавляет вложенные '
+                'объекты к выбранным полям.'
+            )
+
+    def test_02_unknown_fields(self, client, admin_client):
+        create_titles(admin_client)
+        for query in ('fields=id,secret', 'omit=secret', 'expand=name'):
+            response = client.get(f'{self.TITLES_URL}?{query}')
+            assert response.status_code == HTTPStatus.BAD_REQUEST, (
+                'Проверьте, что неизвестные поля в параметрах `fields`, '
+                '`omit` и `expand` возвращают статус 400.'
+            )
+
+    def test_03_review_and_comment_fields(self, client, admin_client,
+                                          user, user_client, moderator,
+                                          moderator_client):
+        comments, reviews, titles = create_comments(
+            admin_client, {user: user_client, moderator: moderator_client}
+        )
+        reviews_url = self.REVIEWS_URL_TEMPLATE.format(
+            title_id=titles[0]['id']
+        )
+        results, sql = self.get(client, f'{reviews_url}?fields=id,score')
+        assert all(list(review) == ['id', 'score'] for review in results)
+        assert 'users_user' not in sql, (
+            'Проверьте, что без поля `author` отзывы загружаются без '
+            'соединения с таблицей пользователей.'
+        )
+
+        comments_url = self.COMMENTS_URL_TEMPLATE.format(
+            title_id=titles[0]['id'], review_id=reviews[0]['id']
+        )
+        results, sql = self.get(client, f'{comments_url}?omit=author,text')
+        assert all(
+            list(comment) == ['id', 'pub_date'] for comment in results
+        )
+        assert (
+            'users_user' not in sql
+            and '"reviews_comment"."text"' not in sql
+        ), (
+            'Проверьте, что параметр `omit` исключает столбцы и соединения '
+            'из запроса комментариев.'
+        )
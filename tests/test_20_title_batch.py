@@ -0,0 +1,82 @@
+from http import HTTPStatus
+
+import pytest
+from django.test import override_settings
+
+from tests.utils import create_titles
+
+
+@pytest.mark.django_db(transaction=True)
+class Test20TitleBatch:
+
+    BATCH_URL = '/api/v1/titles/batch/'
+
+    @pytest.mark.parametrize('ratio', (0, 1))
+    def test_01_batch_keeps_order_and_reports_missing(
+        self, client, admin_client, django_assert_num_queries, ratio
+    ):
+        titles, _, _ = create_titles(admin_client)
+        first, second = titles[0]['id'], titles[1]['id']
+        missing = second + 100
+
+        with override_settings(
+            TITLE_LEAN_READ_RATIO=ratio, API_RESPONSE_CACHE_ENABLED=False
+        ):
+            # Произведения и жанры всех произведений.
+            with django_assert_num_queries(2):
+                response = client.get(
+                    f'{self.BATCH_URL}?ids={second},{missing},{first},{second}'
+                )
+            assert response.status_code == HTTPStatus.OK
+            data = response.json()
+            assert [title['id'] for title in data['results']] == [
+                second, first
+            ], (
+                'Проверьте, что `batch` возвращает произведения в порядке '
+                'id из запроса без повторов.'
+            )
+            assert data['missing'] == [missing], (
+                'Проверьте, что `batch` перечисляет отсутствующие id в ключе '
+                '`missing`.'
+            )
+            assert data['results'][1] == client.get(
+                f'/api/v1/titles/{first}/'
+            ).json(), (
+                'Проверьте, что `batch` возвращает произведения в том же '
+                'формате, что и запрос к отдельному произведению.'
+            )
+
+            response = client.get(f'{self.BATCH_URL}?ids={first}&fields=name')
+            assert response.json()['results'] == [
+                {'name': titles[0]['name']}
+            ], 'Проверьте, что `batch` поддерживает параметр `fields`.'
+
+    def test_02_batch_validates_ids(self, client):
+        for query in ('', 'ids=', 'ids=1,abc', 'ids=-1', 'ids=²',
+                      'ids=' + '9' * 30,
+                      'ids=' + ','.join(map(str, range(1, 102)))):
+            response = client.get(f'{self.BATCH_URL}?{query}')
+            assert response.status_code == HTTPStatus.BAD_REQUEST, (
+                'Проверьте, что `batch` возвращает статус 400 для пустого, '
+                f'некорректного или слишком длинного списка id: {query}'
+            )
+
+    def test_03_batch_cached(self, client, admin_client,
+                             django_assert_num_queries):
+        titles, _, _ = create_titles(admin_client)
+        url = f'{self.BATCH_URL}?ids={titles[0]["id"]}'
+
+        # Промах кэша: произведения и жанры, без валидаторов по таблице.
+        with django_assert_num_queries(2):
+            response = client.get(url)
+        assert response['X-Cache'] == 'MISS'
+        assert not response.has_header('ETag'), (
+            'Проверьте, что `batch` не вычисляет ETag по всем '
+            'произведениям при сохранении ответа в кэш.'
+        )
+        with django_assert_num_queries(0):
+            response = client.get(url)
+        assert response['X-Cache'] == 'HIT', (
+            'Проверьте, что ответ `batch` для анонимного пользователя '
+            'берется из кэша.'
+        )
@@ -0,0 +1,185 @@
+import json
+from http import HTTPStatus
+
+import pytest
+from django.db import IntegrityError, connection
+from django.db.models.signals import pre_save
+
+from tests.utils import create_titles
+
+
+@pytest.mark.django_db(transaction=True)
+class Test21TitleBulk:
+
+    BULK_URL = '/api/v1/titles/bulk/'
+    TITLES_URL = '/api/v1/titles/'
+
+    def test_01_only_admin(self, client, user_client, moderator_client):
+        data = [{'name': 'Чужой', 'year': 1979}]
+        assert client.post(
+            self.BULK_URL, data=json.dumps(data),
+            content_type='application/json',
+        ).status_code == HTTPStatus.UNAUTHORIZED
+        for non_admin in (user_client, moderator_client):
+            response = non_admin.post(self.BULK_URL, data=data, format='json')
+            assert response.status_code == HTTPStatus.FORBIDDEN, (
+                'Проверьте, что пакетная запись произведений доступна только '
+                'администратору.'
+            )
+
+    def test_02_bulk_create_and_update(self, client, admin_client):
+        from reviews.models import Title
+
+        titles, categories, genres = create_titles(admin_client)
+        assert client.get(self.TITLES_URL).json()['count'] == 2
+
+        response = admin_client.post(self.BULK_URL, data=[
+            {
+                'name': 'Чужой', 'year': 1979,
+                'genre': [genres[0]['slug'], genres[2]['slug']],
+                'category': categories[0]['slug'],
+            },
+            {
+                'name': 'Ошибка', 'year': 1979,
+                'genre': ['unknown'], 'category': categories[0]['slug'],
+            },
+            {'id': titles[1]['id'], 'year': 1989,
+             'genre': [genres[1]['slug']]},
+            {'id': 100500, 'name': 'Нет такого'},
+            {'name': 'Без года', 'genre': [genres[0]['slug']],
+             'category': categories[1]['slug']},
+            'не объект',
+        ], format='json')
+        assert response.status_code == HTTPStatus.OK, (
+            'Проверьте, что ошибки в отдельных произведениях не прерывают '
+            'пакетную запись.'
+        )
+        data = response.json()
+        assert [item['status'] for item in data['results']] == [
+            'created', 'error', 'updated', 'error', 'error', 'error'
+        ], 'Проверьте статусы элементов пакета.'
+        assert (data['created'], data['updated'], data['error']) == (1, 1, 4)
+        assert 'genre' in data['results'][1]['errors']
+        assert 'id' in data['results'][3]['errors']
+        assert 'year' in data['results'][4]['errors']
+        assert data['results'][2]['id'] == titles[1]['id']
+
+        created = client.get(
+            f'{self.TITLES_URL}{data["results"][0]["id"]}/'
+        ).json()
+        assert created['name'] == 'Чужой'
+        assert [genre['slug'] for genre in created['genre']] == sorted(
+            [genres[0]['slug'], genres[2]['slug']],
+            key=lambda slug: next(
+                genre['name'] for genre in genres if genre['slug'] == slug
+            ),
+        )
+        assert created['category']['slug'] == categories[0]['slug']
+
+        updated = Title.objects.get(pk=titles[1]['id'])
+        assert (updated.name, updated.year) == (titles[1]['name'], 1989), (
+            'Проверьте, что элемент с id изменяет только переданные поля.'
+        )
+        assert list(updated.genre.values_list('slug', flat=True)) == [
+            genres[1]['slug']
+        ], 'Проверьте, что жанры изменяемого произведения заменяются.'
+
+        assert client.get(self.TITLES_URL).json()['count'] == 3, (
+            'Проверьте, что пакетная запись сбрасывает кэш списка '
+            'произведений.'
+        )
+        search = client.get(f'{self.TITLES_URL}?search=Чужой').json()
+        assert [title['name'] for title in search['results']] == ['Чужой'], (
+            'Проверьте, что пакетная запись обновляет поисковый индекс.'
+        )
+
+    @pytest.mark.skipif(
+        not connection.features.can_return_rows_from_bulk_insert,
+        reason='База не возвращает id из bulk_create, запись идет по одному',
+    )
+    def test_03_constant_queries(self, admin_client,
+                                 django_assert_max_num_queries):
+        _, categories, genres = create_titles(admin_client)
+        data = [
+            {
+                'name': f'Произведение {index}', 'year': 2000,
+                'genre': [genre['slug'] for genre in genres],
+                'category': categories[index % 2]['slug'],
+            }
+            for index in range(50)
+        ]
+        with django_assert_max_num_queries(12):
+            response = admin_client.post(self.BULK_URL, data=data,
+                                         format='json')
+        assert response.json()['created'] == 50, (
+            'Проверьте, что пакет произведений записывается постоянным '
+            'числом запросов к базе.'
+        )
+
+    def test_04_invalid_payload(self, admin_client):
+        for data in ({'name': 'Чужой'}, [], [{}] * 501):
+            response = admin_client.post(self.BULK_URL, data=data,
+                                         format='json')
+            assert response.status_code == HTTPStatus.BAD_REQUEST, (
+                'Проверьте, что пакет должен быть непустым списком '
+                'ограниченной длины.'
+            )
+
+    def test_05_database_error_is_item_error(self, client, admin_client):
+        from reviews.models import Title
+
+        _, categories, genres = create_titles(admin_client)
+
+        def fail_title(sender, instance, **kwargs):
+            if instance.name == 'Сбой':
+                raise IntegrityError('Сбой')
+
+        pre_save.connect(fail_title, sender=Title)
+        try:
+            response = admin_client.post(self.BULK_URL, data=[
+                {
+                    'name': name, 'year': 2000,
+                    'genre': [genres[0]['slug']],
+                    'category': categories[0]['slug'],
+                }
+                for name in ('Первое', 'Сбой', 'Второе')
+            ], format='json')
+        finally:
+            pre_save.disconnect(fail_title, sender=Title)
+        data = response.json()
+        assert [item['status'] for item in data['results']] == [
+            'created', 'error', 'created'
+        ], (
+            'Проверьте, что ошибка базы данных в одном произведении '
+            'попадает в ошибки этого элемента и не отменяет остальные.'
+        )
+        names = set(Title.objects.values_list('name', flat=True))
+        assert {'Первое', 'Второе'} <= names and 'Сбой' not in names
+        for item in (data['results'][0], data['results'][2]):
+            title = Title.objects.get(pk=item['id'])
+            assert list(title.genre.values_list('slug', flat=True)) == [
+                genres[0]['slug']
+            ], 'Проверьте, что id созданных произведений верные.'
+
+    def test_06_item_id_is_validated(self, admin_client):
+        from reviews.models import Title
+
+        titles, _, _ = create_titles(admin_client)
+        response = admin_client.post(self.BULK_URL, data=[
+            {'id': [titles[0]['id']], 'year': 1990},
+            {'id': {'a': 1}, 'year': 1990},
+            {'id': None, 'year': 1990},
+            {'id': str(titles[0]['id']), 'year': 1991},
+        ], format='json')
+        assert response.status_code == HTTPStatus.OK
+        results = response.json()['results']
+        assert [item['status'] for item in results] == [
+            'error', 'error', 'error', 'updated'
+        ], (
+            'Проверьте, что нечисловой id дает ошибку элемента, а id '
+            'строкой из цифр изменяет существующее произведение.'
+        )
+        for item in results[:3]:
+            assert 'id' in item['errors']
+        assert results[3]['id'] == titles[0]['id']
+        assert Title.objects.get(pk=titles[0]['id']).year == 1991
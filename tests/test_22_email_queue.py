@@ -0,0 +1,132 @@
+from datetime import timedelta
+from http import HTTPStatus
+
+import pytest
+from django.core import mail
+from django.core.mail.backends.locmem import EmailBackend
+from django.core.management import call_command
+from django.utils import timezone
+
+
+class CountingBackend(EmailBackend):
+    """Почтовый backend, считающий открытые соединения."""
+
+    opened = 0
+
+    def open(self):
+        CountingBackend.opened += 1
+        return super().open()
+
+
+class FailingBackend(EmailBackend):
+    """Почтовый backend, не отправляющий письма на адреса fail@."""
+
+    def send_messages(self, messages):
+        if any(
+            address.startswith('fail@')
+            for message in messages for address in message.to
+        ):
+            raise ConnectionError('SMTP недоступен')
+        return super().send_messages(messages)
+
+
+@pytest.mark.django_db(transaction=True)
+class Test22EmailQueue:
+
+    URL_SIGNUP = '/api/v1/auth/signup/'
+
+    @pytest.fixture(autouse=True)
+    def queue_settings(self, settings):
+        settings.EMAIL_QUEUE_EAGER = False
+        settings.EMAIL_QUEUE_MAX_ATTEMPTS = 3
+        settings.EMAIL_QUEUE_RETRY_DELAY = 10
+
+    def signup(self, client, username):
+        response = client.post(self.URL_SIGNUP, data={
+            'username': username, 'email': f'{username}@yamdb.fake',
+        })
+        assert response.status_code == HTTPStatus.OK
+        return response
+
+    def test_01_signup_enqueues_and_worker_sends(self, client, settings):
+        from users.models import EmailJob
+
+        settings.EMAIL_BACKEND = 'tests.test_22_email_queue.CountingBackend'
+        CountingBackend.opened = 0
+        for index in range(3):
+            self.signup(client, f'user{index}')
+        assert len(mail.outbox) == 0, (
+            'Проверьте, что регистрация не отправляет письмо сама, '
+            'а ставит его в очередь.'
+        )
+        assert EmailJob.objects.filter(
+            status=EmailJob.Status.PENDING
+        ).count() == 3
+
+        call_command('process_email_queue', '--once')
+        assert sorted(message.to[0] for message in mail.outbox) == [
+            f'user{index}@yamdb.fake' for index in range(3)
+        ], 'Проверьте, что воркер отправляет письма из очереди.'
+        assert CountingBackend.opened == 1, (
+            'Проверьте, что воркер отправляет пачку писем через одно '
+            'соединение.'
+        )
+        assert all(
+            'Ваш код подтверждения' in message.body
+            for message in mail.outbox
+        )
+        assert not EmailJob.objects.exclude(
+            status=EmailJob.Status.SENT
+        ).exists()
+
+    def test_02_retry_with_backoff(self, client, settings):
+        from users import mail_queue
+        from users.models import EmailJob
+
+        settings.EMAIL_BACKEND = 'tests.test_22_email_queue.FailingBackend'
+        self.signup(client, 'fail')
+        self.signup(client, 'ok')
+
+        started = timezone.now()
+        assert mail_queue.process(10) == (1, 1), (
+            'Проверьте, что ошибка одного письма не мешает отправке '
+            'остальных.'
+        )
+        job = EmailJob.objects.get(user__username='fail')
+        assert (job.status, job.attempts) == (EmailJob.Status.PENDING, 1)
+        assert job.run_at >= started + timedelta(seconds=10)
+        assert 'SMTP' in job.last_error
+        assert mail_queue.process(10) == (0, 0), (
+            'Проверьте, что повторная попытка откладывается.'
+        )
+
+        for attempts, delay in ((2, 20), (3, None)):
+            EmailJob.objects.filter(pk=job.pk).update(run_at=timezone.now())
+            started = timezone.now()
+            assert mail_queue.process(10) == (0, 1)
+            job.refresh_from_db()
+            assert job.attempts == attempts
+            if delay:
+                assert job.run_at >= started + timedelta(seconds=delay), (
+                    'Проверьте, что задержка между попытками растет '
+                    'экспоненциально.'
+                )
+        assert job.status == EmailJob.Status.FAILED, (
+            'Проверьте, что после EMAIL_QUEUE_MAX_ATTEMPTS попыток задача '
+            'помечается ошибочной.'
+        )
+
+    def test_03_expired_lease_is_reclaimed(self, client):
+        from users import mail_queue
+        from users.models import EmailJob
+
+        self.signup(client, 'user')
+        assert len(mail_queue.claim(10)) == 1
+        assert mail_queue.claim(10) == [], (
+            'Проверьте, что взятую воркером задачу не забирает другой.'
+        )
+        EmailJob.objects.update(run_at=timezone.now() - timedelta(seconds=1))
+        assert len(mail_queue.claim(10)) == 1, (
+            'Проверьте, что задачу упавшего воркера забирают после '
+            'окончания аренды.'
+        )
@@ -0,0 +1,131 @@
+from http import HTTPStatus
+
+import pytest
+from django.test import override_settings
+
+from tests.utils import create_reviews
+
+
+@pytest.mark.django_db(transaction=True)
+class Test23Throttling:
+
+    URL_SIGNUP = '/api/v1/auth/signup/'
+    URL_TOKEN = '/api/v1/auth/token/'
+    COMMENTS_URL_TEMPLATE = (
+        '/api/v1/titles/{title_id}/reviews/{review_id}/comments/'
+    )
+
+    def signup(self, client, username, ip='10.0.0.1'):
+        return client.post(self.URL_SIGNUP, data={
+            'username': username, 'email': f'{username}@yamdb.fake',
+        }, REMOTE_ADDR=ip)
+
+    @override_settings(API_THROTTLE_RATES={'signup': '3/min'})
+    def test_01_signup_limited_by_ip(self, client):
+        for index in range(3):
+            assert self.signup(client, f'user{index}').status_code == (
+                HTTPStatus.OK
+            )
+        response = self.signup(client, 'user3')
+        assert response.status_code == HTTPStatus.TOO_MANY_REQUESTS, (
+            'Проверьте, что число регистраций с одного IP-адреса '
+            'ограничено.'
+        )
+        assert 1 <= int(response['Retry-After']) <= 20, (
+            'Проверьте, что ответ 429 содержит заголовок `Retry-After` со '
+            'временем до пополнения корзины.'
+        )
+        assert self.signup(client, 'user3', ip='10.0.0.2').status_code == (
+            HTTPStatus.OK
+        ), 'Проверьте, что ограничение по IP не затрагивает другие адреса.'
+
+    @override_settings(API_THROTTLE_RATES={'signup': '2/min'})
+    def test_02_signup_limited_by_username(self, client):
+        statuses = [
+            self.signup(client, 'target', ip=f'10.0.1.{index}').status_code
+            for index in range(3)
+        ]
+        assert statuses == [
+            HTTPStatus.OK, HTTPStatus.OK, HTTPStatus.TOO_MANY_REQUESTS
+        ], (
+            'Проверьте, что регистрация ограничена по имени пользователя '
+            'независимо от IP-адреса.'
+        )
+
+    @override_settings(API_THROTTLE_RATES={'signup': '1/min'})
+    def test_03_rejected_request_does_not_spend_tokens(self, client):
+        assert self.signup(client, 'first').status_code == HTTPStatus.OK
+        assert self.signup(client, 'second').status_code == (
+            HTTPStatus.TOO_MANY_REQUESTS
+        )
+        assert self.signup(
+            client, 'second', ip='10.0.0.2'
+        ).status_code == HTTPStatus.OK, (
+            'Проверьте, что отклоненный запрос не расходует маркеры '
+            'других корзин.'
+        )
+
+    @override_settings(API_THROTTLE_RATES={'token': '2/min'})
+    def test_04_token_limited_by_username(self, client, user):
+        statuses = [
+            client.post(self.URL_TOKEN, data={
+                'username': user.username, 'confirmation_code': 'wrong',
+            }, REMOTE_ADDR=f'10.0.2.{index}').status_code
+            for index in range(3)
+        ]
+        assert statuses[-1] == HTTPStatus.TOO_MANY_REQUESTS, (
+            'Проверьте, что подбор кода подтверждения ограничен по имени '
+            'пользователя.'
+        )
+
+    def test_05_writes_limited_per_user(self, admin_client, user_client,
+                                        moderator_client, user, moderator):
+        from django.core.cache import cache
+
+        reviews, titles = create_reviews(
+            admin_client, {user: user_client, moderator: moderator_client}
+        )
+        url = self.COMMENTS_URL_TEMPLATE.format(
+            title_id=titles[0]['id'], review_id=reviews[0]['id']
+        )
+        # Отзывы из create_reviews уже взяли маркеры по другой скорости.
+        cache.clear()
+        with override_settings(API_THROTTLE_RATES={'write': '2/min'}):
+            statuses = [
+                user_client.post(url, data={'text': 'Текст'}).status_code
+                for _ in range(3)
+            ]
+            assert statuses == [
+                HTTPStatus.CREATED, HTTPStatus.CREATED,
+                HTTPStatus.TOO_MANY_REQUESTS,
+            ], 'Проверьте, что число записей одного пользователя ограничено.'
+            assert user_client.get(url).status_code == HTTPStatus.OK, (
+                'Проверьте, что чтение не ограничивается.'
+            )
+            assert moderator_client.post(
+                url, data={'text': 'Текст'}
+            ).status_code == HTTPStatus.CREATED, (
+                'Проверьте, что ограничение записей считается для каждого '
+                'пользователя отдельно.'
+            )
+
+    @override_settings(API_THROTTLE_RATES={'signup': '3/s'})
+    def test_06_stale_arrival_time_does_not_grow_burst(self):
+        from django.core.cache import cache
+
+        from api.throttling import SignUpThrottle
+
+        throttle = SignUpThrottle()
+        capacity, interval = throttle.get_rate()
+        key = throttle.get_cache_key('ip', '10.0.0.1')
+        now = 1_000_000
+        # Ключ еще не истек, но время прибытия давно в прошлом.
+        cache.set(key, now - 10 * interval, 60)
+        allowed = 0
+        for _ in range(capacity + 5):
+            if throttle.take(key, capacity, interval, now) is None:
+                allowed += 1
+        assert allowed == capacity, (
+            'Проверьте, что полная корзина пропускает не больше `capacity` '
+            'запросов подряд, даже если ключ в кэше еще не истек.'
+        )
@@ -0,0 +1,51 @@
+from http import HTTPStatus
+
+import pytest
+from django.test import override_settings
+
+
+@pytest.mark.django_db(transaction=True)
+class Test24SignUpQueries:
+
+    URL_SIGNUP = '/api/v1/auth/signup/'
+
+    @override_settings(EMAIL_QUEUE_EAGER=False)
+    def test_01_signup_queries(self, client, django_assert_num_queries):
+        data = {'username': 'new_user', 'email': 'new@yamdb.fake'}
+        # Проверка конфликтов, BEGIN и создание пользователя в транзакции,
+        # создание задачи письма.
+        with django_assert_num_queries(4):
+            response = client.post(self.URL_SIGNUP, data=data)
+        assert response.status_code == HTTPStatus.OK
+
+        # Повторная регистрация: проверка и задача письма.
+        with django_assert_num_queries(2):
+            response = client.post(self.URL_SIGNUP, data=data)
+        assert response.status_code == HTTPStatus.OK, (
+            'Проверьте, что повторная регистрация с теми же данными '
+            'возвращает статус 200.'
+        )
+
+    def test_02_conflict_messages(self, client, django_user_model,
+                                  django_assert_num_queries):
+        django_user_model.objects.create(username='first',
+                                         email='first@yamdb.fake')
+        django_user_model.objects.create(username='second',
+                                         email='second@yamdb.fake')
+        for data, errors in (
+            ({'username': 'first', 'email': 'other@yamdb.fake'},
+             {'username': ['Пользователь с таким именем существует']}),
+            ({'username': 'other', 'email': 'first@yamdb.fake'},
+             {'email': ['Пользователь с таким email существует']}),
+            ({'username': 'first', 'email': 'second@yamdb.fake'},
+             {'username': ['Пользователь с таким именем существует'],
+              'email': ['Пользователь с таким email существует']}),
+        ):
+            with django_assert_num_queries(1):
+                response = client.post(self.URL_SIGNUP, data=data)
+            assert response.status_code == HTTPStatus.BAD_REQUEST
+            assert response.json() == errors, (
+                'Проверьте, что конфликты имени и email определяются одним '
+                'запросом с прежними сообщениями об ошибках.'
+            )
+        assert django_user_model.objects.count() == 2
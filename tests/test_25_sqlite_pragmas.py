@@ -0,0 +1,62 @@
+from io import StringIO
+
+import pytest
+from django.core.exceptions import ImproperlyConfigured
+from django.core.management import call_command
+from django.db import connection
+from django.test import override_settings
+
+from api.db import configure_sqlite, get_sqlite_pragmas
+
+
+@pytest.mark.django_db(transaction=True)
+class Test25SqlitePragmas:
+
+    def get_pragma(self, name):
+        with connection.cursor() as cursor:
+            cursor.execute(f'PRAGMA {name}')
+            return cursor.fetchone()[0]
+
+    def test_01_pragmas_applied(self):
+        connection.ensure_connection()
+        with override_settings(SQLITE_PRAGMAS={
+            'busy_timeout': '1234',
+            'synchronous': 'off',
+            'cache_size': '-4000',
+        }):
+            configure_sqlite(sender=None, connection=connection)
+            assert self.get_pragma('busy_timeout') == 1234, (
+                'Проверьте, что PRAGMA busy_timeout применяется к соединению.'
+            )
+            assert self.get_pragma('synchronous') == 0, (
+                'Проверьте, что PRAGMA synchronous применяется к соединению.'
+            )
+            assert self.get_pragma('cache_size') == -4000
+        configure_sqlite(sender=None, connection=connection)
+        assert self.get_pragma('busy_timeout') == 5000, (
+            'Проверьте, что по умолчанию busy_timeout равен 5000 мс.'
+        )
+
+    def test_02_empty_and_invalid_values(self):
+        with override_settings(SQLITE_PRAGMAS={
+            'journal_mode': '', 'busy_timeout': '100',
+        }):
+            assert get_sqlite_pragmas() == {'busy_timeout': '100'}, (
+                'Проверьте, что PRAGMA с пустым значением не применяется.'
+            )
+        with override_settings(SQLITE_PRAGMAS={
+            'journal_mode': 'wal; DROP TABLE users_user',
+        }):
+            with pytest.raises(ImproperlyConfigured):
+                get_sqlite_pragmas()
+
+    def test_03_benchmark_command(self):
+        out = StringIO()
+        call_command(
+            'benchmark_sqlite', '--threads', '2', '--duration', '0.2',
+            '--titles', '20', '--reviews-per-title', '2', stdout=out,
+        )
+        lines = out.getvalue().splitlines()
+        assert [line.split()[0] for line in lines[1:]] == [
+            'default', 'tuned'
+        ], 'Проверьте, что benchmark_sqlite сравнивает два профиля PRAGMA.'
@@ -0,0 +1,125 @@
+import threading
+import time
+
+import pytest
+from django.db import connection, connections
+
+from api.backends.pool import PoolTimeout, close_pools, get_pool_stats
+from api.backends.sqlite3.base import DatabaseWrapper
+
+
+@pytest.fixture
+def make_wrapper(tmp_path):
+    wrappers = []
+
+    def make(size=1, timeout=0.1, health_checks=True):
+        settings_dict = {
+            **connection.settings_dict,
+            'NAME': str(tmp_path / 'pool.sqlite3'),
+            'CONN_HEALTH_CHECKS': health_checks,
+            'POOL': {'SIZE': size, 'TIMEOUT': timeout},
+        }
+        wrapper = DatabaseWrapper(settings_dict, alias='pool_test')
+        wrapper.inc_thread_sharing()
+        wrappers.append(wrapper)
+        return wrapper
+
+    yield make
+    for wrapper in wrappers:
+        wrapper.close()
+    close_pools()
+
+
+@pytest.mark.django_db(transaction=True)
+class Test26ConnectionPool:
+
+    def test_01_backend(self):
+        assert isinstance(connections['default'], DatabaseWrapper), (
+            'Проверьте, что по умолчанию используется бэкенд '
+            '`api.backends.sqlite3`.'
+        )
+        assert connection.settings_dict['CONN_MAX_AGE'] > 0, (
+            'Проверьте, что соединения по умолчанию сохраняются между '
+            'запросами.'
+        )
+
+    def test_02_reuse(self, make_wrapper):
+        first = make_wrapper()
+        first.ensure_connection()
+        raw = first.connection
+        first.close()
+
+        second = make_wrapper()
+        second.ensure_connection()
+        assert second.connection is raw, (
+            'Проверьте, что закрытое соединение возвращается в пул и '
+            'выдается повторно.'
+        )
+        stats = get_pool_stats()['pool_test']
+        assert stats['opened'] == 1
+        assert stats['in_use'] == 1
+        assert stats['checkouts'] == 2
+
+    def test_03_timeout_and_wait(self, make_wrapper):
+        first = make_wrapper(timeout=0.05)
+        first.ensure_connection()
+        with pytest.raises(PoolTimeout):
+            make_wrapper(timeout=0.05).ensure_connection()
+        assert get_pool_stats()['pool_test']['timeouts'] == 1, (
+            'Проверьте, что пул считает ожидания, завершившиеся ошибкой.'
+        )
+
+        acquired = []
+
+        def acquire():
+            second = make_wrapper(timeout=5)
+            second.ensure_connection()
+            acquired.append(second.connection)
+            second.close()
+
+        thread = threading.Thread(target=acquire)
+        thread.start()
+        time.sleep(0.05)
+        raw = first.connection
+        first.close()
+        thread.join(5)
+        assert acquired == [raw], (
+            'Проверьте, что освобожденное соединение отдается ожидающему.'
+        )
+        stats = get_pool_stats()['pool_test']
+        assert stats['waits'] == 1
+        assert stats['wait_seconds'] > 0
+
+    def test_04_health_check(self, make_wrapper):
+        first = make_wrapper()
+        first.ensure_connection()
+        raw = first.connection
+        first.close()
+        raw.close()
+
+        second = make_wrapper()
+        second.ensure_connection()
+        assert second.connection is not raw, (
+            'Проверьте, что разорванное соединение из пула заменяется '
+            'новым при CONN_HEALTH_CHECKS.'
+        )
+        stats = get_pool_stats()['pool_test']
+        assert stats['discarded'] == 1
+        assert stats['opened'] == 1
+
+    def test_05_rollback_on_release(self, make_wrapper):
+        first = make_wrapper()
+        with first.cursor() as cursor:
+            cursor.execute('CREATE TABLE item (id integer)')
+        first.set_autocommit(False)
+        with first.cursor() as cursor:
+            cursor.execute('INSERT INTO item VALUES (1)')
+        first.close()
+
+        second = make_wrapper()
+        with second.cursor() as cursor:
+            cursor.execute('SELECT COUNT(*) FROM item')
+            assert cursor.fetchone()[0] == 0, (
+                'Проверьте, что незавершенная транзакция откатывается '
+                'при возврате соединения в пул.'
+            )
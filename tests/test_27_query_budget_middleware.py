@@ -0,0 +1,81 @@
+import pytest
+from django.test import override_settings
+
+from api.query_budget import (QueryRecorder, normalize_sql,
+                              query_budget_exceeded)
+from api.views import TitleViewSet
+from tests.utils import create_single_review, create_titles
+
+
+@pytest.mark.django_db(transaction=True)
+class Test27QueryBudgetMiddleware:
+
+    TITLES_URL = '/api/v1/titles/'
+
+    def test_01_query_count_header(self, client, admin_client):
+        create_titles(admin_client)
+        response = client.get(self.TITLES_URL)
+        assert 'X-Query-Count' in response, (
+            'Проверьте, что QueryBudgetMiddleware возвращает число '
+            'SQL-запросов в заголовке `X-Query-Count`.'
+        )
+        assert 0 < int(response['X-Query-Count']) <= (
+            TitleViewSet.query_budget['list']
+        )
+
+    @pytest.mark.no_query_budget
+    def test_02_budget_exceeded(self, client, admin_client, monkeypatch):
+        create_titles(admin_client)
+        reports = []
+
+        def collect(sender, report, **kwargs):
+            reports.append(report)
+
+        monkeypatch.setattr(TitleViewSet, 'query_budget', {'list': 1})
+        query_budget_exceeded.connect(collect, weak=False)
+        try:
+            with override_settings(
+                QUERY_BUDGET_ENABLED=True, API_RESPONSE_CACHE_ENABLED=False,
+            ):
+                client.get(self.TITLES_URL)
+        finally:
+            query_budget_exceeded.disconnect(collect)
+        assert len(reports) == 1, (
+            'Проверьте, что превышение бюджета запросов представления '
+            'отправляет сигнал `query_budget_exceeded`.'
+        )
+        assert reports[0]['view'] == 'TitleViewSet.list'
+        assert reports[0]['budget'] == 1
+        assert reports[0]['count'] > 1
+
+    def test_03_repeated_queries(self, admin_client, user_client,
+                                 moderator_client):
+        from reviews.models import Review
+
+        titles, _, _ = create_titles(admin_client)
+        for author_client in (user_client, moderator_client):
+            for title in titles:
+                create_single_review(author_client, title['id'], 'Текст', 5)
+
+        with QueryRecorder() as recorder:
+            [str(review) for review in Review.objects.all()]
+        repeated = recorder.find_repeated(3)
+        assert repeated, (
+            'Проверьте, что повторяющиеся запросы в цикле определяются '
+            'как N+1.'
+        )
+        assert all(
+            item['origin'].startswith('reviews/models.py')
+            for item in repeated
+        ), 'Проверьте, что для повтора указывается место вызова в проекте.'
+
+        with QueryRecorder() as recorder:
+            [str(review) for review in Review.objects.select_related(
+                'author', 'title'
+            )]
+        assert recorder.find_repeated(3) == []
+
+    def test_04_normalize_sql(self):
+        assert normalize_sql(
+            'SELECT * FROM t WHERE id IN (%s, %s, %s)'
+        ) == normalize_sql('SELECT * FROM t WHERE id IN (%s)')
@@ -0,0 +1,86 @@
+import threading
+from http import HTTPStatus
+
+import pytest
+
+from api.metrics import MetricsRegistry, registry
+from tests.utils import create_titles
+
+
+@pytest.mark.django_db(transaction=True)
+class Test28Metrics:
+
+    METRICS_URL = '/api/v1/metrics/'
+    TITLES_URL = '/api/v1/titles/'
+
+    def get_samples(self, admin_client):
+        response = admin_client.get(self.METRICS_URL)
+        assert response.status_code == HTTPStatus.OK
+        samples = {}
+        for line in response.content.decode().splitlines():
+            if line and not line.startswith('#'):
+                name, value = line.rsplit(' ', 1)
+                samples[name] = float(value)
+        return samples
+
+    def test_01_admin_only(self, client, user_client, admin_client):
+        assert client.get(self.METRICS_URL).status_code == (
+            HTTPStatus.UNAUTHORIZED
+        )
+        assert user_client.get(self.METRICS_URL).status_code == (
+            HTTPStatus.FORBIDDEN
+        ), 'Проверьте, что метрики доступны только администратору.'
+        response = admin_client.get(self.METRICS_URL)
+        assert response.status_code == HTTPStatus.OK
+        assert response['Content-Type'].startswith('text/plain'), (
+            'Проверьте, что метрики отдаются в текстовом формате Prometheus.'
+        )
+
+    def test_02_view_metrics(self, client, admin_client):
+        create_titles(admin_client)
+        registry.reset()
+        for _ in range(3):
+            client.get(self.TITLES_URL)
+        client.get(f'{self.TITLES_URL}0/')
+
+        samples = self.get_samples(admin_client)
+        labels = 'view="TitleViewSet.list",method="GET",status="200"'
+        assert samples[f'api_requests_total{{{labels}}}'] == 3, (
+            'Проверьте, что запросы считаются с метками вьюсета и действия.'
+        )
+        assert samples[
+            f'api_request_duration_seconds_bucket{{{labels},le="+Inf"}}'
+        ] == 3
+        assert samples[f'api_request_duration_seconds_sum{{{labels}}}'] > 0
+        assert samples[f'api_response_size_bytes_sum{{{labels}}}'] > 0
+        assert samples[f'api_db_queries_total{{{labels}}}'] > 0, (
+            'Проверьте, что для представления считаются SQL-запросы.'
+        )
+        assert samples[
+            'api_requests_total{view="TitleViewSet.retrieve",'
+            'method="GET",status="404"}'
+        ] == 1
+
+    def test_03_registry_threads(self):
+        metrics = MetricsRegistry()
+
+        def observe():
+            for duration in (0.001, 0.2, 20):
+                metrics.observe('TitleViewSet.list', 'GET', 200,
+                                duration, 10, 2, 0.001)
+
+        threads = [threading.Thread(target=observe) for _ in range(4)]
+        for thread in threads:
+            thread.start()
+        for thread in threads:
+            thread.join()
+
+        for _ in range(2):
+            stats = metrics.collect()[('TitleViewSet.list', 'GET', 200)]
+            assert stats.count == 12, (
+                'Проверьте, что метрики завершившихся потоков сохраняются.'
+            )
+            assert stats.queries == 24
+            assert stats.latency_buckets[0] == 4
+            assert stats.latency_buckets[-1] == 4
+        assert metrics.threads == []
@@ -0,0 +1,90 @@
+from http import HTTPStatus
+from io import StringIO
+
+import pytest
+from django.core.management import call_command
+
+from api.profiling import get_profile
+
+
+@pytest.mark.django_db(transaction=True)
+class Test29Profiling:
+
+    TITLES_URL = '/api/v1/titles/'
+    PROFILES_URL = '/api/v1/profiles/'
+
+    @pytest.fixture(autouse=True)
+    def profiler_enabled(self, settings):
+        settings.PROFILER_ENABLED = True
+        settings.API_RESPONSE_CACHE_ENABLED = False
+
+    def test_01_admin_header(self, admin_client, user_client):
+        response = user_client.get(self.TITLES_URL, HTTP_X_PROFILE='1')
+        assert 'X-Profile-Id' not in response, (
+            'Проверьте, что заголовок профилирования работает только '
+            'для администратора.'
+        )
+        response = admin_client.get(self.TITLES_URL, HTTP_X_PROFILE='1')
+        assert 'X-Profile-Id' in response, (
+            'Проверьте, что запрос администратора с заголовком `X-Profile` '
+            'профилируется.'
+        )
+        profile_id = response['X-Profile-Id']
+
+        profiles = admin_client.get(self.PROFILES_URL).json()
+        assert [profile['id'] for profile in profiles] == [profile_id]
+        assert profiles[0]['view'] == 'TitleViewSet.list'
+        assert profiles[0]['trigger'] == 'header'
+
+        profile = admin_client.get(f'{self.PROFILES_URL}{profile_id}/').json()
+        assert 'cumulative' in profile['stats'], (
+            'Проверьте, что профиль содержит статистику cProfile.'
+        )
+        assert profile['query_count'] == len(profile['queries']) > 0, (
+            'Проверьте, что профиль содержит журнал SQL-запросов.'
+        )
+        assert admin_client.get(
+            f'{self.PROFILES_URL}unknown/'
+        ).status_code == HTTPStatus.NOT_FOUND
+
+    def test_02_admin_only(self, client, user_client):
+        assert client.get(self.PROFILES_URL).status_code == (
+            HTTPStatus.UNAUTHORIZED
+        )
+        assert user_client.get(self.PROFILES_URL).status_code == (
+            HTTPStatus.FORBIDDEN
+        ), 'Проверьте, что профили доступны только администратору.'
+
+    def test_03_sample_rate_and_keep(self, client, admin_client, settings):
+        settings.PROFILER_SAMPLE_RATE = 1
+        settings.PROFILER_KEEP = 2
+        ids = [client.get(self.TITLES_URL)['X-Profile-Id'] for _ in range(3)]
+        settings.PROFILER_SAMPLE_RATE = 0
+        profiles = admin_client.get(self.PROFILES_URL).json()
+        assert [profile['id'] for profile in profiles] == ids[:0:-1], (
+            'Проверьте, что хранятся только последние PROFILER_KEEP '
+            'профилей, начиная с последнего.'
+        )
+
+        out = StringIO()
+        call_command('show_profiles', ids[-1], stdout=out)
+        assert 'TitleViewSet.list' in out.getvalue()
+
+    def test_04_slow_threshold(self, client, settings):
+        settings.PROFILER_SLOW_THRESHOLD = 60
+        assert 'X-Profile-Id' not in client.get(self.TITLES_URL), (
+            'Проверьте, что быстрые запросы не сохраняются.'
+        )
+        settings.PROFILER_SLOW_THRESHOLD = 1e-9
+        settings.PROFILER_SAMPLE_INTERVAL = 0.0001
+        response = client.get(self.TITLES_URL)
+        assert 'X-Profile-Id' in response, (
+            'Проверьте, что запросы дольше PROFILER_SLOW_THRESHOLD '
+            'сохраняются.'
+        )
+        profile = get_profile(response['X-Profile-Id'])
+        assert profile['trigger'] == 'slow'
+        assert 'stacks' in profile, (
+            'Проверьте, что для медленных запросов сохраняются стеки '
+            'сэмплирующего профилировщика.'
+        )
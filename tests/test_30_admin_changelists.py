@@ -0,0 +1,143 @@
+from http import HTTPStatus
+
+import pytest
+from django.db import connection
+from django.test import Client
+from django.test.utils import CaptureQueriesContext
+
+
+@pytest.mark.django_db(transaction=True)
+class Test30AdminChangelists:
+
+    TITLES_URL = '/admin/reviews/title/'
+    REVIEWS_URL = '/admin/reviews/review/'
+    COMMENTS_URL = '/admin/reviews/comment/'
+
+    @pytest.fixture
+    def staff_client(self, user_superuser):
+        client = Client()
+        client.force_login(user_superuser)
+        return client
+
+    @pytest.fixture
+    def reviews(self, admin, user):
+        from reviews.models import Category, Comment, Review, Title
+
+        category = Category.objects.create(name='Книга', slug='book')
+        titles = [
+            Title.objects.create(
+                name=name, year=2000, category=category
+            )
+            for name in ('Война и мир', 'Мастер и Маргарита')
+        ]
+        reviews = []
+        for title in titles:
+            for author in (admin, user):
+                review = Review.objects.create(
+                    title=title, author=author, text='Отзыв', score=5
+                )
+                Comment.objects.create(
+                    review=review, author=author, text='Комментарий'
+                )
+                reviews.append(review)
+        return titles, reviews
+
+    def test_01_changelists(self, staff_client, reviews):
+        for url in (self.REVIEWS_URL, self.COMMENTS_URL):
+            with CaptureQueriesContext(connection) as queries:
+                response = staff_client.get(url)
+            assert response.status_code == HTTPStatus.OK, (
+                f'Проверьте, что страница `{url}` открывается.'
+            )
+            assert len(queries) <= 12, (
+                f'Проверьте, что список `{url}` загружает связанные '
+                f'объекты через select_related: {len(queries)} запросов.'
+            )
+            assert response.context['cl'].date_hierarchy is None, (
+                f'Проверьте, что список `{url}` не строит date_hierarchy '
+                'по всей таблице.'
+            )
+            content = response.content.decode()
+            assert 'admin-autocomplete' in content, (
+                f'Проверьте, что фильтры `{url}` используют '
+                'автодополнение.'
+            )
+            assert 'Мастер и Маргарита</a></li>' not in content, (
+                'Проверьте, что связанные объекты не выводятся '
+                'в боковую панель фильтров.'
+            )
+
+    def test_02_autocomplete_filter(self, staff_client, reviews, user):
+        titles, _ = reviews
+        response = staff_client.get(
+            self.REVIEWS_URL, {'title__id__exact': titles[0].pk}
+        )
+        assert response.status_code == HTTPStatus.OK
+        assert response.context['cl'].result_count == 2, (
+            'Проверьте, что фильтр отзывов по произведению работает.'
+        )
+        response = staff_client.get(
+            self.COMMENTS_URL, {'author__id__exact': user.pk}
+        )
+        assert response.context['cl'].result_count == 2, (
+            'Проверьте, что фильтр комментариев по автору работает.'
+        )
+
+    def test_03_search(self, staff_client, reviews, user):
+        response = staff_client.get(self.REVIEWS_URL, {'q': 'Маргарит'})
+        assert response.context['cl'].result_count == 2, (
+            'Проверьте, что отзывы ищутся по названию произведения.'
+        )
+        response = staff_client.get(self.REVIEWS_URL, {'q': user.username})
+        assert response.context['cl'].result_count == 2, (
+            'Проверьте, что отзывы ищутся по имени автора.'
+        )
+        response = staff_client.get(self.COMMENTS_URL, {'q': user.username})
+        assert response.context['cl'].result_count == 2, (
+            'Проверьте, что комментарии ищутся по имени автора.'
+        )
+
+    def test_04_title_search(self, staff_client, reviews):
+        from reviews.models import Category
+
+        titles, _ = reviews
+        titles[1].year = 1967
+        titles[1].category = Category.objects.create(
+            name='Роман', slug='novel'
+        )
+        titles[1].save()
+        for term in ('Маргарит', '1967', 'Роман', 'novel'):
+            response = staff_client.get(self.TITLES_URL, {'q': term})
+            found = [title.pk for title in response.context['cl'].result_list]
+            assert found == [titles[1].pk], (
+                'Проверьте, что произведения ищутся по названию, году, '
+                f'названию и slug категории: {term}'
+            )
+
+    def test_05_estimated_count(self, reviews):
+        from reviews.counts import (EstimatedCountPaginator, bounded_count,
+                                    estimate_count)
+        from reviews.models import Review
+
+        queryset = Review.objects.all()
+        assert bounded_count(queryset, 3) == 3
+        with connection.cursor() as cursor:
+            cursor.execute('ANALYZE')
+        assert estimate_count(Review) == 4, (
+            'Проверьте, что оценка числа строк берется из sqlite_stat1.'
+        )
+
+        paginator = EstimatedCountPaginator(queryset, 2)
+        paginator.exact_count_limit = 3
+        with CaptureQueriesContext(connection) as queries:
+            assert paginator.count == 4
+        assert not any('COUNT' in query['sql'] for query in queries), (
+            'Проверьте, что для большой таблицы без фильтров пагинатор '
+            'не выполняет COUNT(*).'
+        )
+        paginator = EstimatedCountPaginator(queryset.filter(score=5), 2)
+        paginator.exact_count_limit = 3
+        assert paginator.count == 3, (
+            'Проверьте, что для отфильтрованного набора число строк '
+            'ограничено exact_count_limit.'
+        )
@@ -0,0 +1,106 @@
+import pytest
+from django.db import connection
+from django.test.utils import CaptureQueriesContext
+
+
+def count_queries(queries):
+    return sum('"__count"' in query['sql'] for query in queries)
+
+
+@pytest.mark.django_db(transaction=True)
+class Test31ApproximateCount:
+
+    TITLES_URL = '/api/v1/titles/'
+    USERS_URL = '/api/v1/users/'
+
+    @pytest.fixture(autouse=True)
+    def small_limit(self, settings):
+        settings.PAGINATION_EXACT_COUNT_LIMIT = 3
+        settings.API_RESPONSE_CACHE_ENABLED = False
+
+    @pytest.fixture
+    def titles(self):
+        from reviews.models import Category, Title
+
+        category = Category.objects.create(name='Книга', slug='book')
+        return [
+            Title.objects.create(
+                name=f'Произведение {index}', year=2000, category=category
+            )
+            for index in range(5)
+        ]
+
+    def test_01_exact_below_limit(self, client, titles):
+        response = client.get(self.TITLES_URL, {'name': 'Произведение 1'})
+        data = response.json()
+        assert data['count'] == 1, (
+            'Проверьте, что число записей меньше порога считается точно.'
+        )
+        assert data['next'] is None and len(data['results']) == 1
+
+    def test_02_cached_above_limit(self, client, titles):
+        from reviews.models import Title
+
+        params = {'year': 2000, 'limit': 2}
+        data = client.get(self.TITLES_URL, params).json()
+        assert data['count'] == 5
+        assert list(data) == ['count', 'next', 'previous', 'results'], (
+            'Проверьте, что ответ сохраняет формат count/next/previous/'
+            'results.'
+        )
+        with CaptureQueriesContext(connection) as queries:
+            data = client.get(
+                self.TITLES_URL, {**params, 'offset': 4}
+            ).json()
+        assert count_queries(queries) == 0, (
+            'Проверьте, что число записей больше порога берется из кэша '
+            'для того же набора фильтров.'
+        )
+        assert data['count'] == 5 and data['next'] is None
+        assert len(data['results']) == 1
+
+        Title.objects.create(
+            name='Новое', year=2000, category=titles[0].category
+        )
+        data = client.get(self.TITLES_URL, params).json()
+        assert data['count'] == 6, (
+            'Проверьте, что изменение произведений сбрасывает кэш числа '
+            'записей.'
+        )
+
+    def test_03_omit_count(self, client, titles):
+        with CaptureQueriesContext(connection) as queries:
+            data = client.get(
+                self.TITLES_URL, {'count': 'false', 'limit': 2}
+            ).json()
+        assert data['count'] is None, (
+            'Проверьте, что с параметром `count=false` число записей '
+            'не возвращается.'
+        )
+        assert count_queries(queries) == 0, (
+            'Проверьте, что с параметром `count=false` COUNT(*) '
+            'не выполняется.'
+        )
+        assert data['next'] is not None and len(data['results']) == 2
+        data = client.get(
+            self.TITLES_URL, {'count': 'false', 'limit': 2, 'offset': 3}
+        ).json()
+        assert data['next'] is None and len(data['results']) == 2, (
+            'Проверьте, что без подсчета ссылка на следующую страницу '
+            'определяется по загруженным записям.'
+        )
+
+    def test_04_estimated_unfiltered(self, admin_client, django_user_model):
+        for index in range(5):
+            django_user_model.objects.create_user(
+                username=f'user{index}', email=f'user{index}@yamdb.fake'
+            )
+        with connection.cursor() as cursor:
+            cursor.execute('ANALYZE')
+        with CaptureQueriesContext(connection) as queries:
+            data = admin_client.get(self.USERS_URL).json()
+        assert data['count'] == 6
+        assert count_queries(queries) == 0, (
+            'Проверьте, что число записей без фильтров больше порога '
+            'берется из статистики базы без полного COUNT(*).'
+        )